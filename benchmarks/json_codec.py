@@ -0,0 +1,191 @@
+"""Benchmark the JSON codecs on realistic data source query payloads.
+
+Encodes a query request body and a request appending 100 paragraphs, and decodes
+a page of 100 query results full of rich text through the client, with the
+default codec and with every alternative codec installed (orjson, msgspec,
+ujson).
+
+    python benchmarks/json_codec.py
+"""
+
+import json
+import timeit
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from notion_client import Client, JSONCodec
+
+ROUNDS = 200
+
+
+def rich_text(content: str) -> Dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {
+            "bold": False,
+            "italic": False,
+            "strikethrough": False,
+            "underline": False,
+            "code": False,
+            "color": "default",
+        },
+        "plain_text": content,
+        "href": None,
+    }
+
+
+def page(index: int) -> Dict[str, Any]:
+    description = [
+        rich_text(f"Paragraph {index}.{part}: lorem ipsum dolor sit amet, ")
+        for part in range(8)
+    ]
+    return {
+        "object": "page",
+        "id": str(uuid.uuid4()),
+        "created_time": "2025-06-01T12:00:00.000Z",
+        "last_edited_time": "2025-06-02T08:30:00.000Z",
+        "created_by": {"object": "user", "id": str(uuid.uuid4())},
+        "last_edited_by": {"object": "user", "id": str(uuid.uuid4())},
+        "cover": None,
+        "icon": {"type": "emoji", "emoji": "📄"},
+        "parent": {"type": "data_source_id", "data_source_id": str(uuid.uuid4())},
+        "archived": False,
+        "in_trash": False,
+        "properties": {
+            "Name": {"id": "title", "type": "title", "title": [rich_text("Task")]},
+            "Description": {
+                "id": "desc",
+                "type": "rich_text",
+                "rich_text": description,
+            },
+            "Status": {
+                "id": "stat",
+                "type": "status",
+                "status": {"id": "1", "name": "In progress", "color": "blue"},
+            },
+            "Estimate": {"id": "est", "type": "number", "number": index * 1.5},
+            "Due": {
+                "id": "due",
+                "type": "date",
+                "date": {"start": "2025-07-01", "end": None, "time_zone": None},
+            },
+            "Tags": {
+                "id": "tags",
+                "type": "multi_select",
+                "multi_select": [
+                    {"id": str(tag), "name": f"tag-{tag}", "color": "gray"}
+                    for tag in range(3)
+                ],
+            },
+        },
+        "url": f"https://www.notion.so/Task-{index}",
+        "public_url": None,
+    }
+
+
+def query_body() -> Dict[str, Any]:
+    return {
+        "filter": {
+            "and": [
+                {"property": "Status", "status": {"equals": "In progress"}},
+                {"property": "Description", "rich_text": {"contains": "lorem"}},
+            ]
+        },
+        "sorts": [{"property": "Due", "direction": "ascending"}],
+        "page_size": 100,
+    }
+
+
+def append_body() -> Dict[str, Any]:
+    return {
+        "children": [
+            {
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {
+                    "rich_text": [
+                        rich_text(f"Paragraph {index}.{part}: lorem ipsum, ")
+                        for part in range(8)
+                    ]
+                },
+            }
+            for index in range(100)
+        ]
+    }
+
+
+def query_response() -> bytes:
+    body = {
+        "object": "list",
+        "results": [page(index) for index in range(100)],
+        "next_cursor": str(uuid.uuid4()),
+        "has_more": True,
+        "type": "page_or_data_source",
+        "page_or_data_source": {},
+    }
+    return json.dumps(body).encode()
+
+
+def codecs() -> List[Tuple[str, Any]]:
+    available: List[Tuple[str, Any]] = [("httpx (stdlib json)", None)]
+    available.append(("stdlib json", JSONCodec()))
+    try:
+        import orjson
+
+        available.append(("orjson", JSONCodec(orjson.dumps, orjson.loads)))
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        available.append(
+            ("msgspec", JSONCodec(msgspec.json.encode, msgspec.json.decode))
+        )
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        available.append(("ujson", JSONCodec(ujson.dumps, ujson.loads)))
+    except ImportError:
+        pass
+    return available
+
+
+def measure(function: Callable[[], Any]) -> float:
+    """Return the best time of a call in microseconds."""
+    return min(timeit.repeat(function, number=ROUNDS, repeat=5)) / ROUNDS * 1e6
+
+
+def main() -> None:
+    query = query_body()
+    children = append_body()
+    content = query_response()
+    request = httpx.Request("POST", "https://api.notion.com/v1/data_sources/id/query")
+    print(f"Query response: {len(content) / 1024:.0f} KiB, {ROUNDS} rounds\n")
+    print(f"{'codec':<22}{'query (µs)':>14}{'append (µs)':>14}{'response (µs)':>16}")
+
+    for name, codec in codecs():
+        client = Client(auth="secret", json_codec=codec)
+
+        def encode_query() -> None:
+            client._build_request("POST", "data_sources/id/query", body=query)
+
+        def encode_append() -> None:
+            client._build_request("PATCH", "blocks/id/children", body=children)
+
+        def decode_response() -> None:
+            response = httpx.Response(200, content=content, request=request)
+            client._parse_response(response)
+
+        print(
+            f"{name:<22}{measure(encode_query):>14.1f}"
+            f"{measure(encode_append):>14.1f}{measure(decode_response):>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark the overhead of the client on each request.
+
+Sends requests through the client with the network replaced by a function that
+answers instantly, so that what is measured is the time spent in the client:
+validating the path, building the request, its URL and its headers, retrying,
+instrumenting and decoding. The time to build and decode the response itself is
+measured separately and subtracted.
+
+    python benchmarks/request_overhead.py
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from notion_client import AsyncClient, Client
+
+ROUNDS = 1000
+REPEAT = 15
+
+PAGE_ID = "b55c9c91-384d-452b-81db-d1ef79372b75"
+BODY = b'{"object": "page", "id": "b55c9c91-384d-452b-81db-d1ef79372b75"}'
+REQUEST = httpx.Request("GET", f"https://api.notion.com/v1/pages/{PAGE_ID}")
+
+
+def respond(request: httpx.Request, **kwargs: Any) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=BODY,
+        headers={"content-type": "application/json"},
+        request=request,
+    )
+
+
+async def arespond(request: httpx.Request, **kwargs: Any) -> httpx.Response:
+    return respond(request)
+
+
+def measure(cases: Dict[str, Callable[[], Any]]) -> Dict[str, float]:
+    """Return the best time of a call of each case in microseconds. Cases are
+    interleaved so that they share the noise of the machine."""
+    timings: Dict[str, List[float]] = {name: [] for name in cases}
+    for _ in range(REPEAT):
+        for name, function in cases.items():
+            started_at = time.perf_counter()
+            for _ in range(ROUNDS):
+                function()
+            timings[name].append(time.perf_counter() - started_at)
+    return {name: min(times) / ROUNDS * 1e6 for name, times in timings.items()}
+
+
+def ameasure(cases: Dict[str, Callable[[], Awaitable[Any]]]) -> Dict[str, float]:
+    """Return the best time of an awaited call of each case in microseconds."""
+
+    async def run() -> Dict[str, float]:
+        timings: Dict[str, List[float]] = {name: [] for name in cases}
+        for _ in range(REPEAT):
+            for name, function in cases.items():
+                started_at = time.perf_counter()
+                for _ in range(ROUNDS):
+                    await function()
+                timings[name].append(time.perf_counter() - started_at)
+        return {name: min(times) / ROUNDS * 1e6 for name, times in timings.items()}
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    client = Client(auth="secret")
+    client.client.send = respond  # type: ignore[method-assign]
+    async_client = AsyncClient(auth="secret")
+    async_client.client.send = arespond  # type: ignore[method-assign]
+
+    results = measure(
+        {
+            "response (baseline)": lambda: respond(REQUEST).json(),
+            "pages.retrieve": lambda: client.pages.retrieve(page_id=PAGE_ID),
+            "pages.retrieve (per-request auth)": lambda: client.pages.retrieve(
+                page_id=PAGE_ID, auth="other"
+            ),
+            "blocks.children.list": lambda: client.blocks.children.list(
+                block_id=PAGE_ID
+            ),
+            "search": lambda: client.search(query="tasks", page_size=10),
+            "oauth.introspect (Basic auth)": lambda: client.oauth.introspect(
+                client_id="id", client_secret="secret", token="token"
+            ),
+        }
+    )
+    results.update(
+        ameasure(
+            {
+                "async pages.retrieve": lambda: async_client.pages.retrieve(
+                    page_id=PAGE_ID
+                ),
+            }
+        )
+    )
+
+    baseline = results.pop("response (baseline)")
+    print(f"{ROUNDS} rounds, best of {REPEAT}, response baseline {baseline:.1f} µs\n")
+    print(f"{'request':<36}{'overhead (µs)':>14}")
+    for name, total in results.items():
+        print(f"{name:<36}{total - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,41 @@ creating powerful workflows.
 For more information visit https://github.com/ramnes/notion-sdk-py.
 """
 
-from .client import AsyncClient, Client, RetryOptions
+from .cache import ResponseCache
+from .client import (
+    AdaptiveConcurrencyOptions,
+    AsyncClient,
+    CircuitBreakerOptions,
+    Client,
+    CompressionOptions,
+    ConnectionOptions,
+    HedgingOptions,
+    JSONCodec,
+    RateLimitOptions,
+    RawResponse,
+    RetryOptions,
+)
 from .constants import (
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT_MS,
     DEFAULT_MAX_RETRIES,
     DEFAULT_INITIAL_RETRY_DELAY_MS,
     DEFAULT_MAX_RETRY_DELAY_MS,
+    DEFAULT_RATE_LIMIT_PER_SECOND,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_INITIAL_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAP_CONCURRENCY,
+    DEFAULT_COMPRESSION_MIN_BYTES,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTL_MS,
+    DEFAULT_SCHEMA_TTL_MS,
+    DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    DEFAULT_CIRCUIT_BREAKER_RECOVERY_MS,
     MIN_VIEW_COLUMN_WIDTH,
 )
+from .deadlines import deadline
 from .errors import (
     # Error codes
     NotionErrorCode,
@@ -26,10 +52,16 @@ from .errors import (
     UnknownHTTPResponseError,
     RequestTimeoutError,
     InvalidPathParameterError,
+    CircuitOpenError,
     # Error helpers
     is_notion_client_error,
     is_http_response_error,
 )
+from .hooks import Hooks, RequestEvent
+from .metrics import MetricsCollector
+from .models import Block, DataSource, Page, RichText, User, from_response
+from .schema import RowDecoder, SchemaRegistry, compile_row_decoder
+from .timings import RequestTimings
 from .helpers import (
     collect_paginated_api,
     iterate_paginated_api,
@@ -48,21 +80,63 @@ from .helpers import (
     extract_page_id,
     extract_block_id,
 )
+from .store import ObjectStore
+from .streaming import AsyncStreamedResponse, StreamedResponse
 from .webhooks import (
+    invalidate_from_webhook,
     sign_webhook_payload,
     verify_webhook_signature,
+    webhook_event_object_ids,
 )
 
 __all__ = [
     "AsyncClient",
     "Client",
     "RetryOptions",
+    "RateLimitOptions",
+    "AdaptiveConcurrencyOptions",
+    "ConnectionOptions",
+    "HedgingOptions",
+    "CircuitBreakerOptions",
+    "CompressionOptions",
+    "JSONCodec",
+    "RawResponse",
+    "StreamedResponse",
+    "AsyncStreamedResponse",
     "DEFAULT_BASE_URL",
     "DEFAULT_TIMEOUT_MS",
     "DEFAULT_MAX_RETRIES",
     "DEFAULT_INITIAL_RETRY_DELAY_MS",
     "DEFAULT_MAX_RETRY_DELAY_MS",
+    "DEFAULT_RATE_LIMIT_PER_SECOND",
+    "DEFAULT_RATE_LIMIT_BURST",
+    "DEFAULT_INITIAL_CONCURRENCY",
+    "DEFAULT_MAX_CONCURRENCY",
+    "DEFAULT_MAP_CONCURRENCY",
+    "DEFAULT_COMPRESSION_MIN_BYTES",
+    "DEFAULT_CACHE_MAX_ENTRIES",
+    "DEFAULT_CACHE_MAX_BYTES",
+    "DEFAULT_CACHE_TTL_MS",
+    "DEFAULT_SCHEMA_TTL_MS",
+    "DEFAULT_CIRCUIT_BREAKER_THRESHOLD",
+    "DEFAULT_CIRCUIT_BREAKER_RECOVERY_MS",
     "MIN_VIEW_COLUMN_WIDTH",
+    "deadline",
+    "Hooks",
+    "RequestEvent",
+    "MetricsCollector",
+    "ResponseCache",
+    "ObjectStore",
+    "Page",
+    "Block",
+    "DataSource",
+    "User",
+    "RichText",
+    "from_response",
+    "RowDecoder",
+    "compile_row_decoder",
+    "SchemaRegistry",
+    "RequestTimings",
     "NotionErrorCode",
     "APIErrorCode",
     "ClientErrorCode",
@@ -71,6 +145,7 @@ __all__ = [
     "UnknownHTTPResponseError",
     "RequestTimeoutError",
     "InvalidPathParameterError",
+    "CircuitOpenError",
     "is_notion_client_error",
     "is_http_response_error",
     "collect_paginated_api",
@@ -91,4 +166,6 @@ __all__ = [
     "extract_block_id",
     "sign_webhook_payload",
     "verify_webhook_signature",
+    "invalidate_from_webhook",
+    "webhook_event_object_ids",
 ]
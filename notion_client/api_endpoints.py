@@ -50,6 +50,7 @@ class BlocksMeetingNotesEndpoint(Endpoint):
             path="blocks/meeting_notes/query",
             method="POST",
             body=pick(kwargs, "filter", "sort", "limit"),
+            idempotent=True,
             auth=kwargs.get("auth"),
         )
 
@@ -198,7 +199,18 @@ class DataSourcesEndpoint(Endpoint):
         """Get a list of [Pages](https://developers.notion.com/reference/page) and/or [Data Sources](https://developers.notion.com/reference/data-source) contained in the data source.
 
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/query-a-data-source)*
+
+        `properties` (property names) fills `filter_properties` in with their IDs,
+        and cannot be given along with it.
         """  # noqa: E501
+        if "properties" in kwargs:
+            if "filter_properties" in kwargs:
+                raise ValueError("properties and filter_properties are exclusive")
+            return self.parent._with_property_ids(
+                data_source_id,
+                kwargs,
+                lambda kwargs: self.query(data_source_id, **kwargs),
+            )
         return self.parent.request(
             path=f"data_sources/{data_source_id}/query",
             method="POST",
@@ -213,6 +225,7 @@ class DataSourcesEndpoint(Endpoint):
                 "in_trash",
                 "result_type",
             ),
+            idempotent=True,
             auth=kwargs.get("auth"),
         )
 
@@ -302,7 +315,21 @@ class PagesEndpoint(Endpoint):
         """Retrieve a [Page object](https://developers.notion.com/reference/page) using the ID specified.
 
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/retrieve-a-page)*
-        """  # noqa: E501
+
+        `properties` (property names) fills `filter_properties` in with their IDs,
+        from the schema of the data source of the page given as `data_source_id`,
+        and cannot be given along with it.
+        """  # noqa: E501
+        if "properties" in kwargs:
+            if "data_source_id" not in kwargs:
+                raise ValueError("properties requires the data_source_id of the page")
+            if "filter_properties" in kwargs:
+                raise ValueError("properties and filter_properties are exclusive")
+            return self.parent._with_property_ids(
+                kwargs["data_source_id"],
+                kwargs,
+                lambda kwargs: self.retrieve(page_id, **kwargs),
+            )
         return self.parent.request(
             path=f"pages/{page_id}",
             method="GET",
@@ -419,6 +446,7 @@ class ViewsQueriesEndpoint(Endpoint):
             path=f"views/{view_id}/queries",
             method="POST",
             body=pick(kwargs, "page_size"),
+            idempotent=True,
             auth=kwargs.get("auth"),
         )
 
@@ -543,6 +571,7 @@ class SearchEndpoint(Endpoint):
             path="search",
             method="POST",
             body=pick(kwargs, "query", "sort", "filter", "start_cursor", "page_size"),
+            idempotent=True,
             auth=kwargs.get("auth"),
         )
 
@@ -742,6 +771,7 @@ class OAuthEndpoint(Endpoint):
             path="oauth/introspect",
             method="POST",
             body=pick(kwargs, "token"),
+            idempotent=True,
             auth={"client_id": client_id, "client_secret": client_secret},
         )
 
@@ -0,0 +1,145 @@
+"""In-memory response cache for notion-sdk-py.
+
+Pages, blocks, data sources, databases, users and views are often read again and
+again, and each read costs a request against the rate limit of the integration.
+A `ResponseCache` keeps the bodies of their `retrieve` responses for a while, in
+least recently used order, within a number of entries and a number of bytes.
+
+Entries are indexed by the ID of their object, so that the client can invalidate
+them when it updates, moves or deletes the object.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional, Set
+
+from notion_client.constants import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_TTL_MS,
+)
+
+CACHED_COLLECTIONS = frozenset(
+    ("pages", "blocks", "data_sources", "databases", "users", "views")
+)
+"""First segment of the paths of the objects whose `retrieve` responses are
+cached."""
+
+
+def normalize_id(object_id: str) -> str:
+    """Return an ID without dashes and in lower case, as IDs are accepted in both
+    forms."""
+    return object_id.replace("-", "").lower()
+
+
+class _Entry(NamedTuple):
+    object_id: str
+    content: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies, with a time to live.
+
+    Bodies are kept as the bytes received, so that each hit decodes a new object
+    that callers are free to mutate.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttl_ms: int = DEFAULT_CACHE_TTL_MS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_ms / 1000.0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._keys_by_id: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached bodies."""
+        return self._bytes
+
+    @property
+    def version(self) -> int:
+        """Number of invalidations so far. Read it before fetching a body, and
+        pass it to `set()` so that a body fetched before an invalidation is not
+        cached after it."""
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the body cached under a key, or None if there is none or it
+        expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.content
+
+    def set(
+        self,
+        key: Hashable,
+        object_id: str,
+        content: bytes,
+        version: Optional[int] = None,
+    ) -> None:
+        """Cache the body of the object with the given ID under a key, evicting
+        the least recently used bodies beyond the bounds of the cache.
+
+        Nothing is cached if the cache was invalidated since `version`, or if the
+        body alone exceeds `max_bytes`."""
+        if len(content) > self.max_bytes:
+            return
+        object_id = normalize_id(object_id)
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(object_id, content, time.monotonic() + self.ttl)
+            self._keys_by_id.setdefault(object_id, set()).add(key)
+            self._bytes += len(content)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, object_id: str) -> None:
+        """Remove the bodies cached for an object, e.g. after it changed."""
+        object_id = normalize_id(object_id)
+        with self._lock:
+            self._version += 1
+            for key in list(self._keys_by_id.get(object_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all the cached bodies."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._keys_by_id.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.content)
+        keys = self._keys_by_id[entry.object_id]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_id[entry.object_id]
@@ -0,0 +1,87 @@
+"""Circuit breaking for notion-sdk-py.
+
+When Notion keeps failing on a family of endpoints (e.g. during an incident),
+retrying every request only ties up the callers. A circuit breaker counts the
+consecutive failures of each family and, past a threshold, "opens": requests are
+rejected right away until a recovery timeout elapses. It then lets a single probe
+request through ("half-open"), which closes the circuit if it succeeds and opens
+it again if it fails.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing_since: Optional[float] = None
+
+
+class CircuitBreaker:
+    """Keep one circuit per key, opened after `failure_threshold` consecutive
+    failures and probed again `recovery_timeout` seconds later.
+
+    A probe that never reports back (e.g. a cancelled request) does not keep the
+    circuit half-open forever: another probe is let through after
+    `recovery_timeout` seconds.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must not be negative")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._circuits: Dict[Hashable, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, key: Hashable) -> float:
+        """Return 0 if a request for `key` may be sent, or else the number of
+        seconds until the circuit lets a probe request through."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.opened_at is None:
+                return 0.0
+
+            now = time.monotonic()
+            since = circuit.opened_at
+            if circuit.probing_since is not None:
+                since = max(since, circuit.probing_since)
+            remaining = since + self.recovery_timeout - now
+            if remaining > 0:
+                return remaining
+
+            circuit.probing_since = now
+            return 0.0
+
+    def on_success(self, key: Hashable) -> None:
+        """Close the circuit of `key`."""
+        with self._lock:
+            self._circuits.pop(key, None)
+
+    def on_failure(self, key: Hashable) -> bool:
+        """Count a failure for `key`, and return True if it opened the circuit."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit()
+
+            circuit.failures += 1
+            if circuit.opened_at is None and circuit.failures < self.failure_threshold:
+                return False
+
+            was_closed = circuit.opened_at is None
+            circuit.opened_at = time.monotonic()
+            circuit.probing_since = None
+            return was_closed
+
+    def is_open(self, key: Hashable) -> bool:
+        """Return True if the circuit of `key` is open or half-open."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit is not None and circuit.opened_at is not None
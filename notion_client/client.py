@@ -2,15 +2,38 @@
 
 import asyncio
 import base64
+import gzip
+import json
 import logging
 import math
 import random
+import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from abc import abstractmethod
 from dataclasses import dataclass, field
 from email.utils import parsedate_to_datetime
 from types import TracebackType
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import httpx
 from httpx import Request, Response
@@ -21,6 +44,14 @@ from notion_client.constants import (
     DEFAULT_MAX_RETRIES,
     DEFAULT_INITIAL_RETRY_DELAY_MS,
     DEFAULT_MAX_RETRY_DELAY_MS,
+    DEFAULT_RATE_LIMIT_PER_SECOND,
+    DEFAULT_RATE_LIMIT_BURST,
+    DEFAULT_INITIAL_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAP_CONCURRENCY,
+    DEFAULT_COMPRESSION_MIN_BYTES,
+    DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+    DEFAULT_CIRCUIT_BREAKER_RECOVERY_MS,
 )
 from notion_client.api_endpoints import (
     AsyncTasksEndpoint,
@@ -40,15 +71,69 @@ from notion_client.errors import (
     APIErrorCode,
     APIResponseError,
     build_request_error,
+    CircuitOpenError,
     is_http_response_error,
     is_notion_client_error,
-    NotionClientError,
     RequestTimeoutError,
     validate_request_path,
 )
-from notion_client.logging import make_console_logger
+from notion_client.cache import CACHED_COLLECTIONS, ResponseCache, normalize_id
+from notion_client.circuit_breaker import CircuitBreaker
+from notion_client.deadlines import current_deadline
+from notion_client.hedging import HedgingPolicy
+from notion_client.helpers import path_template
+from notion_client.hooks import Hooks, RequestEvent
+from notion_client.logging import LoggingSubscriber, make_console_logger
+from notion_client.metrics import MetricsCollector
+from notion_client.schema import SchemaRegistry, resolve_property_ids
+from notion_client.singleflight import AsyncSingleFlight, SingleFlight
+from notion_client.streaming import AsyncStreamedResponse, StreamedResponse
+from notion_client.throttling import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    RetryBudget,
+)
+from notion_client.timings import RequestTimings, TimingsRecorder
+from notion_client.tracing import (
+    attempt_span,
+    call_span,
+    record_error,
+    record_response,
+    wait_span,
+)
 from notion_client.typing import SyncAsync
 
+T = TypeVar("T")
+
+# Number of tokens and OAuth credentials whose headers are kept by a client.
+_AUTH_HEADERS_CACHE_SIZE = 256
+
+# Notion puts the request ID at the end of its response bodies.
+_TRAILING_REQUEST_ID = re.compile(rb'"request_id"\s*:\s*"([^"\\]*)"\s*}\s*$')
+
+# List endpoints, whose responses are streamed with the `stream_results` option.
+_STREAMED_ENDPOINTS = frozenset(
+    (
+        ("GET", "blocks/{block_id}/children"),
+        ("GET", "comments"),
+        ("GET", "custom_emojis"),
+        ("GET", "file_uploads"),
+        ("GET", "users"),
+        ("GET", "views"),
+        ("GET", "views/{view_id}/queries/{query_id}"),
+        ("POST", "blocks/meeting_notes/query"),
+        ("POST", "data_sources/{data_source_id}/query"),
+        ("POST", "search"),
+    )
+)
+
+
+def _dumps(body: Any) -> bytes:
+    """Encodes a JSON request body like HTTPX does."""
+    return json.dumps(
+        body, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    ).encode()
+
 
 @dataclass
 class RetryOptions:
@@ -59,11 +144,186 @@ class RetryOptions:
         initial_retry_delay_ms: Initial delay between retries in milliseconds.
             Used as base for exponential back-off when retry-after header is absent.
         max_retry_delay_ms: Maximum delay between retries in milliseconds.
+        budget_ratio: Number of retries allowed per request sent by the client,
+            over the last `budget_window_ms`. Retries beyond the budget are skipped
+            so they cannot multiply the load during incidents. Disabled when None.
+        budget_min_retries: Number of retries always allowed over the last
+            `budget_window_ms`, whatever the number of requests.
+        budget_window_ms: Length in milliseconds of the sliding window of the
+            retry budget.
     """
 
     max_retries: int = DEFAULT_MAX_RETRIES
     initial_retry_delay_ms: int = DEFAULT_INITIAL_RETRY_DELAY_MS
     max_retry_delay_ms: int = DEFAULT_MAX_RETRY_DELAY_MS
+    budget_ratio: Optional[float] = None
+    budget_min_retries: int = 10
+    budget_window_ms: int = 10_000
+
+
+@dataclass
+class RateLimitOptions:
+    """Configuration for the client-side token-bucket rate limiter.
+
+    Attributes:
+        requests_per_second: Average number of requests allowed per second.
+        burst: Number of requests that can be sent back-to-back before the average
+            rate applies.
+        per_token: Keep a separate bucket for each auth token instead of sharing a
+            single bucket across every request sent by the client.
+    """
+
+    requests_per_second: float = DEFAULT_RATE_LIMIT_PER_SECOND
+    burst: int = DEFAULT_RATE_LIMIT_BURST
+    per_token: bool = True
+
+
+@dataclass
+class AdaptiveConcurrencyOptions:
+    """Configuration for the adaptive concurrency limiter of `AsyncClient`.
+
+    The number of requests allowed in flight grows while responses succeed and is
+    cut sharply when Notion answers with a rate limit error or a retry-after header
+    (additive increase, multiplicative decrease).
+
+    Attributes:
+        initial_limit: Number of requests allowed in flight at start.
+        min_limit: Lower bound for the number of requests allowed in flight.
+        max_limit: Upper bound for the number of requests allowed in flight.
+        increase: How much the limit grows after a full window of successes.
+        decrease_factor: Factor applied to the limit when the client is throttled.
+    """
+
+    initial_limit: int = DEFAULT_INITIAL_CONCURRENCY
+    min_limit: int = 1
+    max_limit: int = DEFAULT_MAX_CONCURRENCY
+    increase: float = 1.0
+    decrease_factor: float = 0.5
+
+
+@dataclass
+class HedgingOptions:
+    """Configuration for hedged GET requests in `AsyncClient`.
+
+    When a GET request takes longer than the given percentile of the recent
+    latencies of its endpoint, a second copy is sent and whichever answers first
+    is used. The copy is only sent if the rate limiter (when enabled) has a token
+    available right away, and it counts against the adaptive concurrency limit.
+
+    Attributes:
+        percentile: Percentile of the recent latencies after which a request is
+            hedged.
+        min_delay_ms: Minimum delay in milliseconds before hedging a request.
+        min_samples: Number of latencies to record for an endpoint before its
+            requests are hedged.
+        window: Number of recent latencies kept for each endpoint.
+    """
+
+    percentile: float = 95.0
+    min_delay_ms: int = 50
+    min_samples: int = 20
+    window: int = 200
+
+
+@dataclass
+class CircuitBreakerOptions:
+    """Configuration for the circuit breakers of the client.
+
+    Each family of endpoints (`pages`, `blocks`, `data_sources`, `search`...) has
+    its own circuit breaker. It opens after `failure_threshold` consecutive server
+    errors (5xx), timeouts or connection errors, and then rejects requests to the
+    family with a `CircuitOpenError` until `recovery_timeout_ms` have elapsed. A
+    single probe request is then let through: the circuit closes if it succeeds,
+    and opens again if it fails.
+
+    Attributes:
+        failure_threshold: Number of consecutive failures that opens the circuit.
+        recovery_timeout_ms: Time in milliseconds an open circuit rejects requests
+            before letting a probe request through.
+    """
+
+    failure_threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD
+    recovery_timeout_ms: int = DEFAULT_CIRCUIT_BREAKER_RECOVERY_MS
+
+
+@dataclass
+class ConnectionOptions:
+    """Configuration for the connection pool of the inner HTTPX clients.
+
+    Attributes:
+        max_connections: Maximum number of concurrent connections.
+        max_keepalive_connections: Maximum number of idle connections kept alive.
+        keepalive_expiry: Number of seconds an idle connection is kept alive.
+        http2: Enable HTTP/2. Requires the `http2` extra of HTTPX
+            (`pip install httpx[http2]`).
+        transport_factory: Callable returning the transport of each new inner
+            client: an `httpx.BaseTransport` for `Client`, or an
+            `httpx.AsyncBaseTransport` for `AsyncClient`.
+    """
+
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    http2: bool = False
+    transport_factory: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class CompressionOptions:
+    """Configuration for the compression of request bodies.
+
+    Attributes:
+        min_bytes: Size in bytes from which JSON request bodies are compressed,
+            such as blocks appended by the hundred. Smaller bodies are sent as
+            they are, as compressing them would save little.
+        level: gzip compression level, from 1 (fastest) to 9 (smallest).
+    """
+
+    min_bytes: int = DEFAULT_COMPRESSION_MIN_BYTES
+    level: int = 6
+
+
+@dataclass
+class JSONCodec:
+    """JSON encoder and decoder for request and response bodies.
+
+    Any pair of callables can be used, such as `orjson.dumps` and `orjson.loads`,
+    or `msgspec.json.encode` and `msgspec.json.decode`.
+
+    Attributes:
+        dumps: Callable encoding a request body to `str` or `bytes`.
+        loads: Callable decoding a response body from `bytes`.
+    """
+
+    dumps: Callable[[Any], Union[str, bytes]] = json.dumps
+    loads: Callable[[bytes], Any] = json.loads
+
+
+@dataclass
+class RawResponse:
+    """Undecoded successful response, returned instead of the decoded body by
+    clients and requests in raw mode.
+
+    Attributes:
+        content: Body of the response, as sent by Notion.
+        status: HTTP status code of the response.
+        headers: Headers of the response.
+        request_id: ID of the request, when found at the end of the body.
+        timings: Breakdown of the time spent on the request.
+        loads: Callable decoding the body, the `json_codec` of the client if it
+            has one.
+    """
+
+    content: bytes
+    status: int
+    headers: httpx.Headers
+    request_id: Optional[str] = None
+    timings: Optional[RequestTimings] = None
+    loads: Callable[[bytes], Any] = field(default=json.loads, repr=False, compare=False)
+
+    def json(self) -> Any:
+        """Decode the body of the response."""
+        return self.loads(self.content)
 
 
 @dataclass
@@ -75,6 +335,10 @@ class ClientOptions:
             should be set on each request.
         timeout_ms: Number of milliseconds to wait before emitting a
             `RequestTimeoutError`.
+        deadline_ms: Number of milliseconds each call has to complete in total,
+            retries included, before emitting a `RequestTimeoutError`. Retries
+            whose delay would exceed the deadline are skipped. No deadline when
+            None.
         base_url: The root URL for sending API requests. This can be changed to test
             with a mock server.
         log_level: Verbosity of logs the instance will produce. By default, logs are
@@ -83,21 +347,88 @@ class ClientOptions:
         notion_version: Notion version to use.
         retry: Configuration for automatic retries on rate limit (429) and server errors.
             Set to False to disable retries entirely.
+        rate_limit: Configuration for the client-side rate limiter, which delays
+            requests so they stay under Notion's request rate. Disabled by default;
+            set to True to use the default `RateLimitOptions`.
+        adaptive_concurrency: Configuration for the adaptive limit on in-flight
+            requests. Only used by `AsyncClient`. Disabled by default; set to True
+            to use the default `AdaptiveConcurrencyOptions`.
+        connection: Configuration for the connection pool of the inner HTTPX
+            clients created by the client. Not used when an HTTPX client is passed
+            to the constructor.
+        deduplicate_requests: Send only one request when identical GET requests
+            (same path, query and auth) are made concurrently, and share its
+            response between the callers. Callers then receive the same object,
+            which they should not mutate.
+        hedging: Configuration for hedged GET requests. Only used by
+            `AsyncClient`. Disabled by default; set to True to use the default
+            `HedgingOptions`.
+        json_codec: JSON encoder and decoder for request and response bodies. By
+            default, bodies are encoded and decoded by HTTPX with the standard
+            library.
+        raw_responses: Return successful responses as `RawResponse` objects
+            holding the undecoded body, instead of decoding them. Error responses
+            are still decoded to raise the matching errors.
+        stream_results: Return the successful responses of list endpoints (such
+            as queries, search and block children) as `StreamedResponse` (or
+            `AsyncStreamedResponse`) objects, which decode the items of their
+            `results` as they are received. Other endpoints still return
+            dicts. Ignored in raw mode.
+        circuit_breaker: Configuration for the circuit breakers, which fail requests
+            fast with a `CircuitOpenError` while a family of endpoints keeps failing.
+            Disabled by default; set to True to use the default
+            `CircuitBreakerOptions`.
+        metrics: Collector of request metrics, available as the `metrics`
+            attribute of the client. Disabled by default; set to True to use a new
+            `MetricsCollector`, or pass one to share it between clients.
+        tracer: OpenTelemetry tracer (e.g. `trace.get_tracer("notion_client")`)
+            creating a span for each API call, with child spans for its attempts
+            and for its waits. No tracing when None.
+        compress_requests: Configuration for the gzip compression of large JSON
+            request bodies. Disabled by default; set to True to use the default
+            `CompressionOptions`. Compression is turned off for the rest of the
+            life of the client if Notion rejects a compressed body.
+        cache: Cache of the responses of the `retrieve` endpoints of pages,
+            blocks, data sources, databases, users and views, available as the
+            `cache` attribute of the client. Disabled by default; set to True to
+            use a new `ResponseCache`, or pass one to configure its bounds or
+            share it between clients. Cached objects are invalidated when the
+            client updates, moves or deletes them.
+        schemas: Registry of the property IDs of data sources by name, used for
+            the `properties` argument of `data_sources.query` and
+            `pages.retrieve` and available as the `schemas` attribute of the
+            client. A new `SchemaRegistry` when None; pass one to change its TTL
+            or share it between clients.
     """
 
     auth: Optional[str] = None
     timeout_ms: int = DEFAULT_TIMEOUT_MS
+    deadline_ms: Optional[int] = None
     base_url: str = DEFAULT_BASE_URL
     log_level: int = logging.WARNING
     logger: Optional[logging.Logger] = None
     notion_version: str = "2025-09-03"
     retry: Union[RetryOptions, bool] = field(default_factory=RetryOptions)
+    rate_limit: Union[RateLimitOptions, bool] = False
+    adaptive_concurrency: Union[AdaptiveConcurrencyOptions, bool] = False
+    connection: ConnectionOptions = field(default_factory=ConnectionOptions)
+    deduplicate_requests: bool = False
+    hedging: Union[HedgingOptions, bool] = False
+    circuit_breaker: Union[CircuitBreakerOptions, bool] = False
+    json_codec: Optional[JSONCodec] = None
+    raw_responses: bool = False
+    stream_results: bool = False
+    metrics: Union[MetricsCollector, bool] = False
+    tracer: Optional[Any] = None
+    compress_requests: Union[CompressionOptions, bool] = False
+    cache: Union[ResponseCache, bool] = False
+    schemas: Optional[SchemaRegistry] = None
 
 
 class BaseClient:
     def __init__(
         self,
-        client: Union[httpx.Client, httpx.AsyncClient],
+        client: Optional[Union[httpx.Client, httpx.AsyncClient]],
         options: Optional[Union[Dict[str, Any], ClientOptions]] = None,
         **kwargs: Any,
     ) -> None:
@@ -109,7 +440,33 @@ class BaseClient:
         self.logger = options.logger or make_console_logger()
         self.logger.setLevel(options.log_level)
         self.options = options
+        self.hooks = Hooks()
+        self._logging = LoggingSubscriber(self.logger)
+        self._logging.register(self.hooks)
+
+        self._tracer = options.tracer
+
+        self.metrics: Optional[MetricsCollector] = None
+        if options.metrics is not False:
+            self.metrics = (
+                options.metrics
+                if isinstance(options.metrics, MetricsCollector)
+                else MetricsCollector()
+            )
+            self.hooks.subscribe(self.metrics)
+
+        self.cache: Optional[ResponseCache] = None
+        if options.cache is not False:
+            self.cache = (
+                options.cache
+                if isinstance(options.cache, ResponseCache)
+                else ResponseCache()
+            )
+        self.schemas = (
+            options.schemas if options.schemas is not None else SchemaRegistry()
+        )
 
+        self._retry_budget: Optional[RetryBudget] = None
         if options.retry is False:
             self._max_retries = 0
             self._initial_retry_delay_ms = 0
@@ -118,14 +475,89 @@ class BaseClient:
             self._max_retries = options.retry.max_retries
             self._initial_retry_delay_ms = options.retry.initial_retry_delay_ms
             self._max_retry_delay_ms = options.retry.max_retry_delay_ms
+            if options.retry.budget_ratio is not None:
+                self._retry_budget = RetryBudget(
+                    ratio=options.retry.budget_ratio,
+                    min_retries=options.retry.budget_min_retries,
+                    window=options.retry.budget_window_ms / 1000.0,
+                )
         else:
             retry_opts = RetryOptions()
             self._max_retries = retry_opts.max_retries
             self._initial_retry_delay_ms = retry_opts.initial_retry_delay_ms
             self._max_retry_delay_ms = retry_opts.max_retry_delay_ms
 
+        self._compression: Optional[CompressionOptions] = None
+        if options.compress_requests is not False:
+            self._compression = (
+                options.compress_requests
+                if isinstance(options.compress_requests, CompressionOptions)
+                else CompressionOptions()
+            )
+
+        self._hedging_policy: Optional[HedgingPolicy] = None
+        if options.hedging is not False:
+            hedging_opts = (
+                options.hedging
+                if isinstance(options.hedging, HedgingOptions)
+                else HedgingOptions()
+            )
+            self._hedging_policy = HedgingPolicy(
+                percentile=hedging_opts.percentile,
+                min_delay_ms=hedging_opts.min_delay_ms,
+                min_samples=hedging_opts.min_samples,
+                window=hedging_opts.window,
+            )
+
+        self._rate_limiter: Optional[RateLimiter] = None
+        self._rate_limit_per_token = False
+        if options.rate_limit is not False:
+            rate_limit_opts = (
+                options.rate_limit
+                if isinstance(options.rate_limit, RateLimitOptions)
+                else RateLimitOptions()
+            )
+            self._rate_limiter = RateLimiter(
+                rate_limit_opts.requests_per_second, rate_limit_opts.burst
+            )
+            self._rate_limit_per_token = rate_limit_opts.per_token
+
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if options.adaptive_concurrency is not False:
+            concurrency_opts = (
+                options.adaptive_concurrency
+                if isinstance(options.adaptive_concurrency, AdaptiveConcurrencyOptions)
+                else AdaptiveConcurrencyOptions()
+            )
+            self._concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=concurrency_opts.initial_limit,
+                min_limit=concurrency_opts.min_limit,
+                max_limit=concurrency_opts.max_limit,
+                increase=concurrency_opts.increase,
+                decrease_factor=concurrency_opts.decrease_factor,
+            )
+
+        self._circuit_breaker: Optional[CircuitBreaker] = None
+        if options.circuit_breaker is not False:
+            circuit_breaker_opts = (
+                options.circuit_breaker
+                if isinstance(options.circuit_breaker, CircuitBreakerOptions)
+                else CircuitBreakerOptions()
+            )
+            self._circuit_breaker = CircuitBreaker(
+                failure_threshold=circuit_breaker_opts.failure_threshold,
+                recovery_timeout=circuit_breaker_opts.recovery_timeout_ms / 1000.0,
+            )
+
+        self._auth_headers_cache: Dict[Hashable, Dict[str, str]] = {}
+        self._lock = threading.RLock()
+        self._entries = 0
         self._clients: List[Union[httpx.Client, httpx.AsyncClient]] = []
-        self.client = client
+        # Inner clients passed by the caller are reused as is and never closed
+        # by context managers; default ones are created lazily.
+        self._owns_client = client is None
+        if client is not None:
+            self.client = client
 
         self.blocks = BlocksEndpoint(self)
         self.databases = DatabasesEndpoint(self)
@@ -142,13 +574,17 @@ class BaseClient:
 
     @property
     def client(self) -> Union[httpx.Client, httpx.AsyncClient]:
+        if not self._clients:
+            with self._lock:
+                if not self._clients:
+                    self.client = self._make_http_client()
         return self._clients[-1]
 
     @client.setter
     def client(self, client: Union[httpx.Client, httpx.AsyncClient]) -> None:
         client.base_url = httpx.URL(f"{self.options.base_url}/v1/")
         client.timeout = httpx.Timeout(timeout=self.options.timeout_ms / 1_000)
-        client.headers = httpx.Headers(
+        client.headers.update(
             {
                 "Notion-Version": self.options.notion_version,
                 "User-Agent": "ramnes/notion-sdk-py@3.1.0",
@@ -158,6 +594,26 @@ class BaseClient:
             client.headers["Authorization"] = f"Bearer {self.options.auth}"
         self._clients.append(client)
 
+    @abstractmethod
+    def _make_http_client(self) -> Union[httpx.Client, httpx.AsyncClient]:
+        # noqa
+        pass
+
+    def _http_client_options(self) -> Dict[str, Any]:
+        """Returns the keyword arguments used to create inner HTTPX clients."""
+        connection = self.options.connection
+        http_client_options: Dict[str, Any] = {
+            "limits": httpx.Limits(
+                max_connections=connection.max_connections,
+                max_keepalive_connections=connection.max_keepalive_connections,
+                keepalive_expiry=connection.keepalive_expiry,
+            ),
+            "http2": connection.http2,
+        }
+        if connection.transport_factory is not None:
+            http_client_options["transport"] = connection.transport_factory()
+        return http_client_options
+
     def _build_request(
         self,
         method: str,
@@ -167,16 +623,32 @@ class BaseClient:
         form_data: Optional[Dict[Any, Any]] = None,
         auth: Optional[Union[str, Dict[str, str]]] = None,
     ) -> Request:
-        headers = httpx.Headers()
-        if auth:
-            if isinstance(auth, dict):
-                client_id = auth.get("client_id", "")
-                client_secret = auth.get("client_secret", "")
-                credentials = f"{client_id}:{client_secret}"
-                encoded_credentials = base64.b64encode(credentials.encode()).decode()
-                headers["Authorization"] = f"Basic {encoded_credentials}"
-            else:
-                headers["Authorization"] = f"Bearer {auth}"
+        headers = self._auth_headers(auth) if auth else None
+        # An empty query would still make HTTPX parse the URL once more.
+        query = query or None
+
+        json_codec = self.options.json_codec
+        compression = self._compression
+        if not form_data and (json_codec is not None or compression is not None):
+            content: Optional[Union[str, bytes]] = None
+            if body is not None:
+                content = _dumps(body) if json_codec is None else json_codec.dumps(body)
+                headers = {**(headers or {}), "Content-Type": "application/json"}
+                if compression is not None:
+                    if isinstance(content, str):
+                        content = content.encode()
+                    if len(content) >= compression.min_bytes:
+                        content = gzip.compress(
+                            content, compresslevel=compression.level, mtime=0
+                        )
+                        headers["Content-Encoding"] = "gzip"
+            return self.client.build_request(
+                method,
+                path,
+                params=query,
+                content=content,
+                headers=headers,
+            )
 
         if not form_data:
             return self.client.build_request(
@@ -208,15 +680,54 @@ class BaseClient:
             headers=headers,
         )
 
-    def _parse_response(self, response: Response) -> Any:
+    def _auth_headers(self, auth: Union[str, Dict[str, str]]) -> Dict[str, str]:
+        """Returns the headers authenticating a request with a token or OAuth
+        client credentials, computed once per token and credentials."""
+        if isinstance(auth, dict):
+            key: Hashable = (auth.get("client_id", ""), auth.get("client_secret", ""))
+        else:
+            key = auth
+        headers = self._auth_headers_cache.get(key)
+        if headers is None:
+            if isinstance(key, tuple):
+                credentials = f"{key[0]}:{key[1]}"
+                encoded_credentials = base64.b64encode(credentials.encode()).decode()
+                authorization = f"Basic {encoded_credentials}"
+            else:
+                authorization = f"Bearer {key}"
+            if len(self._auth_headers_cache) >= _AUTH_HEADERS_CACHE_SIZE:
+                self._auth_headers_cache.clear()
+            headers = self._auth_headers_cache[key] = {"Authorization": authorization}
+        return headers
+
+    def _parse_response(self, response: Response, raw: bool = False) -> Any:
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as error:
             body_text = error.response.text
             raise build_request_error(error.response, body_text)
 
+        if raw:
+            content = response.content
+            match = _TRAILING_REQUEST_ID.search(content, max(len(content) - 256, 0))
+            return RawResponse(
+                content=content,
+                status=response.status_code,
+                headers=response.headers,
+                request_id=match.group(1).decode() if match else None,
+                loads=self._decode,
+            )
+
+        if self.options.json_codec is not None:
+            return self.options.json_codec.loads(response.content)
         return response.json()
 
+    def _decode(self, content: bytes) -> Any:
+        """Decodes a JSON response body, such as a cached one."""
+        if self.options.json_codec is not None:
+            return self.options.json_codec.loads(content)
+        return json.loads(content)
+
     def _extract_request_id(self, obj: Any) -> Optional[str]:
         """Extracts request_id from an object if present."""
         if isinstance(obj, dict):
@@ -225,30 +736,316 @@ class BaseClient:
             request_id = getattr(obj, "request_id", None)
         return request_id if isinstance(request_id, str) else None
 
-    def _log_request_success(self, method: str, path: str, response_body: Any) -> None:
-        """Logs a successful request."""
+    def _request_event(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        request: Request,
+        hedged: bool = False,
+    ) -> RequestEvent:
+        """Builds the event of an attempt about to be sent."""
+        content_length = request.headers.get("content-length")
+        wire_bytes = int(content_length) if content_length else None
+        request_bytes = wire_bytes
+        if request.headers.get("content-encoding") == "gzip":
+            # gzip ends with the size of the uncompressed data (modulo 2**32).
+            request_bytes = int.from_bytes(request.content[-4:], "little")
+        return RequestEvent(
+            method=method,
+            path=path,
+            endpoint=path_template(path),
+            attempt=attempt,
+            url=str(request.url),
+            request_bytes=request_bytes,
+            request_wire_bytes=wire_bytes,
+            hedged=hedged,
+        )
+
+    def _response_event(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        response: Response,
+        response_body: Any,
+        started_at: float,
+        decode_started_at: Optional[float],
+        response_bytes: Optional[int],
+        timings: Optional[RequestTimings] = None,
+    ) -> RequestEvent:
+        """Builds the event of a successful attempt."""
+        now = time.monotonic()
+        return RequestEvent(
+            method=method,
+            path=path,
+            endpoint=path_template(path),
+            attempt=attempt,
+            status=response.status_code,
+            request_id=self._extract_request_id(response_body),
+            elapsed=now - started_at,
+            decode_elapsed=(
+                None if decode_started_at is None else now - decode_started_at
+            ),
+            response_bytes=response_bytes,
+            response_wire_bytes=(
+                None if response_bytes is None else response.num_bytes_downloaded
+            ),
+            timings=timings,
+        )
+
+    def _error_event(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        error: Exception,
+        started_at: Optional[float] = None,
+        delay: Optional[float] = None,
+    ) -> RequestEvent:
+        """Builds the event of a failed attempt, or of the wait before the next
+        attempt when `delay` is given."""
+        return RequestEvent(
+            method=method,
+            path=path,
+            endpoint=path_template(path),
+            attempt=attempt,
+            status=error.status if is_http_response_error(error) else None,
+            request_id=self._extract_request_id(error),
+            elapsed=None if started_at is None else time.monotonic() - started_at,
+            delay=delay,
+            error=error,
+        )
+
+    def _record_call_outcome(self, span: Any, attempt: int, response_body: Any) -> None:
+        """Sets the number of attempts and the request ID of a successful call on
+        its span."""
+        span.set_attribute("notion.attempts", attempt + 1)
         request_id = self._extract_request_id(response_body)
-        msg = f"request success: method={method}, path={path}"
         if request_id:
-            msg += f", request_id={request_id}"
-        self.logger.info(msg)
+            span.set_attribute("notion.request_id", request_id)
 
-    def _log_request_error(self, error: NotionClientError, attempt: int = 0) -> None:
-        """Logs a request error with appropriate detail level."""
-        request_id = self._extract_request_id(error)
-        msg = f"request fail: code={error.code}, message={error}, attempt={attempt}"
-        if request_id:
-            msg += f", request_id={request_id}"
-        self.logger.warning(msg)
-        if is_http_response_error(error):
-            self.logger.debug(f"failed response body: {error.body}")
+    def _compression_rejected(self, request: Request, error: Exception) -> bool:
+        """Turns request compression off if Notion rejected a compressed body,
+        in which case the request can be sent again right away.
+
+        Besides 415 Unsupported Media Type, a server ignoring `Content-Encoding`
+        parses the compressed bytes as they are, and answers with an invalid JSON
+        or a validation error."""
+        if "content-encoding" not in request.headers:
+            return False
+        if (is_http_response_error(error) and error.status == 415) or (
+            APIResponseError.is_api_response_error(error)
+            and error.code in (APIErrorCode.InvalidJSON, APIErrorCode.ValidationError)
+        ):
+            self.logger.warning(
+                "compressed request body rejected, "
+                "sending uncompressed bodies from now on"
+            )
+            self._compression = None
+            return True
+        return False
+
+    def _auth_key(self, auth: Optional[Union[str, Dict[str, str]]]) -> Optional[str]:
+        """Returns the token (or OAuth client ID) a request is authenticated with."""
+        if isinstance(auth, dict):
+            return auth.get("client_id")
+        return auth or self.options.auth
+
+    def _reserve_rate_limit(
+        self,
+        auth: Optional[Union[str, Dict[str, str]]],
+        deadline: Optional[float] = None,
+    ) -> float:
+        """Takes a rate limiter token for the request and returns the delay in
+        seconds to wait before sending it. Raises a `RequestTimeoutError` if the
+        deadline would be exceeded by then, after giving the token back."""
+        if self._rate_limiter is None:
+            self._check_deadline(deadline)
+            return 0.0
+
+        key = self._auth_key(auth) if self._rate_limit_per_token else None
+        delay = self._rate_limiter.reserve(key)
+        try:
+            self._check_deadline(deadline, delay)
+        except RequestTimeoutError:
+            self._rate_limiter.cancel(key)
+            raise
+        return delay
 
-    def _can_retry(self, error: Exception, method: str) -> bool:
+    def _try_reserve_rate_limit(
+        self, auth: Optional[Union[str, Dict[str, str]]]
+    ) -> bool:
+        """Takes a rate limiter token for the request only if one is available
+        right away."""
+        if self._rate_limiter is None:
+            return True
+
+        key = self._auth_key(auth) if self._rate_limit_per_token else None
+        return self._rate_limiter.try_reserve(key)
+
+    def _single_flight_key(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[Any, Any]],
+        auth: Optional[Union[str, Dict[str, str]]],
+        raw: bool = False,
+    ) -> Optional[Tuple[str, str, Optional[str], bool]]:
+        """Returns the key identifying identical requests, or None if the request
+        must not be deduplicated."""
+        if not self.options.deduplicate_requests or method.upper() != "GET":
+            return None
+        encoded_query = json.dumps(query, sort_keys=True, default=str)
+        return (path, encoded_query, self._auth_key(auth), raw)
+
+    def _cache_entry(
+        self,
+        method: str,
+        path: str,
+        query: Optional[Dict[Any, Any]],
+        auth: Optional[Union[str, Dict[str, str]]],
+    ) -> Optional[Tuple[Tuple[str, str, str, Optional[str]], str]]:
+        """Returns the cache key and the object ID of a request, or None if its
+        response must not be cached."""
+        if method.upper() != "GET":
+            return None
+        segments = path.strip("/").split("/")
+        if (
+            len(segments) != 2
+            or segments[0] not in CACHED_COLLECTIONS
+            or segments[1] == "me"
+        ):
+            return None
+        object_id = normalize_id(segments[1])
+        encoded_query = json.dumps(query, sort_keys=True, default=str)
+        return (segments[0], object_id, encoded_query, self._auth_key(auth)), object_id
+
+    def _invalidate_caches(self, path: str) -> None:
+        """Invalidates the cached responses and schema of the object a request
+        may have changed, such as the page of `PATCH pages/{page_id}` or of
+        `POST pages/{page_id}/move`. Only called for requests that are neither
+        GET requests nor declared idempotent, as queries change nothing."""
+        segments = path.strip("/").split("/")
+        if len(segments) < 2 or segments[0] not in CACHED_COLLECTIONS:
+            return
+        if self.cache is not None:
+            self.cache.invalidate(segments[1])
+        if segments[0] == "data_sources":
+            self.schemas.invalidate(segments[1])
+
+    def _observed(self, name: str) -> bool:
+        """Returns whether the events `name` have a subscriber, other than the
+        logging subscriber at a disabled level, so that events no one reads are
+        not even built."""
+        return any(
+            getattr(callback, "__self__", None) is not self._logging
+            or self._logging.is_enabled(name)
+            for callback in getattr(self.hooks, name)
+        )
+
+    def _streams_results(self, method: str, path: str) -> bool:
+        """Returns whether a request is streamed by default, which only list
+        endpoints are with the `stream_results` option."""
+        return (
+            self.options.stream_results
+            and (method.upper(), path_template(path)) in _STREAMED_ENDPOINTS
+        )
+
+    def _deadline(self, deadline_ms: Optional[int]) -> Optional[float]:
+        """Returns the `time.monotonic()` value by which a call must complete, from
+        the deadline of the call (or else the client-wide one) and the deadline of
+        the current context, or None if there is no deadline."""
+        context_deadline = current_deadline()
+        if deadline_ms is None:
+            deadline_ms = self.options.deadline_ms
+        if deadline_ms is None:
+            return context_deadline
+
+        call_deadline = time.monotonic() + deadline_ms / 1000.0
+        if context_deadline is None:
+            return call_deadline
+        return min(call_deadline, context_deadline)
+
+    def _check_deadline(self, deadline: Optional[float], delay: float = 0.0) -> None:
+        """Raises a `RequestTimeoutError` if the deadline would be exceeded after
+        waiting `delay` seconds."""
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise RequestTimeoutError()
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """Returns the seconds left before the deadline, or None if there is no
+        deadline."""
+        return None if deadline is None else deadline - time.monotonic()
+
+    def _apply_deadline(self, request: Request, deadline: Optional[float]) -> None:
+        """Caps the timeout of a request attempt to the time left before the
+        deadline."""
+        if deadline is None:
+            return
+
+        self._check_deadline(deadline)
+        remaining = deadline - time.monotonic()
+        timeout = min(self.options.timeout_ms / 1000.0, remaining)
+        request.extensions["timeout"] = httpx.Timeout(timeout).as_dict()
+
+    def _retry_allowed(self, delay: float, deadline: Optional[float]) -> bool:
+        """Determines if a retry after `delay` seconds fits in the deadline and in
+        the retry budget."""
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            self.logger.info("skipping retry: deadline would be exceeded")
+            return False
+        if self._retry_budget is not None and not self._retry_budget.try_retry():
+            self.logger.info("skipping retry: retry budget exhausted")
+            return False
+        return True
+
+    def _check_circuit(self, path: str) -> None:
+        """Raises a `CircuitOpenError` if the circuit breaker of the endpoint family
+        of `path` rejects requests."""
+        if self._circuit_breaker is None:
+            return
+
+        family = path.strip("/").split("/", 1)[0]
+        retry_after = self._circuit_breaker.before_request(family)
+        if retry_after > 0:
+            raise CircuitOpenError(family, retry_after)
+
+    def _record_circuit_outcome(self, path: str, error: Optional[Exception]) -> None:
+        """Reports the outcome of a request to the circuit breaker of the endpoint
+        family of `path`. Only server errors, timeouts and connection errors count
+        as failures: any other response shows the API is up."""
+        if self._circuit_breaker is None:
+            return
+
+        family = path.strip("/").split("/", 1)[0]
+        is_failure = isinstance(error, (RequestTimeoutError, httpx.TransportError)) or (
+            is_http_response_error(error) and error.status >= 500
+        )
+        if not is_failure:
+            self._circuit_breaker.on_success(family)
+        elif self._circuit_breaker.on_failure(family):
+            self.logger.warning(f"circuit opened: family={family}")
+
+    def _is_throttling_error(self, error: Exception) -> bool:
+        """Determines if an error asks the client to slow down, either with a rate
+        limit error code or with a retry-after header."""
+        if not is_http_response_error(error):
+            return False
+        if error.code == APIErrorCode.RateLimited:
+            return True
+        return self._parse_retry_after_header(error.headers) is not None
+
+    def _can_retry(
+        self, error: Exception, method: str, idempotent: Optional[bool] = None
+    ) -> bool:
         """Determines if an error can be retried based on its error code and method.
 
         Rate limits (429) are always retryable since the server explicitly asks us to retry.
-        Server errors (500, 503) are only retried for idempotent methods
-        (GET, DELETE) to avoid duplicate side effects.
+        Server errors (500, 503) are only retried for idempotent requests to avoid
+        duplicate side effects: GET and DELETE requests, and the requests of
+        endpoints declared idempotent (such as queries and search, which are POST
+        requests that don't change anything).
         """
         if not APIResponseError.is_api_response_error(error):
             return False
@@ -257,9 +1054,10 @@ class BaseClient:
         if error.code == APIErrorCode.RateLimited:
             return True
 
-        # Server errors only retry for idempotent methods
-        is_idempotent = method.upper() in ("GET", "DELETE")
-        if is_idempotent:
+        # Server errors only retry for idempotent requests
+        if idempotent is None:
+            idempotent = method.upper() in ("GET", "DELETE")
+        if idempotent:
             return error.code in (
                 APIErrorCode.InternalServerError,
                 APIErrorCode.ServiceUnavailable,
@@ -323,13 +1121,34 @@ class BaseClient:
         body: Optional[Dict[Any, Any]] = None,
         form_data: Optional[Dict[Any, Any]] = None,
         auth: Optional[Union[str, Dict[str, str]]] = None,
+        deadline_ms: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+        raw: Optional[bool] = None,
+        stream: Optional[bool] = None,
+    ) -> SyncAsync[Any]:
+        # noqa
+        pass
+
+    @abstractmethod
+    def _with_property_ids(
+        self,
+        data_source_id: str,
+        kwargs: Dict[str, Any],
+        call: Callable[[Dict[str, Any]], Any],
     ) -> SyncAsync[Any]:
         # noqa
         pass
 
 
 class Client(BaseClient):
-    """Synchronous client for Notion's API."""
+    """Synchronous client for Notion's API.
+
+    A single instance can be shared between threads. Threads that enter the
+    client as a context manager at the same time share one inner client, which
+    is closed when the last of them exits. An inner client passed to the
+    constructor is used for every request and is never closed by the context
+    manager.
+    """
 
     client: httpx.Client
 
@@ -339,13 +1158,16 @@ class Client(BaseClient):
         client: Optional[httpx.Client] = None,
         **kwargs: Any,
     ) -> None:
-        if client is None:
-            client = httpx.Client()
         super().__init__(client, options, **kwargs)
+        self._single_flight = SingleFlight()
 
     def __enter__(self) -> "Client":
-        self.client = httpx.Client()
-        self.client.__enter__()
+        with self._lock:
+            if self._entries == 0 and self._owns_client:
+                client = self._make_http_client()
+                client.__enter__()
+                self.client = client
+            self._entries += 1
         return self
 
     def __exit__(
@@ -354,13 +1176,104 @@ class Client(BaseClient):
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        self.client.__exit__(exc_type, exc_value, traceback)
-        del self._clients[-1]
+        with self._lock:
+            self._entries -= 1
+            if self._entries == 0 and self._owns_client:
+                self.client.__exit__(exc_type, exc_value, traceback)
+                del self._clients[-1]
+
+    def _make_http_client(self) -> httpx.Client:
+        return httpx.Client(**self._http_client_options())
 
     def close(self) -> None:
         """Close the connection pool of the current inner client."""
         self.client.close()
 
+    def map(
+        self,
+        function: Callable[[T], Any],
+        items: Iterable[T],
+        max_workers: int = DEFAULT_MAP_CONCURRENCY,
+    ) -> List[Any]:
+        """Call `function` on each item from a pool of `max_workers` threads, and
+        return the results in the order of `items`.
+
+        All the threads share this client, and therefore its connection pool,
+        retries and rate limiter. A failing call does not cancel the others: its
+        exception is returned in place of its result.
+
+        ```python
+        pages = notion.map(notion.pages.retrieve, page_ids)
+        ```
+        """
+        results: Dict[int, Any] = {}
+        for index, result in self.map_as_completed(function, items, max_workers):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    def map_as_completed(
+        self,
+        function: Callable[[T], Any],
+        items: Iterable[T],
+        max_workers: int = DEFAULT_MAP_CONCURRENCY,
+    ) -> Iterator[Tuple[int, Any]]:
+        """Call `function` on each item from a pool of `max_workers` threads, and
+        yield `(index, result)` pairs as the calls complete.
+
+        A failing call does not cancel the others: its exception is yielded in
+        place of its result. Closing the iterator early cancels the calls that
+        have not started yet.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        pending_items = enumerate(items)
+        running: Dict["Future[Any]", int] = {}
+
+        def submit_next(executor: ThreadPoolExecutor) -> None:
+            for index, item in pending_items:
+                running[executor.submit(function, item)] = index
+                return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                for _ in range(max_workers):
+                    submit_next(executor)
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = running.pop(future)
+                        submit_next(executor)
+                        error = future.exception()
+                        yield index, future.result() if error is None else error
+            finally:
+                for future in running:
+                    future.cancel()
+
+    def _with_property_ids(
+        self,
+        data_source_id: str,
+        kwargs: Dict[str, Any],
+        call: Callable[[Dict[str, Any]], Any],
+    ) -> Any:
+        """Calls an endpoint with the IDs of the `properties` it was given as
+        `filter_properties`, retrieving the schema of the data source if the
+        registry does not know them."""
+        kwargs = dict(kwargs)
+        names = kwargs.pop("properties")
+        ids = self.schemas.property_ids(data_source_id, names)
+        if ids is None:
+            data_source = self.request(
+                f"data_sources/{data_source_id}",
+                "GET",
+                auth=kwargs.get("auth"),
+                raw=False,
+                stream=False,
+            )
+            self.schemas.set(data_source)
+            ids = resolve_property_ids(data_source, names)
+        return call({**kwargs, "filter_properties": ids})
+
     def request(
         self,
         path: str,
@@ -369,11 +1282,85 @@ class Client(BaseClient):
         body: Optional[Dict[Any, Any]] = None,
         form_data: Optional[Dict[Any, Any]] = None,
         auth: Optional[Union[str, Dict[str, str]]] = None,
+        deadline_ms: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+        raw: Optional[bool] = None,
+        stream: Optional[bool] = None,
     ) -> Any:
-        """Send an HTTP request."""
+        """Send an HTTP request.
+
+        `deadline_ms` caps the total time of the call, retries included, and
+        defaults to the `deadline_ms` option of the client. `idempotent` tells
+        whether the request can be retried on server errors, and defaults to
+        True for GET and DELETE requests only. `raw` returns a `RawResponse`
+        instead of the decoded body, and defaults to the `raw_responses` option
+        of the client. `stream` returns a `StreamedResponse` that decodes the
+        items of `results` as they are received, and defaults to the
+        `stream_results` option of the client for list endpoints, and to False
+        for the others.
+        """
         validate_request_path(path)
-        self.logger.info(f"{method} {self.client.base_url}{path}")
-        return self._execute_with_retry(method, path, query, body, form_data, auth)
+        deadline = self._deadline(deadline_ms)
+        if raw is None:
+            raw = self.options.raw_responses
+        if stream is None:
+            stream = self._streams_results(method, path)
+        stream = stream and not raw
+        cache = self.cache
+        cache_entry = None
+        if cache is not None and not raw and not stream:
+            cache_entry = self._cache_entry(method, path, query, auth)
+        if cache is not None and cache_entry is not None:
+            content = cache.get(cache_entry[0])
+            if content is not None:
+                return self._decode(content)
+            version = cache.version
+            raw = True
+        single_flight_key = (
+            None if stream else self._single_flight_key(method, path, query, auth, raw)
+        )
+        try:
+            if single_flight_key is not None:
+                try:
+                    response_body = self._single_flight.do(
+                        single_flight_key,
+                        lambda: self._execute_with_retry(
+                            method,
+                            path,
+                            query,
+                            body,
+                            form_data,
+                            auth,
+                            deadline,
+                            idempotent,
+                            raw,
+                            stream,
+                        ),
+                        timeout=self._remaining(deadline),
+                    )
+                except FutureTimeoutError:
+                    raise RequestTimeoutError()
+            else:
+                response_body = self._execute_with_retry(
+                    method,
+                    path,
+                    query,
+                    body,
+                    form_data,
+                    auth,
+                    deadline,
+                    idempotent,
+                    raw,
+                    stream,
+                )
+        finally:
+            if not idempotent and method.upper() != "GET":
+                self._invalidate_caches(path)
+        if cache is not None and cache_entry is not None:
+            key, object_id = cache_entry
+            cache.set(key, object_id, response_body.content, version)
+            return self._decode(response_body.content)
+        return response_body
 
     def _execute_with_retry(
         self,
@@ -383,42 +1370,190 @@ class Client(BaseClient):
         body: Optional[Dict[Any, Any]],
         form_data: Optional[Dict[Any, Any]],
         auth: Optional[Union[str, Dict[str, str]]],
+        deadline: Optional[float],
+        idempotent: Optional[bool],
+        raw: bool,
+        stream: bool,
     ) -> Any:
         """Executes the request with retry logic."""
-        attempt = 0
-        while True:
-            request = self._build_request(method, path, query, body, form_data, auth)
-            try:
-                return self._execute_single_request(request, method, path)
-            except Exception as error:
-                if not is_notion_client_error(error):
-                    raise error
-
-                self._log_request_error(error, attempt)
-
-                if attempt >= self._max_retries or not self._can_retry(error, method):
-                    raise error
+        if self._retry_budget is not None:
+            self._retry_budget.record_request()
 
-                delay = self._calculate_retry_delay(error, attempt)
-                self.logger.info(
-                    f"retrying request: method={method}, path={path}, attempt={attempt + 1}, delay_ms={delay * 1000:.0f}"
+        attempt = 0
+        with call_span(self._tracer, method, path) as span:
+            while True:
+                self._check_circuit(path)
+                rate_limit_delay = self._reserve_rate_limit(auth, deadline)
+                if rate_limit_delay > 0:
+                    if self.hooks.on_rate_limited:
+                        Hooks.emit(
+                            self.hooks.on_rate_limited,
+                            RequestEvent(
+                                method,
+                                path,
+                                path_template(path),
+                                attempt,
+                                delay=rate_limit_delay,
+                            ),
+                        )
+                    with wait_span(
+                        self._tracer, "notion.rate_limit", rate_limit_delay, True
+                    ):
+                        time.sleep(rate_limit_delay)
+
+                request = self._build_request(
+                    method, path, query, body, form_data, auth
                 )
-                time.sleep(delay)
+                self._apply_deadline(request, deadline)
+                if self._observed("on_request"):
+                    Hooks.emit(
+                        self.hooks.on_request,
+                        self._request_event(method, path, attempt, request),
+                    )
+                started_at = time.monotonic()
+                with attempt_span(self._tracer, attempt) as attempt_trace:
+                    try:
+                        response_body = self._execute_single_request(
+                            request, method, path, raw, stream, attempt, attempt_trace
+                        )
+                    except Exception as error:
+                        self._record_circuit_outcome(path, error)
+                        if self._observed("on_error"):
+                            Hooks.emit(
+                                self.hooks.on_error,
+                                self._error_event(
+                                    method, path, attempt, error, started_at
+                                ),
+                            )
+                        if not is_notion_client_error(error):
+                            raise error
+                        if self._compression_rejected(request, error):
+                            continue
+
+                        if attempt >= self._max_retries or not self._can_retry(
+                            error, method, idempotent
+                        ):
+                            raise error
+
+                        delay = self._calculate_retry_delay(error, attempt)
+                        if not self._retry_allowed(delay, deadline):
+                            raise error
+
+                        if attempt_trace is not None:
+                            record_error(attempt_trace, error)
+                        if self._observed("on_retry"):
+                            Hooks.emit(
+                                self.hooks.on_retry,
+                                self._error_event(
+                                    method, path, attempt + 1, error, delay=delay
+                                ),
+                            )
+                        throttled = self._is_throttling_error(error)
+                        if self.hooks.on_rate_limited and throttled:
+                            Hooks.emit(
+                                self.hooks.on_rate_limited,
+                                self._error_event(
+                                    method, path, attempt + 1, error, delay=delay
+                                ),
+                            )
+                    else:
+                        self._record_circuit_outcome(path, None)
+                        if span is not None:
+                            self._record_call_outcome(span, attempt, response_body)
+                        return response_body
+
+                with wait_span(self._tracer, "notion.backoff", delay, throttled):
+                    time.sleep(delay)
                 attempt += 1
 
-    def _execute_single_request(self, request: Request, method: str, path: str) -> Any:
+    def _execute_single_request(
+        self,
+        request: Request,
+        method: str,
+        path: str,
+        raw: bool = False,
+        stream: bool = False,
+        attempt: int = 0,
+        span: Any = None,
+    ) -> Any:
         """Executes a single HTTP request (no retry)."""
+        recorder = None
+        if raw or self._observed("on_response"):
+            recorder = TimingsRecorder()
+            request.extensions["trace"] = recorder
+        started_at = time.monotonic()
         try:
-            response = self.client.send(request)
+            if not stream:
+                response = self.client.send(request)
+            else:
+                response = self.client.send(request, stream=True)
+                if response.is_success:
+                    if span is not None:
+                        record_response(span, response.status_code, None)
+                    if self._observed("on_response"):
+                        Hooks.emit(
+                            self.hooks.on_response,
+                            self._response_event(
+                                method,
+                                path,
+                                attempt,
+                                response,
+                                None,
+                                started_at,
+                                None,
+                                None,
+                                None if recorder is None else recorder.timings(),
+                            ),
+                        )
+                    return StreamedResponse(self._iter_response_bytes(response))
+                response.read()
         except httpx.TimeoutException:
             raise RequestTimeoutError()
-        response_body = self._parse_response(response)
-        self._log_request_success(method, path, response_body)
+        decode_started_at = time.monotonic()
+        response_body = self._parse_response(response, raw)
+        timings = None if recorder is None else recorder.timings(decode_started_at)
+        if raw:
+            response_body.timings = timings
+        if span is not None:
+            record_response(
+                span, response.status_code, self._extract_request_id(response_body)
+            )
+        if self._observed("on_response"):
+            Hooks.emit(
+                self.hooks.on_response,
+                self._response_event(
+                    method,
+                    path,
+                    attempt,
+                    response,
+                    response_body,
+                    started_at,
+                    decode_started_at,
+                    len(response.content),
+                    timings,
+                ),
+            )
         return response_body
 
+    def _iter_response_bytes(self, response: Response) -> Generator[bytes, None, None]:
+        """Yields the chunks of a streamed response, and closes it at the end."""
+        try:
+            for chunk in response.iter_bytes():
+                yield chunk
+        except httpx.TimeoutException:
+            raise RequestTimeoutError()
+        finally:
+            response.close()
+
 
 class AsyncClient(BaseClient):
-    """Asynchronous client for Notion's API."""
+    """Asynchronous client for Notion's API.
+
+    Tasks that enter the client as a context manager at the same time share one
+    inner client, which is closed when the last of them exits. An inner client
+    passed to the constructor is used for every request and is never closed by
+    the context manager.
+    """
 
     client: httpx.AsyncClient
 
@@ -428,13 +1563,22 @@ class AsyncClient(BaseClient):
         client: Optional[httpx.AsyncClient] = None,
         **kwargs: Any,
     ) -> None:
-        if client is None:
-            client = httpx.AsyncClient()
         super().__init__(client, options, **kwargs)
+        self._single_flight = AsyncSingleFlight()
 
     async def __aenter__(self) -> "AsyncClient":
-        self.client = httpx.AsyncClient()
-        await self.client.__aenter__()
+        # Count the entry before awaiting, so that the tasks entering meanwhile
+        # share the inner client instead of making their own.
+        self._entries += 1
+        if self._entries == 1 and self._owns_client:
+            client = self._make_http_client()
+            self.client = client
+            try:
+                await client.__aenter__()
+            except BaseException:
+                self._entries -= 1
+                self._clients.remove(client)
+                raise
         return self
 
     async def __aexit__(
@@ -443,13 +1587,129 @@ class AsyncClient(BaseClient):
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        await self.client.__aexit__(exc_type, exc_value, traceback)
-        del self._clients[-1]
+        self._entries -= 1
+        if self._entries == 0 and self._owns_client:
+            await self.client.__aexit__(exc_type, exc_value, traceback)
+            del self._clients[-1]
+
+    def _make_http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(**self._http_client_options())
 
     async def aclose(self) -> None:
         """Close the connection pool of the current inner client."""
         await self.client.aclose()
 
+    async def map(
+        self,
+        function: Callable[[T], Awaitable[Any]],
+        items: Iterable[T],
+        max_concurrency: int = DEFAULT_MAP_CONCURRENCY,
+    ) -> List[Any]:
+        """Call `function` on each item, with at most `max_concurrency` calls in
+        flight, and return the results in the order of `items`.
+
+        A failing call does not cancel the others: its exception is returned in
+        place of its result.
+
+        ```python
+        pages = await notion.map(notion.pages.retrieve, page_ids)
+        ```
+        """
+        results: Dict[int, Any] = {}
+        async for index, result in self.map_as_completed(
+            function, items, max_concurrency
+        ):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    async def map_as_completed(
+        self,
+        function: Callable[[T], Awaitable[Any]],
+        items: Iterable[T],
+        max_concurrency: int = DEFAULT_MAP_CONCURRENCY,
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """Call `function` on each item, with at most `max_concurrency` calls in
+        flight, and yield `(index, result)` pairs as the calls complete.
+
+        A failing call does not cancel the others: its exception is yielded in
+        place of its result. Closing the iterator early (with `aclose()`) cancels
+        the pending calls.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        queue: "asyncio.Queue[Optional[Tuple[int, Any]]]" = asyncio.Queue()
+        pending_items = enumerate(items)
+
+        async def worker() -> None:
+            try:
+                for index, item in pending_items:
+                    try:
+                        result = await function(item)
+                    except Exception as error:
+                        result = error
+                    queue.put_nowait((index, result))
+            finally:
+                queue.put_nowait(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                completed = await queue.get()
+                if completed is None:
+                    running -= 1
+                    continue
+                yield completed
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def gather(
+        self,
+        *awaitables: Awaitable[Any],
+        max_concurrency: int = DEFAULT_MAP_CONCURRENCY,
+    ) -> List[Any]:
+        """Await `awaitables` with at most `max_concurrency` of them in flight and
+        return their results in order, with exceptions in place of failed results.
+
+        ```python
+        page, user = await notion.gather(
+            notion.pages.retrieve(page_id),
+            notion.users.retrieve(user_id),
+        )
+        ```
+        """
+
+        async def wait(awaitable: Awaitable[Any]) -> Any:
+            return await awaitable
+
+        return await self.map(wait, awaitables, max_concurrency)
+
+    async def _with_property_ids(
+        self,
+        data_source_id: str,
+        kwargs: Dict[str, Any],
+        call: Callable[[Dict[str, Any]], Any],
+    ) -> Any:
+        """Calls an endpoint with the IDs of the `properties` it was given as
+        `filter_properties`, retrieving the schema of the data source if the
+        registry does not know them."""
+        kwargs = dict(kwargs)
+        names = kwargs.pop("properties")
+        ids = self.schemas.property_ids(data_source_id, names)
+        if ids is None:
+            data_source = await self.request(
+                f"data_sources/{data_source_id}",
+                "GET",
+                auth=kwargs.get("auth"),
+                raw=False,
+                stream=False,
+            )
+            self.schemas.set(data_source)
+            ids = resolve_property_ids(data_source, names)
+        return await call({**kwargs, "filter_properties": ids})
+
     async def request(
         self,
         path: str,
@@ -458,13 +1718,85 @@ class AsyncClient(BaseClient):
         body: Optional[Dict[Any, Any]] = None,
         form_data: Optional[Dict[Any, Any]] = None,
         auth: Optional[Union[str, Dict[str, str]]] = None,
+        deadline_ms: Optional[int] = None,
+        idempotent: Optional[bool] = None,
+        raw: Optional[bool] = None,
+        stream: Optional[bool] = None,
     ) -> Any:
-        """Send an HTTP request asynchronously."""
+        """Send an HTTP request asynchronously.
+
+        `deadline_ms` caps the total time of the call, retries included, and
+        defaults to the `deadline_ms` option of the client. `idempotent` tells
+        whether the request can be retried on server errors, and defaults to
+        True for GET and DELETE requests only. `raw` returns a `RawResponse`
+        instead of the decoded body, and defaults to the `raw_responses` option
+        of the client. `stream` returns an `AsyncStreamedResponse` that decodes
+        the items of `results` as they are received, and defaults to the
+        `stream_results` option of the client for list endpoints, and to False
+        for the others.
+        """
         validate_request_path(path)
-        self.logger.info(f"{method} {self.client.base_url}{path}")
-        return await self._execute_with_retry(
-            method, path, query, body, form_data, auth
+        deadline = self._deadline(deadline_ms)
+        if raw is None:
+            raw = self.options.raw_responses
+        if stream is None:
+            stream = self._streams_results(method, path)
+        stream = stream and not raw
+        cache = self.cache
+        cache_entry = None
+        if cache is not None and not raw and not stream:
+            cache_entry = self._cache_entry(method, path, query, auth)
+        if cache is not None and cache_entry is not None:
+            content = cache.get(cache_entry[0])
+            if content is not None:
+                return self._decode(content)
+            version = cache.version
+            raw = True
+        single_flight_key = (
+            None if stream else self._single_flight_key(method, path, query, auth, raw)
         )
+        try:
+            if single_flight_key is not None:
+                try:
+                    response_body = await self._single_flight.do(
+                        single_flight_key,
+                        lambda: self._execute_with_retry(
+                            method,
+                            path,
+                            query,
+                            body,
+                            form_data,
+                            auth,
+                            deadline,
+                            idempotent,
+                            raw,
+                            stream,
+                        ),
+                        timeout=self._remaining(deadline),
+                    )
+                except asyncio.TimeoutError:
+                    raise RequestTimeoutError()
+            else:
+                response_body = await self._execute_with_retry(
+                    method,
+                    path,
+                    query,
+                    body,
+                    form_data,
+                    auth,
+                    deadline,
+                    idempotent,
+                    raw,
+                    stream,
+                )
+        finally:
+            if not idempotent and method.upper() != "GET":
+                self._invalidate_caches(path)
+        if cache is not None and cache_entry is not None:
+            key, object_id = cache_entry
+            cache.set(key, object_id, response_body.content, version)
+            return self._decode(response_body.content)
+        return response_body
 
     async def _execute_with_retry(
         self,
@@ -474,37 +1806,315 @@ class AsyncClient(BaseClient):
         body: Optional[Dict[Any, Any]],
         form_data: Optional[Dict[Any, Any]],
         auth: Optional[Union[str, Dict[str, str]]],
+        deadline: Optional[float],
+        idempotent: Optional[bool],
+        raw: bool,
+        stream: bool,
     ) -> Any:
         """Executes the request with retry logic."""
-        attempt = 0
-        while True:
-            request = self._build_request(method, path, query, body, form_data, auth)
-            try:
-                return await self._execute_single_request(request, method, path)
-            except Exception as error:
-                if not is_notion_client_error(error):
-                    raise error
-
-                self._log_request_error(error, attempt)
+        if self._retry_budget is not None:
+            self._retry_budget.record_request()
 
-                if attempt >= self._max_retries or not self._can_retry(error, method):
-                    raise error
-
-                delay = self._calculate_retry_delay(error, attempt)
-                self.logger.info(
-                    f"retrying request: method={method}, path={path}, attempt={attempt + 1}, delay_ms={delay * 1000:.0f}"
+        attempt = 0
+        with call_span(self._tracer, method, path) as span:
+            while True:
+                self._check_circuit(path)
+                rate_limit_delay = self._reserve_rate_limit(auth, deadline)
+                if rate_limit_delay > 0:
+                    if self.hooks.on_rate_limited:
+                        Hooks.emit(
+                            self.hooks.on_rate_limited,
+                            RequestEvent(
+                                method,
+                                path,
+                                path_template(path),
+                                attempt,
+                                delay=rate_limit_delay,
+                            ),
+                        )
+                    with wait_span(
+                        self._tracer, "notion.rate_limit", rate_limit_delay, True
+                    ):
+                        await asyncio.sleep(rate_limit_delay)
+
+                request = self._build_request(
+                    method, path, query, body, form_data, auth
                 )
-                await asyncio.sleep(delay)
+                self._apply_deadline(request, deadline)
+                if self._observed("on_request"):
+                    Hooks.emit(
+                        self.hooks.on_request,
+                        self._request_event(method, path, attempt, request),
+                    )
+                started_at = time.monotonic()
+                with attempt_span(self._tracer, attempt) as attempt_trace:
+                    try:
+                        if (
+                            self._hedging_policy
+                            and method.upper() == "GET"
+                            and not stream
+                        ):
+                            response_body = await self._execute_hedged_request(
+                                self._hedging_policy,
+                                request,
+                                method,
+                                path,
+                                auth,
+                                raw,
+                                attempt,
+                                attempt_trace,
+                                deadline,
+                            )
+                        else:
+                            response_body = await self._execute_single_request(
+                                request,
+                                method,
+                                path,
+                                raw,
+                                stream,
+                                attempt,
+                                attempt_trace,
+                                deadline,
+                            )
+                    except Exception as error:
+                        self._record_circuit_outcome(path, error)
+                        if self._observed("on_error"):
+                            Hooks.emit(
+                                self.hooks.on_error,
+                                self._error_event(
+                                    method, path, attempt, error, started_at
+                                ),
+                            )
+                        if not is_notion_client_error(error):
+                            raise error
+                        if self._compression_rejected(request, error):
+                            continue
+
+                        if attempt >= self._max_retries or not self._can_retry(
+                            error, method, idempotent
+                        ):
+                            raise error
+
+                        delay = self._calculate_retry_delay(error, attempt)
+                        if not self._retry_allowed(delay, deadline):
+                            raise error
+
+                        if attempt_trace is not None:
+                            record_error(attempt_trace, error)
+                        if self._observed("on_retry"):
+                            Hooks.emit(
+                                self.hooks.on_retry,
+                                self._error_event(
+                                    method, path, attempt + 1, error, delay=delay
+                                ),
+                            )
+                        throttled = self._is_throttling_error(error)
+                        if self.hooks.on_rate_limited and throttled:
+                            Hooks.emit(
+                                self.hooks.on_rate_limited,
+                                self._error_event(
+                                    method, path, attempt + 1, error, delay=delay
+                                ),
+                            )
+                    else:
+                        self._record_circuit_outcome(path, None)
+                        if span is not None:
+                            self._record_call_outcome(span, attempt, response_body)
+                        return response_body
+
+                with wait_span(self._tracer, "notion.backoff", delay, throttled):
+                    await asyncio.sleep(delay)
                 attempt += 1
 
+    async def _execute_hedged_request(
+        self,
+        policy: HedgingPolicy,
+        request: Request,
+        method: str,
+        path: str,
+        auth: Optional[Union[str, Dict[str, str]]],
+        raw: bool = False,
+        attempt: int = 0,
+        span: Any = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Executes a single HTTP request, and sends a second copy of it if the
+        first one is slower than the hedging delay of its endpoint."""
+        endpoint = path_template(path)
+        started_at = time.monotonic()
+        tasks = [
+            asyncio.ensure_future(
+                self._execute_single_request(
+                    request,
+                    method,
+                    path,
+                    raw,
+                    attempt=attempt,
+                    span=span,
+                    deadline=deadline,
+                )
+            )
+        ]
+        try:
+            delay = policy.delay(endpoint)
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not tasks[0].done() and self._try_reserve_rate_limit(auth):
+                    self.logger.debug(f"hedging request: method={method}, path={path}")
+                    if span is not None:
+                        span.set_attribute("notion.hedged", True)
+                    hedged_request = Request(
+                        request.method,
+                        request.url,
+                        headers=request.headers,
+                        extensions=dict(request.extensions),
+                    )
+                    if self._observed("on_request"):
+                        Hooks.emit(
+                            self.hooks.on_request,
+                            self._request_event(
+                                method, path, attempt, hedged_request, hedged=True
+                            ),
+                        )
+                    tasks.append(
+                        asyncio.ensure_future(
+                            self._execute_single_request(
+                                hedged_request,
+                                method,
+                                path,
+                                raw,
+                                attempt=attempt,
+                                span=span,
+                                deadline=deadline,
+                            )
+                        )
+                    )
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    policy.record(endpoint, time.monotonic() - started_at)
+                    return succeeded[0].result()
+                if not pending:
+                    # Every copy failed: raise the error of the first one.
+                    return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def _execute_single_request(
-        self, request: Request, method: str, path: str
+        self,
+        request: Request,
+        method: str,
+        path: str,
+        raw: bool = False,
+        stream: bool = False,
+        attempt: int = 0,
+        span: Any = None,
+        deadline: Optional[float] = None,
     ) -> Any:
         """Executes a single HTTP request (no retry)."""
+        limiter = self._concurrency_limiter
+        epoch = 0
+        if limiter:
+            try:
+                epoch = await asyncio.wait_for(
+                    limiter.acquire(), self._remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                raise RequestTimeoutError()
+            try:
+                # The wait for a slot took part of the time left.
+                self._apply_deadline(request, deadline)
+            except RequestTimeoutError:
+                limiter.release()
+                raise
+        # Waiting on the limiter is not waiting on the connection pool.
+        recorder = None
+        if raw or self._observed("on_response"):
+            recorder = TimingsRecorder()
+            request.extensions["trace"] = recorder.atrace
+        started_at = time.monotonic()
         try:
-            response = await self.client.send(request)
+            if not stream:
+                response = await self.client.send(request)
+            else:
+                response = await self.client.send(request, stream=True)
+                if not response.is_success:
+                    await response.aread()
         except httpx.TimeoutException:
             raise RequestTimeoutError()
-        response_body = self._parse_response(response)
-        self._log_request_success(method, path, response_body)
+        finally:
+            if limiter:
+                limiter.release()
+
+        if stream and response.is_success:
+            if limiter:
+                limiter.on_success()
+            if span is not None:
+                record_response(span, response.status_code, None)
+            if self._observed("on_response"):
+                Hooks.emit(
+                    self.hooks.on_response,
+                    self._response_event(
+                        method,
+                        path,
+                        attempt,
+                        response,
+                        None,
+                        started_at,
+                        None,
+                        None,
+                        None if recorder is None else recorder.timings(),
+                    ),
+                )
+            return AsyncStreamedResponse(self._aiter_response_bytes(response))
+
+        decode_started_at = time.monotonic()
+        try:
+            response_body = self._parse_response(response, raw)
+        except Exception as error:
+            if limiter and self._is_throttling_error(error):
+                limiter.on_throttled(epoch)
+            raise
+        timings = None if recorder is None else recorder.timings(decode_started_at)
+        if raw:
+            response_body.timings = timings
+        if limiter:
+            limiter.on_success()
+        if span is not None:
+            record_response(
+                span, response.status_code, self._extract_request_id(response_body)
+            )
+        if self._observed("on_response"):
+            Hooks.emit(
+                self.hooks.on_response,
+                self._response_event(
+                    method,
+                    path,
+                    attempt,
+                    response,
+                    response_body,
+                    started_at,
+                    decode_started_at,
+                    len(response.content),
+                    timings,
+                ),
+            )
         return response_body
+
+    async def _aiter_response_bytes(
+        self, response: Response
+    ) -> AsyncGenerator[bytes, None]:
+        """Yields the chunks of a streamed response, and closes it at the end."""
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+        except httpx.TimeoutException:
+            raise RequestTimeoutError()
+        finally:
+            await response.aclose()
@@ -19,3 +19,49 @@ MIN_VIEW_COLUMN_WIDTH = 32
 """The minimum width of a view column in pixels. Use this with the views API to make
 a property column that appears minimal/collapsed in the Notion app UI (e.g. a
 checkbox or status-as-checkbox column)."""
+
+DEFAULT_RATE_LIMIT_PER_SECOND = 3.0
+"""Default average number of requests per second allowed by the client-side rate
+limiter. Matches the average rate Notion allows for each integration."""
+
+DEFAULT_RATE_LIMIT_BURST = 3
+"""Default number of requests the client-side rate limiter lets through
+back-to-back before the average rate applies."""
+
+DEFAULT_INITIAL_CONCURRENCY = 10
+"""Default number of in-flight requests the adaptive concurrency limiter starts
+with."""
+
+DEFAULT_MAX_CONCURRENCY = 100
+"""Default upper bound on the number of in-flight requests the adaptive concurrency
+limiter can grow to."""
+
+DEFAULT_MAP_CONCURRENCY = 10
+"""Default number of calls `map` runs at the same time."""
+
+DEFAULT_COMPRESSION_MIN_BYTES = 8 * 1024
+"""Default size in bytes from which request bodies are compressed, when request
+compression is enabled."""
+
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+"""Default number of responses the response cache holds."""
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+"""Default total size in bytes of the responses the response cache holds
+(64 MiB)."""
+
+DEFAULT_CACHE_TTL_MS = 60_000
+"""Default time in milliseconds responses are kept in the response cache
+(1 minute)."""
+
+DEFAULT_SCHEMA_TTL_MS = 300_000
+"""Default time in milliseconds the schemas of data sources are kept by the schema
+registry (5 minutes)."""
+
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+"""Default number of consecutive server errors or timeouts on a family of endpoints
+after which the circuit breaker opens."""
+
+DEFAULT_CIRCUIT_BREAKER_RECOVERY_MS = 30_000
+"""Default time in milliseconds an open circuit breaker rejects requests before
+letting a probe request through (30 seconds)."""
@@ -0,0 +1,47 @@
+"""Deadlines for notion-sdk-py.
+
+A deadline caps the total time spent on a call, across every retry attempt,
+instead of the time spent on each attempt. Deadlines set with `deadline()` apply
+to every request sent from the same context: the current thread, or the current
+asyncio task and the tasks it creates.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    "notion_client_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(timeout_ms: int) -> Iterator[None]:
+    """Give the requests sent within the block `timeout_ms` milliseconds in total
+    to complete, retries included.
+
+    Nested deadlines cannot extend an outer one.
+
+    ```python
+    with deadline(5_000):
+        page = notion.pages.retrieve(page_id=page_id)
+        blocks = notion.blocks.children.list(block_id=page_id)
+    ```
+    """
+    expires_at = time.monotonic() + timeout_ms / 1000.0
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """Return the deadline of the current context as a `time.monotonic()` value,
+    or None if there is none."""
+    return _deadline.get()
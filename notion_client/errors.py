@@ -69,6 +69,7 @@ class ClientErrorCode(str, Enum):
     RequestTimeout = "notionhq_client_request_timeout"
     ResponseError = "notionhq_client_response_error"
     InvalidPathParameter = "notionhq_client_invalid_path_parameter"
+    CircuitOpen = "notionhq_client_circuit_open"
 
 
 # Error codes on errors thrown by the `Client`.
@@ -143,6 +144,30 @@ class InvalidPathParameterError(NotionClientErrorBase):
         )
 
 
+class CircuitOpenError(NotionClientErrorBase):
+    """Error thrown without sending the request when the circuit breaker of its
+    endpoint family is open, after repeated server errors or timeouts."""
+
+    code: ClientErrorCode = ClientErrorCode.CircuitOpen
+    family: str
+    retry_after: float
+
+    def __init__(self, family: str, retry_after: float) -> None:
+        super().__init__(
+            f'Circuit breaker for "{family}" endpoints is open, '
+            f"retry in {retry_after:.1f} seconds"
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+    @staticmethod
+    def is_circuit_open_error(error: Any) -> bool:
+        return _is_notion_client_error_with_code(
+            error,
+            {ClientErrorCode.CircuitOpen.value},
+        )
+
+
 def validate_request_path(path: str) -> None:
     """Validates that a request path does not contain path traversal sequences.
     Raises InvalidPathParameterError if the path contains ".." segments,
@@ -156,7 +181,7 @@ def validate_request_path(path: str) -> None:
 
     # Check for URL-encoded path traversal (%2e = '.')
     # Only decode if path contains potential encoded dots
-    if "%2e" in path.lower():
+    if "%" in path and "%2e" in path.lower():
         decoded = unquote(path)
         if ".." in decoded:
             raise InvalidPathParameterError(
@@ -281,6 +306,7 @@ NotionClientError = Union[
     UnknownHTTPResponseError,
     APIResponseError,
     InvalidPathParameterError,
+    CircuitOpenError,
 ]
 
 
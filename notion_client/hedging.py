@@ -0,0 +1,55 @@
+"""Request hedging for notion-sdk-py.
+
+A hedged request is a second copy of an idempotent request, sent when the first
+one takes longer than most recent requests to the same endpoint. Whichever copy
+answers first is used, which cuts the tail latency caused by the occasional slow
+backend request.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class HedgingPolicy:
+    """Decide how long to wait before hedging a request to an endpoint.
+
+    The delay is the `percentile` of the latencies of the last `window` successful
+    requests to the endpoint, and never less than `min_delay_ms`. Requests are not
+    hedged until `min_samples` latencies have been recorded for the endpoint.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_delay_ms: int,
+        min_samples: int,
+        window: int,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 1 <= min_samples <= window:
+            raise ValueError("expected 1 <= min_samples <= window")
+
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, latency: float) -> None:
+        """Record the latency in seconds of a successful request to `endpoint`."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+        latencies.append(latency)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Return the delay in seconds before hedging a request to `endpoint`, or
+        None if not enough latencies have been recorded yet."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+        return max(ordered[rank], self.min_delay_ms / 1000.0)
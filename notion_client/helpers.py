@@ -14,6 +14,8 @@ from typing import (
 from urllib.parse import urlparse
 from uuid import UUID
 
+from notion_client.streaming import AsyncStreamedResponse, StreamedResponse
+
 
 def pick(base: Dict[Any, Any], *keys: str) -> Dict[Any, Any]:
     """Return a dict composed of key value pairs for keys passed as args."""
@@ -28,6 +30,52 @@ def pick(base: Dict[Any, Any], *keys: str) -> Dict[Any, Any]:
     return result
 
 
+_STATIC_PATH_SEGMENTS = {
+    "async_tasks",
+    "blocks",
+    "children",
+    "comments",
+    "complete",
+    "custom_emojis",
+    "data_sources",
+    "databases",
+    "file_uploads",
+    "introspect",
+    "markdown",
+    "me",
+    "meeting_notes",
+    "move",
+    "oauth",
+    "pages",
+    "properties",
+    "queries",
+    "query",
+    "revoke",
+    "search",
+    "send",
+    "templates",
+    "token",
+    "users",
+    "views",
+}
+
+
+def path_template(path: str) -> str:
+    """Return the endpoint template of a request path, with IDs replaced by named
+    placeholders (e.g. `blocks/{block_id}/children`)."""
+    segments = path.strip("/").split("/")
+    for index, segment in enumerate(segments):
+        if segment in _STATIC_PATH_SEGMENTS:
+            continue
+        collection = segments[index - 1] if index else "object"
+        if collection.endswith("ies"):
+            name = collection[:-3] + "y"
+        else:
+            name = collection.rstrip("s")
+        segments[index] = f"{{{name}_id}}"
+    return "/".join(segments)
+
+
 def get_url(object_id: str) -> str:
     """Return the URL for the object with the given id."""
     return f"https://notion.so/{UUID(object_id).hex}"
@@ -48,13 +96,20 @@ def get_id(url: str) -> str:
 def iterate_paginated_api(
     function: Callable[..., Any], **kwargs: Any
 ) -> Generator[Any, None, None]:
-    """Return an iterator over the results of any paginated Notion API."""
+    """Return an iterator over the results of any paginated Notion API.
+
+    Streamed responses yield their results as they are received.
+    """
     next_cursor = kwargs.pop("start_cursor", None)
 
     while True:
         response = function(**kwargs, start_cursor=next_cursor)
-        for result in response.get("results"):
-            yield result
+        if isinstance(response, StreamedResponse):
+            yield from response
+            response = response.body
+        else:
+            for result in response.get("results"):
+                yield result
 
         next_cursor = response.get("next_cursor")
         if not response.get("has_more") or not next_cursor:
@@ -69,13 +124,21 @@ def collect_paginated_api(function: Callable[..., Any], **kwargs: Any) -> List[A
 async def async_iterate_paginated_api(
     function: Callable[..., Awaitable[Any]], **kwargs: Any
 ) -> AsyncGenerator[Any, None]:
-    """Return an async iterator over the results of any paginated Notion API."""
+    """Return an async iterator over the results of any paginated Notion API.
+
+    Streamed responses yield their results as they are received.
+    """
     next_cursor = kwargs.pop("start_cursor", None)
 
     while True:
         response = await function(**kwargs, start_cursor=next_cursor)
-        for result in response.get("results"):
-            yield result
+        if isinstance(response, AsyncStreamedResponse):
+            async for result in response:
+                yield result
+            response = response.body
+        else:
+            for result in response.get("results"):
+                yield result
 
         next_cursor = response.get("next_cursor")
         if (not response["has_more"]) | (next_cursor is None):
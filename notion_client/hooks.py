@@ -0,0 +1,123 @@
+"""Request lifecycle hooks for notion-sdk-py.
+
+Callbacks subscribed to the hooks of a client are called with a `RequestEvent`
+at each step of the life of its requests. Events are only built when an event
+has subscribers, so that instrumentation costs nothing when nobody listens.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from notion_client.timings import RequestTimings
+
+HOOK_NAMES = ("on_request", "on_response", "on_retry", "on_rate_limited", "on_error")
+
+Hook = Callable[["RequestEvent"], None]
+
+
+@dataclass
+class RequestEvent:
+    """Step in the life of a request.
+
+    Attributes:
+        method: HTTP method of the request.
+        path: Path of the request, such as `pages/b55c9c91-384d-452b-81db`.
+        endpoint: Template of the path, such as `pages/{page_id}`.
+        attempt: Number of the attempt, starting at 0.
+        url: Full URL of the request (`on_request` only).
+        status: HTTP status code of the response, if any.
+        request_id: ID of the request, when sent back by Notion.
+        elapsed: Seconds between sending the request and decoding its response.
+        decode_elapsed: Seconds spent decoding the response (`on_response` only).
+        request_bytes: Size of the request body, when known.
+        request_wire_bytes: Size of the request body as sent, once compressed
+            if it was (`on_request` only).
+        response_bytes: Size of the response body, when known.
+        response_wire_bytes: Size of the response body as received, before
+            decompression (`on_response` only).
+        delay: Seconds the client waits before the next attempt (`on_retry` and
+            `on_rate_limited` only).
+        error: Error of the attempt (`on_error`, `on_retry` and `on_rate_limited`
+            only). None when waiting for the client-side rate limiter.
+        timings: Breakdown of `elapsed` into pool wait, connection, TLS, time to
+            first byte, download and decoding (`on_response` only).
+        hedged: Whether the attempt is the second copy of a slow request, sent
+            by hedging (`on_request` only).
+    """
+
+    method: str
+    path: str
+    endpoint: str
+    attempt: int
+    url: Optional[str] = None
+    status: Optional[int] = None
+    request_id: Optional[str] = None
+    elapsed: Optional[float] = None
+    decode_elapsed: Optional[float] = None
+    request_bytes: Optional[int] = None
+    request_wire_bytes: Optional[int] = None
+    response_bytes: Optional[int] = None
+    response_wire_bytes: Optional[int] = None
+    delay: Optional[float] = None
+    error: Optional[Exception] = None
+    timings: Optional[RequestTimings] = None
+    hedged: bool = False
+
+
+class Hooks:
+    """Callbacks subscribed to the events of the requests of a client.
+
+    - `on_request`: an attempt is about to be sent.
+    - `on_response`: an attempt succeeded.
+    - `on_error`: an attempt failed.
+    - `on_retry`: a failed attempt is about to be retried after `delay` seconds.
+    - `on_rate_limited`: the next attempt waits `delay` seconds, either for the
+      client-side rate limiter or because Notion asked the client to slow down.
+
+    Callbacks are called synchronously in the request path, so they should be
+    fast; their exceptions are not caught.
+    """
+
+    __slots__ = HOOK_NAMES
+
+    def __init__(self) -> None:
+        self.on_request: List[Hook] = []
+        self.on_response: List[Hook] = []
+        self.on_retry: List[Hook] = []
+        self.on_rate_limited: List[Hook] = []
+        self.on_error: List[Hook] = []
+
+    def add(self, name: str, callback: Hook) -> None:
+        """Subscribe `callback` to the event `name` (e.g. `on_response`)."""
+        self._callbacks(name).append(callback)
+
+    def remove(self, name: str, callback: Hook) -> None:
+        """Unsubscribe `callback` from the event `name`."""
+        self._callbacks(name).remove(callback)
+
+    def subscribe(self, subscriber: Any) -> None:
+        """Subscribe the methods of `subscriber` named after events, such as
+        `subscriber.on_response`."""
+        for name in HOOK_NAMES:
+            callback = getattr(subscriber, name, None)
+            if callback is not None:
+                self.add(name, callback)
+
+    def unsubscribe(self, subscriber: Any) -> None:
+        """Unsubscribe the methods of `subscriber` named after events."""
+        for name in HOOK_NAMES:
+            callback = getattr(subscriber, name, None)
+            if callback is not None and callback in self._callbacks(name):
+                self.remove(name, callback)
+
+    def _callbacks(self, name: str) -> List[Hook]:
+        if name not in HOOK_NAMES:
+            raise ValueError(f"Unknown hook: {name}")
+        callbacks: List[Hook] = getattr(self, name)
+        return callbacks
+
+    @staticmethod
+    def emit(callbacks: List[Hook], event: RequestEvent) -> None:
+        """Call each of `callbacks` with `event`."""
+        for callback in callbacks:
+            callback(event)
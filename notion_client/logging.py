@@ -3,6 +3,9 @@
 import logging
 from logging import Logger
 
+from notion_client.errors import is_http_response_error, is_notion_client_error
+from notion_client.hooks import Hooks, RequestEvent
+
 
 def make_console_logger() -> Logger:
     """Return a custom logger."""
@@ -12,3 +15,66 @@ def make_console_logger() -> Logger:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
     return logger
+
+
+class LoggingSubscriber:
+    """Hooks subscriber logging the requests of a client."""
+
+    levels = {
+        "on_request": logging.INFO,
+        "on_response": logging.INFO,
+        "on_retry": logging.INFO,
+        "on_error": logging.WARNING,
+    }
+    """Level of the logs of each event."""
+
+    def __init__(self, logger: Logger) -> None:
+        self.logger = logger
+
+    def register(self, hooks: Hooks) -> None:
+        """Subscribe to the events of a client. The level of the logger is checked
+        on each event, so that disabled logs are not even formatted."""
+        hooks.subscribe(self)
+
+    def is_enabled(self, name: str) -> bool:
+        """Return whether the events `name` (e.g. `on_response`) are logged at the
+        current level of the logger."""
+        return name in self.levels and self.logger.isEnabledFor(self.levels[name])
+
+    def on_request(self, event: RequestEvent) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"{event.method} {event.url}")
+
+    def on_response(self, event: RequestEvent) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        msg = f"request success: method={event.method}, path={event.path}"
+        if event.request_id:
+            msg += f", request_id={event.request_id}"
+        self.logger.info(msg)
+
+    def on_retry(self, event: RequestEvent) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        delay_ms = (event.delay or 0.0) * 1000
+        self.logger.info(
+            f"retrying request: method={event.method}, path={event.path}, attempt={event.attempt}, delay_ms={delay_ms:.0f}"
+        )
+
+    def on_error(self, event: RequestEvent) -> None:
+        error = event.error
+        if not is_notion_client_error(error) or not self.logger.isEnabledFor(
+            logging.WARNING
+        ):
+            return
+
+        msg = (
+            f"request fail: code={error.code}, message={error}, attempt={event.attempt}"
+        )
+        if event.request_id:
+            msg += f", request_id={event.request_id}"
+        self.logger.warning(msg)
+        if is_http_response_error(error) and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"failed response body: {error.body}")
@@ -0,0 +1,335 @@
+"""In-process metrics for notion-sdk-py.
+
+A `MetricsCollector` subscribes to the hooks of one or more clients, and keeps
+request counters and latency histograms per endpoint (path template), along with
+the time spent waiting on rate limits and retries and decoding responses, and
+the size of bodies before and after compression. This tells how the wall clock
+time of e.g. an export splits between throttling, network and JSON decoding.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+from notion_client.hooks import RequestEvent
+
+# Each power of two of microseconds is split into 2**_SUB_BUCKET_BITS buckets,
+# which keeps the relative error of the recorded values under 3%.
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """HDR-style histogram of durations, with log-linear buckets of microseconds.
+
+    Recording is constant time and memory grows with the logarithm of the range
+    of values, whatever the number of values recorded.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._buckets: DefaultDict[int, int] = defaultdict(int)
+
+    def record(self, seconds: float) -> None:
+        """Record a duration in seconds."""
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        self._buckets[self._index(max(int(seconds * 1e6), 0))] += 1
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Return the duration in seconds under which `quantile` (between 0 and
+        1) of the recorded durations fall, or None if nothing was recorded."""
+        if not self.count:
+            return None
+
+        rank = max(quantile * self.count, 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                break
+        value = self._upper_bound(index) / 1e6
+        return min(max(value, self.min or 0.0), self.max or 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the count, sum, min, max and main quantiles of the durations."""
+        snapshot: Dict[str, Any] = {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+        for quantile in _QUANTILES:
+            snapshot[f"p{quantile * 100:g}"] = self.quantile(quantile)
+        return snapshot
+
+    @staticmethod
+    def _index(micros: int) -> int:
+        if micros < 2 * _SUB_BUCKET_COUNT:
+            return micros
+        shift = micros.bit_length() - _SUB_BUCKET_BITS - 1
+        return (shift + 1) * _SUB_BUCKET_COUNT + (micros >> shift) - _SUB_BUCKET_COUNT
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        if index < 2 * _SUB_BUCKET_COUNT:
+            return index
+        shift = index // _SUB_BUCKET_COUNT - 1
+        mantissa = index % _SUB_BUCKET_COUNT + _SUB_BUCKET_COUNT
+        return ((mantissa + 1) << shift) - 1
+
+
+class _EndpointMetrics:
+    def __init__(self) -> None:
+        self.responses: DefaultDict[str, int] = defaultdict(int)
+        self.retries = 0
+        self.hedges = 0
+        self.latency = LatencyHistogram()
+        self.decode_seconds = 0.0
+        self.request_bytes = 0
+        self.request_wire_bytes = 0
+        self.response_bytes = 0
+        self.response_wire_bytes = 0
+
+
+class MetricsCollector:
+    """Hooks subscriber keeping metrics on the requests of clients.
+
+    Pass it (or True) as the `metrics` option of clients, or subscribe it to the
+    hooks of a client with `client.hooks.subscribe(collector)`. A collector can
+    be shared between clients and threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _EndpointMetrics] = {}
+        self._rate_limit_wait = {"client": 0.0, "server": 0.0}
+        self._retry_wait = 0.0
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event)
+            if event.hedged:
+                metrics.hedges += 1
+            metrics.request_bytes += event.request_bytes or 0
+            metrics.request_wire_bytes += event.request_wire_bytes or 0
+
+    def on_response(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event)
+            metrics.responses[str(event.status)] += 1
+            self._record_latency(metrics, event)
+            metrics.decode_seconds += event.decode_elapsed or 0.0
+            metrics.response_bytes += event.response_bytes or 0
+            metrics.response_wire_bytes += event.response_wire_bytes or 0
+
+    def on_error(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self._endpoint(event)
+            status = "error" if event.status is None else str(event.status)
+            metrics.responses[status] += 1
+            self._record_latency(metrics, event)
+
+    def on_retry(self, event: RequestEvent) -> None:
+        with self._lock:
+            self._endpoint(event).retries += 1
+            self._retry_wait += event.delay or 0.0
+
+    def on_rate_limited(self, event: RequestEvent) -> None:
+        source = "client" if event.error is None else "server"
+        with self._lock:
+            self._rate_limit_wait[source] += event.delay or 0.0
+
+    def reset(self) -> None:
+        """Forget every metric collected so far."""
+        with self._lock:
+            self._endpoints.clear()
+            self._rate_limit_wait = {"client": 0.0, "server": 0.0}
+            self._retry_wait = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the metrics collected so far as a dict.
+
+        Endpoints are keyed by method and path template, such as
+        `GET pages/{page_id}`. `hedges` counts the second copies of slow
+        requests sent by hedging, whose attempts are counted in `responses` as
+        well. Times are in seconds. Body sizes are in bytes,
+        before (`request_bytes`, `response_bytes`) and after compression
+        (`request_wire_bytes`, `response_wire_bytes`). Waits on retry-after
+        headers and rate limit errors count both as retry waits and as
+        `server` rate limit waits.
+        """
+        with self._lock:
+            endpoints = {
+                f"{method} {endpoint}": {
+                    "responses": dict(metrics.responses),
+                    "retries": metrics.retries,
+                    "hedges": metrics.hedges,
+                    "latency": metrics.latency.snapshot(),
+                    "decode_seconds": metrics.decode_seconds,
+                    "request_bytes": metrics.request_bytes,
+                    "request_wire_bytes": metrics.request_wire_bytes,
+                    "response_bytes": metrics.response_bytes,
+                    "response_wire_bytes": metrics.response_wire_bytes,
+                }
+                for (method, endpoint), metrics in sorted(self._endpoints.items())
+            }
+            return {
+                "endpoints": endpoints,
+                "rate_limit_wait_seconds": dict(self._rate_limit_wait),
+                "retry_wait_seconds": self._retry_wait,
+            }
+
+    def to_prometheus(self, prefix: str = "notion_client") -> str:
+        """Return the metrics collected so far in the Prometheus text exposition
+        format."""
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            lines: List[str] = []
+
+            def add(name: str, kind: str, help: str, samples: Iterable[str]) -> None:
+                lines.append(f"# HELP {prefix}_{name} {help}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                lines.extend(f"{prefix}_{sample}" for sample in samples)
+
+            def labels(method: str, endpoint: str, **extra: str) -> str:
+                pairs = {"method": method, "endpoint": endpoint, **extra}
+                return ",".join(
+                    f'{key}="{_escape(value)}"' for key, value in pairs.items()
+                )
+
+            add(
+                "responses_total",
+                "counter",
+                "Attempts by endpoint and status code.",
+                (
+                    f"responses_total{{{labels(method, endpoint, status=status)}}} {count}"
+                    for (method, endpoint), metrics in items
+                    for status, count in sorted(metrics.responses.items())
+                ),
+            )
+            add(
+                "retries_total",
+                "counter",
+                "Retried attempts by endpoint.",
+                (
+                    f"retries_total{{{labels(method, endpoint)}}} {metrics.retries}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "hedges_total",
+                "counter",
+                "Second copies of slow requests sent by hedging, by endpoint.",
+                (
+                    f"hedges_total{{{labels(method, endpoint)}}} {metrics.hedges}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            latency_samples: List[str] = []
+            for (method, endpoint), metrics in items:
+                histogram = metrics.latency
+                for quantile in _QUANTILES:
+                    value = histogram.quantile(quantile)
+                    quantile_labels = labels(method, endpoint, quantile=f"{quantile:g}")
+                    latency_samples.append(
+                        f"request_duration_seconds{{{quantile_labels}}} "
+                        f"{'NaN' if value is None else value}"
+                    )
+                latency_samples.append(
+                    f"request_duration_seconds_sum{{{labels(method, endpoint)}}} {histogram.sum}"
+                )
+                latency_samples.append(
+                    f"request_duration_seconds_count{{{labels(method, endpoint)}}} {histogram.count}"
+                )
+            add(
+                "request_duration_seconds",
+                "summary",
+                "Duration of attempts by endpoint, decoding included.",
+                latency_samples,
+            )
+            add(
+                "decode_seconds_total",
+                "counter",
+                "Time spent decoding responses by endpoint.",
+                (
+                    f"decode_seconds_total{{{labels(method, endpoint)}}} {metrics.decode_seconds}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "request_bytes_total",
+                "counter",
+                "Size of the request bodies by endpoint, before compression.",
+                (
+                    f"request_bytes_total{{{labels(method, endpoint)}}} {metrics.request_bytes}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "request_wire_bytes_total",
+                "counter",
+                "Size of the request bodies by endpoint, as sent.",
+                (
+                    f"request_wire_bytes_total{{{labels(method, endpoint)}}} {metrics.request_wire_bytes}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "response_bytes_total",
+                "counter",
+                "Size of the decoded responses by endpoint.",
+                (
+                    f"response_bytes_total{{{labels(method, endpoint)}}} {metrics.response_bytes}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "response_wire_bytes_total",
+                "counter",
+                "Size of the responses by endpoint, as received.",
+                (
+                    f"response_wire_bytes_total{{{labels(method, endpoint)}}} {metrics.response_wire_bytes}"
+                    for (method, endpoint), metrics in items
+                ),
+            )
+            add(
+                "rate_limit_wait_seconds_total",
+                "counter",
+                "Time spent waiting on the client-side rate limiter and on rate limits"
+                " set by Notion.",
+                (
+                    f'rate_limit_wait_seconds_total{{source="{source}"}} {seconds}'
+                    for source, seconds in self._rate_limit_wait.items()
+                ),
+            )
+            add(
+                "retry_wait_seconds_total",
+                "counter",
+                "Time spent waiting before retries.",
+                [f"retry_wait_seconds_total {self._retry_wait}"],
+            )
+            return "\n".join(lines) + "\n"
+
+    def _endpoint(self, event: RequestEvent) -> _EndpointMetrics:
+        key = (event.method.upper(), event.endpoint)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = _EndpointMetrics()
+        return metrics
+
+    @staticmethod
+    def _record_latency(metrics: _EndpointMetrics, event: RequestEvent) -> None:
+        if event.elapsed is not None:
+            metrics.latency.record(event.elapsed)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,380 @@
+"""Compact typed objects for notion-sdk-py.
+
+Response dicts are convenient but heavy: each page or block carries a tree of
+small dicts for its properties, parent, users and rich text. The classes of this
+module hold the same data with `__slots__`, and keep the nested objects of each
+response as compact JSON until they are first accessed, which makes them several
+times smaller than dicts when many of them are kept in memory, e.g. in a cache
+or during an export.
+
+Models are created on demand with `from_response()` (or the `from_dict()` class
+method of each model), and turned back into dicts with `to_dict()`.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from notion_client.helpers import (
+    is_full_block,
+    is_full_data_source,
+    is_full_page,
+    is_full_user,
+)
+
+M = TypeVar("M", bound="Model")
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class _Lazy:
+    """Attribute holding a nested object as compact JSON until its first access,
+    when it is decoded (and converted by `convert`, if any) once and for all."""
+
+    def __init__(self, convert: Optional[Callable[[Any], Any]] = None) -> None:
+        self.convert = convert
+
+    def __set_name__(self, owner: Type["Model"], name: str) -> None:
+        self.slot = f"_{name}"
+
+    def __get__(self, instance: Optional["Model"], owner: Type["Model"]) -> Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if isinstance(value, bytes):
+            value = json.loads(value)
+            if self.convert is not None and value is not None:
+                value = self.convert(value)
+            setattr(instance, self.slot, value)
+        return value
+
+
+def _users(value: Dict[str, Any]) -> "User":
+    return User.from_dict(value)
+
+
+def _rich_texts(value: List[Dict[str, Any]]) -> List["RichText"]:
+    return [RichText.from_dict(item) for item in value]
+
+
+def _to_json(value: Any) -> Any:
+    """Return a model, a list of models or a lazy value as plain JSON values."""
+    if isinstance(value, bytes):
+        return json.loads(value)
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+
+class Model:
+    """Base class of the typed objects.
+
+    Fields missing from a response are None. Keys that a model does not know
+    about are kept, and `to_dict()` gives back the response as it was.
+    """
+
+    __slots__ = ("_extra", "_missing")
+
+    object: str = ""
+    _fields: Tuple[str, ...] = ()
+    _lazy_fields: Tuple[str, ...] = ()
+    _extra: Optional[bytes]
+    _missing: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        """Create a model from a response dict, which is left untouched."""
+        model = cls.__new__(cls)
+        for name in cls._fields:
+            setattr(model, name, data.get(name))
+        for name in cls._lazy_fields:
+            value = data.get(name)
+            setattr(model, f"_{name}", None if value is None else _encode(value))
+        known = cls._known_keys(data)
+        extra = {key: value for key, value in data.items() if key not in known}
+        model._extra = _encode(extra) if extra else None
+        model._missing = tuple(
+            name for name in (*cls._fields, *cls._lazy_fields) if name not in data
+        )
+        return model
+
+    @classmethod
+    def _known_keys(cls, data: Dict[str, Any]) -> Tuple[str, ...]:
+        return ("object", *cls._fields, *cls._lazy_fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the model as a response dict."""
+        data: Dict[str, Any] = {"object": self.object} if self.object else {}
+        for name in self._fields:
+            data[name] = getattr(self, name)
+        for name in self._lazy_fields:
+            data[name] = _to_json(getattr(self, f"_{name}"))
+        for name in self._missing:
+            del data[name]
+        if self._extra is not None:
+            data.update(json.loads(self._extra))
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self._fields[:2]
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class RichText(Model):
+    """Item of a rich text array.
+
+    `content` holds the object named after the type of the item, such as the
+    `text` object of `text` items.
+    """
+
+    __slots__ = ("type", "plain_text", "href", "annotations", "content")
+
+    _fields = ("type", "plain_text", "href", "annotations")
+
+    type: str
+    plain_text: str
+    href: Optional[str]
+    annotations: Optional[Dict[str, Any]]
+    content: Any
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RichText":
+        rich_text = super().from_dict(data)
+        rich_text.content = data.get(rich_text.type)
+        return rich_text
+
+    @classmethod
+    def _known_keys(cls, data: Dict[str, Any]) -> Tuple[str, ...]:
+        return (*cls._fields, data.get("type", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        if self.type is not None:
+            data[self.type] = self.content
+        return data
+
+
+class User(Model):
+    """[User object](https://developers.notion.com/reference/user), full or
+    partial (with an `id` only)."""
+
+    __slots__ = ("id", "type", "name", "avatar_url", "_person", "_bot")
+
+    object = "user"
+    _fields = ("id", "type", "name", "avatar_url")
+    _lazy_fields = ("person", "bot")
+
+    id: str
+    type: Optional[str]
+    name: Optional[str]
+    avatar_url: Optional[str]
+    person = _Lazy()
+    bot = _Lazy()
+
+
+class _Parented(Model):
+    __slots__ = ()
+
+    parent = _Lazy()
+    created_by = _Lazy(_users)
+    last_edited_by = _Lazy(_users)
+
+
+class Page(_Parented):
+    """[Page object](https://developers.notion.com/reference/page)."""
+
+    __slots__ = (
+        "id",
+        "created_time",
+        "last_edited_time",
+        "archived",
+        "in_trash",
+        "is_locked",
+        "url",
+        "public_url",
+        "_parent",
+        "_created_by",
+        "_last_edited_by",
+        "_icon",
+        "_cover",
+        "_properties",
+    )
+
+    object = "page"
+    _fields = (
+        "id",
+        "created_time",
+        "last_edited_time",
+        "archived",
+        "in_trash",
+        "is_locked",
+        "url",
+        "public_url",
+    )
+    _lazy_fields = (
+        "parent",
+        "created_by",
+        "last_edited_by",
+        "icon",
+        "cover",
+        "properties",
+    )
+
+    id: str
+    created_time: str
+    last_edited_time: str
+    archived: bool
+    in_trash: bool
+    is_locked: Optional[bool]
+    url: str
+    public_url: Optional[str]
+    icon = _Lazy()
+    cover = _Lazy()
+    properties = _Lazy()
+
+
+class Block(_Parented):
+    """[Block object](https://developers.notion.com/reference/block).
+
+    `content` holds the object named after the type of the block, such as the
+    `paragraph` object of paragraph blocks.
+    """
+
+    __slots__ = (
+        "id",
+        "type",
+        "created_time",
+        "last_edited_time",
+        "has_children",
+        "archived",
+        "in_trash",
+        "_parent",
+        "_created_by",
+        "_last_edited_by",
+        "_content",
+    )
+
+    object = "block"
+    _fields = (
+        "id",
+        "type",
+        "created_time",
+        "last_edited_time",
+        "has_children",
+        "archived",
+        "in_trash",
+    )
+    _lazy_fields = ("parent", "created_by", "last_edited_by")
+
+    id: str
+    type: str
+    created_time: str
+    last_edited_time: str
+    has_children: bool
+    archived: bool
+    in_trash: bool
+    content = _Lazy()
+    _content: Any
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Block":
+        block = super().from_dict(data)
+        content = data.get(block.type)
+        block._content = None if content is None else _encode(content)
+        return block
+
+    @classmethod
+    def _known_keys(cls, data: Dict[str, Any]) -> Tuple[str, ...]:
+        return (*super()._known_keys(data), data.get("type", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        if self.type is not None:
+            data[self.type] = _to_json(self._content)
+        return data
+
+
+class DataSource(_Parented):
+    """[Data source object](https://developers.notion.com/reference/data-source)."""
+
+    __slots__ = (
+        "id",
+        "created_time",
+        "last_edited_time",
+        "archived",
+        "in_trash",
+        "is_inline",
+        "url",
+        "public_url",
+        "_title",
+        "_description",
+        "_parent",
+        "_database_parent",
+        "_created_by",
+        "_last_edited_by",
+        "_icon",
+        "_cover",
+        "_properties",
+    )
+
+    object = "data_source"
+    _fields = (
+        "id",
+        "created_time",
+        "last_edited_time",
+        "archived",
+        "in_trash",
+        "is_inline",
+        "url",
+        "public_url",
+    )
+    _lazy_fields = (
+        "title",
+        "description",
+        "parent",
+        "database_parent",
+        "created_by",
+        "last_edited_by",
+        "icon",
+        "cover",
+        "properties",
+    )
+
+    id: str
+    created_time: str
+    last_edited_time: str
+    archived: bool
+    in_trash: bool
+    is_inline: Optional[bool]
+    url: str
+    public_url: Optional[str]
+    title = _Lazy(_rich_texts)
+    description = _Lazy(_rich_texts)
+    database_parent = _Lazy()
+    icon = _Lazy()
+    cover = _Lazy()
+    properties = _Lazy()
+
+
+def from_response(response: Dict[str, Any]) -> Union[Model, Dict[str, Any]]:
+    """Return the typed object of a response, or the response itself when it is
+    not a full page, block, data source or user (e.g. a partial page)."""
+    if is_full_page(response):
+        return Page.from_dict(response)
+    if is_full_block(response):
+        return Block.from_dict(response)
+    if is_full_data_source(response):
+        return DataSource.from_dict(response)
+    if response.get("object") == "user" and is_full_user(response):
+        return User.from_dict(response)
+    return response
@@ -0,0 +1,268 @@
+"""Schema-driven decoding of data source query results.
+
+The properties of each page returned by `data_sources.query` are a tree of
+dicts that depends on the type of each property. `compile_row_decoder()` reads
+the property schema of a data source once, and returns a decoder turning the
+properties of each page straight into a flat row of plain Python values, without
+looking up the type of each property again for every row.
+
+A `SchemaRegistry` keeps the property IDs of data sources by name, so that
+clients can fill in `filter_properties` from the names of the properties.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from notion_client.cache import normalize_id
+from notion_client.constants import DEFAULT_SCHEMA_TTL_MS
+
+Converter = Callable[[Any], Any]
+
+
+def _text(value: Optional[List[Dict[str, Any]]]) -> Optional[str]:
+    if value is None:
+        return None
+    return "".join(item["plain_text"] for item in value)
+
+
+def _number(value: Optional[float]) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    # datetime.fromisoformat() only supports "Z" from Python 3.11.
+    if value.endswith("Z"):
+        value = f"{value[:-1]}+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _date(value: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    return None if value is None else _datetime(value["start"])
+
+
+def _name(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    return None if value is None else value["name"]
+
+
+def _names(value: Optional[List[Dict[str, Any]]]) -> List[str]:
+    return [item["name"] for item in value or ()]
+
+
+def _id(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    return None if value is None else value["id"]
+
+
+def _ids(value: Optional[List[Dict[str, Any]]]) -> List[str]:
+    return [item["id"] for item in value or ()]
+
+
+def _file_urls(value: Optional[List[Dict[str, Any]]]) -> List[str]:
+    return [item[item["type"]]["url"] for item in value or ()]
+
+
+def _unique_id(value: Optional[Dict[str, Any]]) -> Any:
+    if value is None or value["number"] is None:
+        return None
+    prefix = value.get("prefix")
+    return f"{prefix}-{value['number']}" if prefix else value["number"]
+
+
+def _state(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    return None if value is None else value.get("state")
+
+
+def _computed(value: Optional[Dict[str, Any]]) -> Any:
+    """Convert the value of a formula or rollup according to its own type."""
+    if value is None:
+        return None
+    kind = value["type"]
+    convert = _COMPUTED_CONVERTERS.get(kind)
+    return value[kind] if convert is None else convert(value[kind])
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_CONVERTERS: Dict[str, Converter] = {
+    "title": _text,
+    "rich_text": _text,
+    "number": _number,
+    "checkbox": bool,
+    "select": _name,
+    "status": _name,
+    "multi_select": _names,
+    "date": _date,
+    "created_time": _datetime,
+    "last_edited_time": _datetime,
+    "relation": _ids,
+    "people": _ids,
+    "created_by": _id,
+    "last_edited_by": _id,
+    "files": _file_urls,
+    "url": _identity,
+    "email": _identity,
+    "phone_number": _identity,
+    "formula": _computed,
+    "rollup": _computed,
+    "unique_id": _unique_id,
+    "verification": _state,
+}
+
+_COMPUTED_CONVERTERS: Dict[str, Converter] = {
+    "number": _number,
+    "date": _date,
+}
+
+
+class RowDecoder:
+    """Decoder of the pages of a data source into flat rows.
+
+    Rows map the name of each property of the schema to its value:
+
+    - `title` and `rich_text`: plain text, as a string.
+    - `number`: float.
+    - `checkbox`: bool.
+    - `select` and `status`: name of the option.
+    - `multi_select`: list of option names.
+    - `date`: start as a datetime (naive for dates without time).
+    - `created_time` and `last_edited_time`: datetime.
+    - `relation` and `people`: list of IDs.
+    - `created_by` and `last_edited_by`: user ID.
+    - `files`: list of URLs.
+    - `formula` and `rollup`: value of the result, converted as a number or
+      a date when it is one.
+    - `unique_id`: `PREFIX-number`, or the number without prefix.
+    - `verification`: state.
+
+    Other properties (`url`, `email`, `phone_number` and unknown types) are
+    left as they are. Properties missing from a page are None.
+    """
+
+    def __init__(
+        self,
+        columns: Iterable[Tuple[str, str, Converter]],
+        id_column: Optional[str] = None,
+    ) -> None:
+        self._columns = tuple(columns)
+        self.id_column = id_column
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the columns of the rows, in order."""
+        names = [name for name, _, _ in self._columns]
+        return names if self.id_column is None else [self.id_column, *names]
+
+    def __call__(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode a page into a row."""
+        row: Dict[str, Any] = {}
+        if self.id_column is not None:
+            row[self.id_column] = page["id"]
+        properties = page["properties"]
+        for name, kind, convert in self._columns:
+            value = properties.get(name)
+            row[name] = None if value is None else convert(value.get(kind))
+        return row
+
+    def rows(self, pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Decode pages into rows one by one, e.g. from `iterate_paginated_api()`
+        or from the results of a streamed response."""
+        for page in pages:
+            yield self(page)
+
+
+def compile_row_decoder(
+    data_source: Dict[str, Any], id_column: Optional[str] = None
+) -> RowDecoder:
+    """Compile the decoder of the pages of a data source from its schema, as
+    returned by `data_sources.retrieve()`.
+
+    `id_column` adds the ID of each page to its row, under the given name.
+    """
+    columns = [
+        (name, schema["type"], _CONVERTERS.get(schema["type"], _identity))
+        for name, schema in data_source["properties"].items()
+    ]
+    return RowDecoder(columns, id_column=id_column)
+
+
+class SchemaRegistry:
+    """Thread-safe cache of the property IDs of data sources, by name.
+
+    Clients use their registry (the `schemas` attribute) to turn the
+    `properties` argument of `data_sources.query` and `pages.retrieve` into
+    `filter_properties`. Schemas are retrieved when first needed, and again once
+    they expire, when a name is not found in them, or after the client updated
+    the data source.
+    """
+
+    def __init__(self, ttl_ms: int = DEFAULT_SCHEMA_TTL_MS) -> None:
+        self.ttl = ttl_ms / 1000.0
+        self._schemas: Dict[str, Tuple[Dict[str, str], float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def set(self, data_source: Dict[str, Any]) -> None:
+        """Keep the schema of a data source, as returned by
+        `data_sources.retrieve()`."""
+        ids = {name: schema["id"] for name, schema in data_source["properties"].items()}
+        with self._lock:
+            self._schemas[normalize_id(data_source["id"])] = (
+                ids,
+                time.monotonic() + self.ttl,
+            )
+
+    def property_ids(
+        self, data_source_id: str, names: Sequence[str]
+    ) -> Optional[List[str]]:
+        """Return the IDs of properties of a data source by name, or None if its
+        schema is not known, expired, or lacks some of the names."""
+        with self._lock:
+            entry = self._schemas.get(normalize_id(data_source_id))
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        ids = entry[0]
+        if any(name not in ids for name in names):
+            return None
+        return [ids[name] for name in names]
+
+    def invalidate(self, data_source_id: str) -> None:
+        """Forget the schema of a data source, e.g. after it changed."""
+        with self._lock:
+            self._schemas.pop(normalize_id(data_source_id), None)
+
+    def clear(self) -> None:
+        """Forget all the schemas."""
+        with self._lock:
+            self._schemas.clear()
+
+
+def resolve_property_ids(
+    data_source: Dict[str, Any], names: Sequence[str]
+) -> List[str]:
+    """Return the IDs of properties of a data source by name, raising a
+    `ValueError` for unknown names."""
+    properties = data_source["properties"]
+    unknown = [name for name in names if name not in properties]
+    if unknown:
+        raise ValueError(
+            f"Unknown properties of data source {data_source['id']}: "
+            + ", ".join(unknown)
+        )
+    return [properties[name]["id"] for name in names]
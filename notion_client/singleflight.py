@@ -0,0 +1,88 @@
+"""Deduplication of identical in-flight calls for notion-sdk-py.
+
+When several threads or tasks ask for the same resource at the same time, only
+the first call is actually executed; the others wait for it and receive its
+result (or its exception).
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share the result of concurrent calls with the same key between threads."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        function: Callable[[], T],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Call `function`, unless a call with the same key is already in flight,
+        in which case wait for it and return its result.
+
+        Waiting for the call of another thread raises
+        `concurrent.futures.TimeoutError` after `timeout` seconds."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                leader = False
+            else:
+                leader = True
+                future = self._calls[key] = Future()
+
+        if not leader:
+            result: T = future.result(timeout)
+            return result
+
+        try:
+            result = function()
+        except BaseException as error:
+            self._forget(key)
+            future.set_exception(error)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Share the result of concurrent calls with the same key between tasks.
+
+    The shared call runs in its own task, so cancelling one of the waiting
+    callers (including the first one) does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        function: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None,
+    ) -> T:
+        """Await `function()`, unless a call with the same key is already in
+        flight, in which case wait for it and return its result.
+
+        Waiting raises `asyncio.TimeoutError` after `timeout` seconds, without
+        cancelling the call for the others."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        result: T = await asyncio.wait_for(asyncio.shield(task), timeout)
+        return result
@@ -0,0 +1,214 @@
+"""Persistent object store for notion-sdk-py.
+
+An `ObjectStore` keeps pages, blocks and data sources in a SQLite database (in
+WAL mode, so that readers do not block the writer), by ID and along with their
+`last_edited_time`. Processes and command line runs using the same file start
+with the objects of the previous runs.
+
+`changed_pages()` makes exports incremental: it queries a data source for the
+pages edited since the most recent copy in the store only, and stores them.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from notion_client.cache import normalize_id
+from notion_client.helpers import async_iterate_paginated_api, iterate_paginated_api
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id TEXT PRIMARY KEY,
+    object TEXT NOT NULL,
+    parent_id TEXT,
+    last_edited_time TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_parent_id
+    ON objects (parent_id, last_edited_time);
+"""
+
+
+def _parent_id(obj: Dict[str, Any]) -> Optional[str]:
+    """Return the ID of the parent of an object, such as the data source of a
+    page, or None for the workspace."""
+    parent = obj.get("parent") or {}
+    parent_id = parent.get(parent.get("type"))
+    return normalize_id(parent_id) if isinstance(parent_id, str) else None
+
+
+class ObjectStore:
+    """Pages, blocks and data sources stored by ID in a SQLite database.
+
+    Objects are stored as they were received, and `get()` returns a new dict on
+    each call. The store can be used from several threads.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ObjectStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return int(self._fetch_one("SELECT COUNT(*) FROM objects")[0])
+
+    def get(self, object_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored copy of an object, or None."""
+        row = self._fetch_one(
+            "SELECT body FROM objects WHERE id = ?", (normalize_id(object_id),)
+        )
+        return None if row is None else json.loads(row[0])
+
+    def last_edited_time(self, object_id: str) -> Optional[str]:
+        """Return the `last_edited_time` of the stored copy of an object, or
+        None."""
+        row = self._fetch_one(
+            "SELECT last_edited_time FROM objects WHERE id = ?",
+            (normalize_id(object_id),),
+        )
+        return None if row is None else row[0]
+
+    def put(self, obj: Dict[str, Any]) -> None:
+        """Store an object, replacing its previous copy."""
+        self.put_many((obj,))
+
+    def put_many(self, objects: Iterable[Dict[str, Any]]) -> None:
+        """Store objects in a single transaction."""
+        rows = [
+            (
+                normalize_id(obj["id"]),
+                obj["object"],
+                _parent_id(obj),
+                obj.get("last_edited_time"),
+                json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(),
+            )
+            for obj in objects
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def invalidate(self, object_id: str) -> None:
+        """Remove the stored copy of an object, e.g. after it changed."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM objects WHERE id = ?", (normalize_id(object_id),)
+            )
+
+    def clear(self) -> None:
+        """Remove all the stored objects."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM objects")
+
+    def watermark(self, parent_id: str) -> Optional[str]:
+        """Return the most recent `last_edited_time` of the stored children of an
+        object, such as the pages of a data source, or None if there are none."""
+        row = self._fetch_one(
+            "SELECT MAX(last_edited_time) FROM objects WHERE parent_id = ?",
+            (normalize_id(parent_id),),
+        )
+        watermark: Optional[str] = row[0]
+        return watermark
+
+    def changed_pages(
+        self, function: Callable[..., Any], data_source_id: str, **kwargs: Any
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Return an iterator over the pages of a data source edited since the
+        most recent copy in the store, which are stored as they are received.
+
+        `function` is `client.data_sources.query`, and other arguments are passed
+        on to it. The first call returns all the pages:
+
+        ```python
+        with ObjectStore("notion.db") as store:
+            for page in store.changed_pages(
+                notion.data_sources.query, data_source_id=data_source_id
+            ):
+                export(page, notion.blocks.children.list(block_id=page["id"]))
+        ```
+
+        `last_edited_time` is rounded to the minute by Notion, so the pages
+        edited during the minute of the most recent copy are returned again.
+        Pages moved to the trash are not returned, and stay in the store. The
+        most recent copy is looked for among all the stored pages of the data
+        source, so a `filter` should be the same from one call to the next.
+        """
+        kwargs = self._changed_pages_query(data_source_id, kwargs)
+        for page in iterate_paginated_api(function, **kwargs):
+            self.put(page)
+            yield page
+
+    async def async_changed_pages(
+        self,
+        function: Callable[..., Awaitable[Any]],
+        data_source_id: str,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Return an async iterator over the pages of a data source edited since
+        the most recent copy in the store, like `changed_pages()`."""
+        kwargs = self._changed_pages_query(data_source_id, kwargs)
+        async for page in async_iterate_paginated_api(function, **kwargs):
+            self.put(page)
+            yield page
+
+    def _changed_pages_query(
+        self, data_source_id: str, kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Returns the arguments of a query for the pages of a data source edited
+        since the watermark, oldest first, within the filter of the caller."""
+        kwargs = {
+            **kwargs,
+            "data_source_id": data_source_id,
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+        }
+        watermark = self.watermark(data_source_id)
+        if watermark is not None:
+            edited_since = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": watermark},
+            }
+            query_filter = kwargs.get("filter")
+            kwargs["filter"] = (
+                edited_since
+                if query_filter is None
+                else {"and": [query_filter, edited_since]}
+            )
+        return kwargs
+
+    def _fetch_one(self, sql: str, parameters: Tuple[Any, ...] = ()) -> Any:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchone()
@@ -0,0 +1,268 @@
+"""Streaming of list responses for notion-sdk-py.
+
+A page of query results can weigh several megabytes. Instead of waiting for the
+whole body and decoding it at once, a streamed response decodes each item of its
+`results` as soon as it has been received, so that processing overlaps the
+network transfer and only one item at a time needs to be held in memory.
+"""
+
+import codecs
+import json
+import re
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_NUMBER_CHARACTERS = re.compile(r"[0-9.eE+-]*")
+
+_START, _MEMBERS, _RESULTS, _DONE = range(4)
+
+_ARRAY = object()
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    match = _NON_WHITESPACE.search(text, index)
+    return match.start() if match else len(text)
+
+
+class ResultsParser:
+    """Incremental parser of JSON objects, which decodes each item of their
+    `results` array as soon as it is complete.
+
+    Each item (and each other member of the object) is decoded by the standard
+    library's C decoder once it has been received in full. A decoding attempt on
+    incomplete data is only retried once the pending data has doubled, which
+    keeps the parsing time linear whatever the size of the chunks.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._index = 0
+        self._state = _START
+        self._retry_length = 0
+        self._body: Dict[str, Any] = {}
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """The members of the object parsed so far, except `results`."""
+        return self._body
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parse a chunk of the response, and return the items it completed."""
+        self._text = self._text[self._index :] + self._text_decoder.decode(chunk)
+        self._index = 0
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Parse the end of the response, and return the items it completed.
+
+        Raises `ValueError` if the response is not a complete JSON object.
+        """
+        self._text = self._text[self._index :] + self._text_decoder.decode(
+            b"", final=True
+        )
+        self._index = 0
+        results = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON object")
+        return results
+
+    def _parse(self, final: bool) -> List[Any]:
+        results: List[Any] = []
+        text = self._text
+        while True:
+            index = _skip_whitespace(text, self._index)
+            if index == len(text):
+                return results
+            char = text[index]
+
+            if self._state == _START:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._state = _MEMBERS
+                self._index = index + 1
+            elif self._state == _MEMBERS:
+                if char in ",}":
+                    if char == "}":
+                        self._state = _DONE
+                    self._index = index + 1
+                    continue
+
+                member = self._decode_member(text, index, final)
+                if member is None:
+                    return results
+                key, value, self._index = member
+                if key == "results" and value is _ARRAY:
+                    self._state = _RESULTS
+                else:
+                    self._body[key] = value
+            elif self._state == _RESULTS:
+                if char in ",]":
+                    if char == "]":
+                        self._state = _MEMBERS
+                    self._index = index + 1
+                    continue
+
+                decoded = self._decode(text, index, final)
+                if decoded is None:
+                    return results
+                item, self._index = decoded
+                results.append(item)
+            else:
+                raise ValueError("Unexpected data after the JSON object")
+
+    def _decode_member(
+        self, text: str, index: int, final: bool
+    ) -> Optional[Tuple[str, Any, int]]:
+        """Decode a `"key": value` member starting at `index`, and return the key,
+        the value and the index after it. The value of `results` is returned as
+        `_ARRAY` when it is an array, and the index is then the one of its first
+        item."""
+        # Keys are short: they are decoded again on every chunk until complete,
+        # so that only the values count towards the retry length.
+        if text[index] != '"':
+            raise ValueError("Expected a key")
+        try:
+            key, index = self._decoder.raw_decode(text, index)
+        except json.JSONDecodeError:
+            return self._incomplete(final)
+
+        index = _skip_whitespace(text, index)
+        if index == len(text):
+            return self._incomplete(final)
+        if text[index] != ":":
+            raise ValueError("Expected ':' after a key")
+
+        index = _skip_whitespace(text, index + 1)
+        if index == len(text):
+            return self._incomplete(final)
+        if key == "results" and text[index] == "[":
+            return key, _ARRAY, index + 1
+
+        decoded = self._decode(text, index, final)
+        if decoded is None:
+            return None
+        return key, decoded[0], decoded[1]
+
+    def _decode(self, text: str, index: int, final: bool) -> Optional[Tuple[Any, int]]:
+        """Decode the JSON value starting at `index`, and return it with the
+        index after it, or None if it has not been received in full yet."""
+        if not final and len(text) - index < self._retry_length:
+            return None
+
+        try:
+            value, end = self._decoder.raw_decode(text, index)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            self._retry_length = 2 * (len(text) - index)
+            return None
+
+        # A number at the end of the data may continue in the next chunk.
+        if (
+            not final
+            and type(value) in (int, float)
+            and _NUMBER_CHARACTERS.fullmatch(text, end)
+        ):
+            return None
+
+        self._retry_length = 0
+        return value, end
+
+    @staticmethod
+    def _incomplete(final: bool) -> None:
+        if final:
+            raise ValueError("Incomplete JSON object")
+        return None
+
+
+class StreamedResponse:
+    """Response whose `results` are decoded as they are received.
+
+    Iterating over the response yields the items of its `results`, and can only
+    be done once. The rest of the response, such as `next_cursor` and `has_more`,
+    is then available in `body`.
+    """
+
+    def __init__(self, chunks: Generator[bytes, None, None]) -> None:
+        self._chunks = chunks
+        self._parser = ResultsParser()
+        self._started = False
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._started:
+            raise RuntimeError("The results can only be iterated over once")
+        self._started = True
+        try:
+            for chunk in self._chunks:
+                yield from self._parser.feed(chunk)
+            yield from self._parser.close()
+            self._done = True
+        finally:
+            self.close()
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """The response without its `results`, once they have been iterated
+        over."""
+        if not self._done:
+            raise RuntimeError("Iterate over the results before reading the body")
+        return self._parser.body
+
+    def close(self) -> None:
+        """Close the response without reading the rest of it."""
+        self._chunks.close()
+
+
+class AsyncStreamedResponse:
+    """Response whose `results` are decoded as they are received, for
+    `AsyncClient`.
+
+    Iterating asynchronously over the response yields the items of its
+    `results`, and can only be done once. The rest of the response, such as
+    `next_cursor` and `has_more`, is then available in `body`.
+    """
+
+    def __init__(self, chunks: AsyncGenerator[bytes, None]) -> None:
+        self._chunks = chunks
+        self._parser = ResultsParser()
+        self._started = False
+        self._done = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        if self._started:
+            raise RuntimeError("The results can only be iterated over once")
+        self._started = True
+        try:
+            async for chunk in self._chunks:
+                for item in self._parser.feed(chunk):
+                    yield item
+            for item in self._parser.close():
+                yield item
+            self._done = True
+        finally:
+            await self.aclose()
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """The response without its `results`, once they have been iterated
+        over."""
+        if not self._done:
+            raise RuntimeError("Iterate over the results before reading the body")
+        return self._parser.body
+
+    async def aclose(self) -> None:
+        """Close the response without reading the rest of it."""
+        await self._chunks.aclose()
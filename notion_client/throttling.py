@@ -0,0 +1,235 @@
+"""Client-side throttling primitives for notion-sdk-py.
+
+Notion enforces an average request rate per integration and answers with HTTP 429
+once it is exceeded. The helpers in this module let the client pace itself before
+sending requests, instead of learning about the limit through rejected calls.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second.
+
+    The bucket holds at most `capacity` tokens. Taking a token from an empty
+    bucket is allowed and returns how long the caller must wait before the token
+    is actually available, so that concurrent callers are scheduled one after the
+    other instead of all waking up at the same time.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the delay in seconds before it can be used."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_reserve(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def cancel(self) -> None:
+        """Give back a token taken by `reserve()` that will not be used, so that
+        the callers scheduled after it do not wait for it."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+
+class RateLimiter:
+    """Set of token buckets keyed by an arbitrary string, usually an auth token.
+
+    Buckets are created on first use. Requests sharing the same key share the
+    same bucket; a key of `None` is a regular key like any other.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Optional[str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: Optional[str] = None) -> float:
+        """Take a token for `key` and return the delay in seconds before sending."""
+        return self._bucket(key).reserve()
+
+    def try_reserve(self, key: Optional[str] = None) -> bool:
+        """Take a token for `key` only if one is available right now."""
+        return self._bucket(key).try_reserve()
+
+    def cancel(self, key: Optional[str] = None) -> None:
+        """Give back a token taken for `key` by `reserve()` that will not be used."""
+        self._bucket(key).cancel()
+
+    def _bucket(self, key: Optional[str]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(
+                    key, TokenBucket(self.rate, self.burst)
+                )
+        return bucket
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limit on in-flight requests that adapts to rate limit feedback (AIMD).
+
+    The limit grows additively while requests succeed (by `increase` for every
+    `limit` successes, so roughly once per round trip of the whole window) and is
+    multiplied by `decrease_factor` when the API asks the client to slow down.
+
+    Each slot is tagged with the epoch in which it was acquired, and only the
+    first throttling signal of an epoch shrinks the window: requests that were
+    already in flight when the limit was cut do not cut it again.
+
+    This limiter is meant to be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        increase: float,
+        decrease_factor: float,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._epoch = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    async def acquire(self) -> int:
+        """Wait for a free slot and return the epoch it was acquired in."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return self._epoch
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation.
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return self._epoch
+
+    def release(self) -> None:
+        """Give a slot back and wake up waiters that now fit in the window."""
+        self._in_flight -= 1
+        self._wake_up_waiters()
+
+    def on_success(self) -> None:
+        """Grow the window after a successful response."""
+        self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+        self._wake_up_waiters()
+
+    def on_throttled(self, epoch: int) -> None:
+        """Shrink the window after a rate limit response from a slot of `epoch`."""
+        if epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+
+    def _wake_up_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+
+class RetryBudget:
+    """Limit retries to a fraction of the requests sent in a sliding window.
+
+    Within the last `window` seconds, at most `min_retries` retries plus `ratio`
+    retries per request are allowed, so that retries cannot multiply the load
+    sent to the API while it is failing.
+    """
+
+    def __init__(self, ratio: float, min_retries: int, window: float) -> None:
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+        if min_retries < 0:
+            raise ValueError("min_retries must not be negative")
+        if window <= 0:
+            raise ValueError("window must be greater than 0")
+
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Record a new request (not a retry)."""
+        with self._lock:
+            self._requests.append(time.monotonic())
+
+    def try_retry(self) -> bool:
+        """Record a retry and return True if the budget allows it."""
+        with self._lock:
+            now = time.monotonic()
+            for timestamps in (self._requests, self._retries):
+                while timestamps and timestamps[0] <= now - self.window:
+                    timestamps.popleft()
+
+            if len(self._retries) >= self.min_retries + self.ratio * len(
+                self._requests
+            ):
+                return False
+            self._retries.append(now)
+            return True
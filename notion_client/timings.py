@@ -0,0 +1,98 @@
+"""Per-request timing breakdown for notion-sdk-py.
+
+Requests sent while someone listens to the responses carry a `TimingsRecorder`
+in the `trace` extension of HTTPX, which HTTPX (through httpcore) calls at each
+step of the exchange: acquiring a connection, connecting, the TLS handshake,
+sending the request and receiving the response. This tells whether latency comes
+from waiting on the connection pool, from the network, or from Notion itself.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class RequestTimings:
+    """Breakdown of the time spent on an attempt, in seconds.
+
+    Steps are None when they did not happen (e.g. `connect` and `tls` when a
+    pooled connection was reused) or were not observed, such as every network
+    step with transports that do not support the `trace` extension.
+
+    Attributes:
+        pool_wait: From sending the request to getting a connection, or to
+            starting to open one. Large values mean the connection pool is
+            starved.
+        connect: Opening the TCP connection.
+        tls: The TLS handshake.
+        ttfb: Time to first byte, from sending the request to receiving the
+            headers of the response.
+        download: Receiving the body of the response. None for streamed
+            responses, whose body is received later.
+        decode: Decoding the body of the response.
+    """
+
+    pool_wait: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    decode: Optional[float] = None
+
+
+class TimingsRecorder:
+    """Callback of the `trace` extension of HTTPX recording when each step of
+    an attempt starts and ends.
+
+    Use the recorder itself with synchronous clients, and its `atrace` method
+    with asynchronous ones.
+    """
+
+    __slots__ = ("started_at", "_events")
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self._events: Dict[str, float] = {}
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        # Names are prefixed by the httpcore module, e.g. "http11." or "http2.".
+        self._events[name.partition(".")[2]] = time.monotonic()
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        self(name, info)
+
+    def timings(self, decode_started_at: Optional[float] = None) -> RequestTimings:
+        """Return the timings recorded so far, and the time spent decoding the
+        response since `decode_started_at`."""
+        events = self._events
+        connection_started_at = events.get(
+            "connect_tcp.started", events.get("send_request_headers.started")
+        )
+        return RequestTimings(
+            pool_wait=(
+                None
+                if connection_started_at is None
+                else connection_started_at - self.started_at
+            ),
+            connect=self._between("connect_tcp.started", "connect_tcp.complete"),
+            tls=self._between("start_tls.started", "start_tls.complete"),
+            ttfb=self._between(
+                "send_request_headers.started", "receive_response_headers.complete"
+            ),
+            download=self._between(
+                "receive_response_body.started", "receive_response_body.complete"
+            ),
+            decode=(
+                None
+                if decode_started_at is None
+                else time.monotonic() - decode_started_at
+            ),
+        )
+
+    def _between(self, start: str, end: str) -> Optional[float]:
+        started_at = self._events.get(start)
+        ended_at = self._events.get(end)
+        if started_at is None or ended_at is None:
+            return None
+        return ended_at - started_at
@@ -0,0 +1,80 @@
+"""OpenTelemetry tracing for notion-sdk-py.
+
+A client given an OpenTelemetry tracer creates one span per API call, with a
+child span for each attempt and for each wait (back-off before a retry, or
+client-side rate limiting), so that traces tell retries, rate limit waits and
+slow responses apart. The OpenTelemetry API is not a dependency of the client:
+tracers are only used through `start_as_current_span()`, and spans through
+`set_attribute()`.
+"""
+
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from notion_client.errors import is_http_response_error, is_notion_client_error
+from notion_client.helpers import path_template
+
+_NO_SPAN: ContextManager[Any] = nullcontext()
+
+
+def call_span(tracer: Optional[Any], method: str, path: str) -> ContextManager[Any]:
+    """Start the span of an API call, retries included. Does nothing and yields
+    None without a tracer, as do the other spans."""
+    if tracer is None:
+        return _NO_SPAN
+
+    method = method.upper()
+    endpoint = path_template(path)
+    attributes = {"http.request.method": method, "notion.endpoint": endpoint}
+    return _recording_span(tracer, f"notion {method} {endpoint}", attributes)
+
+
+def attempt_span(tracer: Optional[Any], attempt: int) -> ContextManager[Any]:
+    """Start the span of an attempt of an API call."""
+    if tracer is None:
+        return _NO_SPAN
+    return _recording_span(tracer, "notion.attempt", {"notion.attempt": attempt})
+
+
+def wait_span(
+    tracer: Optional[Any], name: str, delay: float, rate_limited: bool
+) -> ContextManager[Any]:
+    """Start the span of a wait before an attempt: `notion.backoff` before a
+    retry, or `notion.rate_limit` for the client-side rate limiter."""
+    if tracer is None:
+        return _NO_SPAN
+    attributes = {"notion.delay_ms": delay * 1000, "notion.rate_limited": rate_limited}
+    return _recording_span(tracer, name, attributes)
+
+
+@contextmanager
+def _recording_span(
+    tracer: Any, name: str, attributes: Dict[str, Any]
+) -> Iterator[Any]:
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        try:
+            yield span
+        except Exception as error:
+            record_error(span, error)
+            raise
+
+
+def record_response(span: Any, status: int, request_id: Optional[str]) -> None:
+    """Set the status code and request ID of a response on a span."""
+    span.set_attribute("http.response.status_code", status)
+    if request_id:
+        span.set_attribute("notion.request_id", request_id)
+
+
+def record_error(span: Any, error: Exception) -> None:
+    """Set the error code, and the status code and request ID if any, of an
+    error on a span."""
+    if not is_notion_client_error(error):
+        span.set_attribute("error.type", type(error).__qualname__)
+        return
+
+    code = getattr(error.code, "value", error.code)
+    span.set_attribute("error.type", code)
+    span.set_attribute("notion.error_code", code)
+    if is_http_response_error(error):
+        record_response(span, error.status, error.request_id)
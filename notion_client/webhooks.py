@@ -6,11 +6,16 @@ resulting hex digest in the `X-Notion-Signature` header as `sha256=<hex>`.
 To verify a delivery, callers must pass the body **exactly as it arrived
 over the wire** — any JSON re-serialization will change the bytes and
 invalidate the signature.
+
+Webhook events also tell which objects changed, so that the copies kept by a
+`ResponseCache` or an `ObjectStore` can be invalidated as soon as Notion notifies
+the change, instead of when they expire.
 """
 
 import hmac
+import json
 from hashlib import sha256
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Protocol, Union
 
 _SIGNATURE_PREFIX = "sha256="
 
@@ -43,3 +48,62 @@ def verify_webhook_signature(
         return False
     expected = sign_webhook_payload(body, verification_token)
     return hmac.compare_digest(signature, expected)
+
+
+# Events that change the children of the parent of their entity.
+_STRUCTURAL_ACTIONS = {"created", "deleted", "undeleted", "moved"}
+
+
+class Invalidatable(Protocol):
+    """Cache of objects by ID, such as a `ResponseCache` or an `ObjectStore`."""
+
+    def invalidate(self, object_id: str) -> None:
+        ...  # pragma: no cover
+
+
+def webhook_event_object_ids(event: Dict[str, Any]) -> List[str]:
+    """Return the IDs of the objects changed according to a webhook event.
+
+    These are the entity of the event (page, database, data source, block or
+    comment), the blocks updated by `page.content_updated` events, and the
+    parent of the entity for events adding it to or removing it from the
+    children of its parent (`created`, `deleted`, `undeleted` and `moved`, except
+    for comments, which are not children of their parent).
+    """
+    entity = event.get("entity") or {}
+    data = event.get("data") or {}
+    object_ids = [entity["id"]] if "id" in entity else []
+    object_ids.extend(block["id"] for block in data.get("updated_blocks") or ())
+    parent = data.get("parent") or {}
+    action = str(event.get("type", "")).rpartition(".")[2]
+    if (
+        action in _STRUCTURAL_ACTIONS
+        and entity.get("type") != "comment"
+        and "id" in parent
+        and parent.get("type") not in ("space", "workspace")
+    ):
+        object_ids.append(parent["id"])
+    return object_ids
+
+
+def invalidate_from_webhook(
+    body: Union[str, bytes],
+    signature: Optional[str],
+    verification_token: str,
+    *caches: Optional[Invalidatable],
+) -> Optional[Dict[str, Any]]:
+    """Verify a webhook delivery, and invalidate the objects it changed in the
+    given caches, such as `notion.cache` or an `ObjectStore`.
+
+    Returns the event, or None if the signature is invalid. Caches that are
+    None, like the cache of a client without caching, are skipped, and the
+    verification handshake invalidates nothing.
+    """
+    if not verify_webhook_signature(body, signature, verification_token):
+        return None
+    event: Dict[str, Any] = json.loads(body)
+    for object_id in webhook_event_object_ids(event):
+        for cache in caches:
+            if cache is not None:
+                cache.invalidate(object_id)
+    return event
@@ -21,6 +21,7 @@ setup(
         "httpx >= 0.23.0",
         "typing_extensions >= 4.0.0; python_version < '3.10'",
     ],
+    extras_require={"compression": ["httpx[brotli,zstd]"]},
     classifiers=[
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
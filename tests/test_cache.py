@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+from notion_client.cache import ResponseCache
+
+
+def test_response_cache_get_and_set():
+    cache = ResponseCache()
+    assert cache.get("key") is None
+    cache.set("key", "ABC-123", b'{"object": "page"}')
+    assert cache.get("key") == b'{"object": "page"}'
+    assert (len(cache), cache.size_bytes) == (1, 18)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.set("key", "abc123", b"{}")
+    assert (len(cache), cache.size_bytes) == (1, 2)
+
+
+@patch("time.monotonic")
+def test_response_cache_expires_entries(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    cache = ResponseCache(ttl_ms=1000)
+    cache.set("key", "id", b"{}")
+    mock_monotonic.return_value = 100.5
+    assert cache.get("key") == b"{}"
+    mock_monotonic.return_value = 101.0
+    assert cache.get("key") is None
+    assert (len(cache), cache.size_bytes, cache.misses) == (0, 0, 1)
+
+
+def test_response_cache_evicts_least_recently_used_entries():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", "a", b"1234")
+    cache.set("b", "b", b"1234")
+    cache.get("a")
+    cache.set("c", "c", b"12")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234" and cache.get("c") == b"12"
+
+    cache.set("d", "d", b"123456789")
+    assert len(cache) == 1 and cache.get("d") is not None
+    cache.set("e", "e", b"12345678901")
+    assert cache.get("e") is None and cache.get("d") is not None
+
+
+def test_response_cache_invalidates_all_entries_of_an_object():
+    cache = ResponseCache()
+    cache.set(("pages", "query 1"), "b55c9c91-384d-452b", b"1")
+    cache.set(("pages", "query 2"), "B55C9C91384D452B", b"2")
+    cache.set(("blocks",), "other", b"3")
+    version = cache.version
+
+    cache.invalidate("b55c9c91384d452b")
+    assert cache.get(("pages", "query 1")) is None
+    assert cache.get(("pages", "query 2")) is None
+    assert cache.get(("blocks",)) == b"3"
+    assert cache.version == version + 1
+
+    cache.set(("pages", "query 1"), "b55c9c91384d452b", b"stale", version)
+    assert cache.get(("pages", "query 1")) is None
+    cache.invalidate("unknown")
+
+    cache.clear()
+    assert (len(cache), cache.size_bytes) == (0, 0)
+    assert cache.version == version + 3
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+
+from notion_client.circuit_breaker import CircuitBreaker
+
+
+def test_circuit_breaker_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0, recovery_timeout=1)
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=1, recovery_timeout=-1)
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_circuit_breaker_opens_after_consecutive_failures(mock_monotonic):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+
+    assert breaker.on_failure("pages") is False
+    assert breaker.on_failure("pages") is False
+    assert breaker.before_request("pages") == 0.0
+    assert breaker.on_failure("pages") is True
+    assert breaker.is_open("pages")
+    assert breaker.before_request("pages") == 10.0
+
+    # Circuits are independent from each other.
+    assert not breaker.is_open("blocks")
+    assert breaker.before_request("blocks") == 0.0
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_circuit_breaker_success_resets_failure_count(mock_monotonic):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+
+    breaker.on_failure("pages")
+    breaker.on_success("pages")
+    assert breaker.on_failure("pages") is False
+    assert not breaker.is_open("pages")
+
+
+@patch("time.monotonic")
+def test_circuit_breaker_lets_a_single_probe_through(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.on_failure("pages")
+
+    mock_monotonic.return_value = 105.0
+    assert breaker.before_request("pages") == 5.0
+
+    mock_monotonic.return_value = 110.0
+    assert breaker.before_request("pages") == 0.0
+    assert breaker.before_request("pages") == 10.0
+
+    breaker.on_success("pages")
+    assert not breaker.is_open("pages")
+    assert breaker.before_request("pages") == 0.0
+
+
+@patch("time.monotonic")
+def test_circuit_breaker_reopens_when_probe_fails(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.on_failure("pages")
+
+    mock_monotonic.return_value = 110.0
+    assert breaker.before_request("pages") == 0.0
+    mock_monotonic.return_value = 111.0
+    assert breaker.on_failure("pages") is False
+    assert breaker.is_open("pages")
+    assert breaker.before_request("pages") == 10.0
+
+
+@patch("time.monotonic")
+def test_circuit_breaker_replaces_lost_probe(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.on_failure("pages")
+
+    mock_monotonic.return_value = 110.0
+    assert breaker.before_request("pages") == 0.0
+
+    mock_monotonic.return_value = 120.0
+    assert breaker.before_request("pages") == 0.0
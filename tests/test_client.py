@@ -1,5 +1,10 @@
+import asyncio
 import base64
+import gzip
+import inspect
 import json
+import logging
+import threading
 import time as time_module
 import uuid
 from email.utils import formatdate
@@ -9,8 +14,34 @@ from unittest.mock import Mock, patch
 import httpx
 import pytest
 
-from notion_client import APIResponseError, AsyncClient, Client
-from notion_client.client import RetryOptions
+from notion_client import (
+    APIResponseError,
+    AsyncClient,
+    CircuitOpenError,
+    InvalidPathParameterError,
+    Client,
+    ResponseCache,
+    AsyncStreamedResponse,
+    RequestTimeoutError,
+    StreamedResponse,
+    UnknownHTTPResponseError,
+    deadline,
+    iterate_paginated_api,
+)
+from notion_client.client import (
+    AdaptiveConcurrencyOptions,
+    CircuitBreakerOptions,
+    CompressionOptions,
+    ConnectionOptions,
+    HedgingOptions,
+    JSONCodec,
+    RateLimitOptions,
+    RawResponse,
+    RetryOptions,
+)
+from notion_client.helpers import async_iterate_paginated_api
+from notion_client.metrics import MetricsCollector
+from notion_client.schema import SchemaRegistry
 
 
 def _mock_http_response(
@@ -267,13 +298,46 @@ def test_request_with_dict_auth(client):
     assert captured_request.headers["Authorization"] == f"Basic {expected_encoded}"
 
 
-def test_request_logs_success_without_request_id(client):
+def test_auth_headers_are_computed_once_per_token(client):
+    basic = {"client_id": "id", "client_secret": "secret"}
+    headers = client._auth_headers("token")
+    assert headers == {"Authorization": "Bearer token"}
+    assert client._auth_headers("token") is headers
+    assert client._auth_headers(dict(basic)) is client._auth_headers(basic)
+
+    with patch("notion_client.client._AUTH_HEADERS_CACHE_SIZE", 2):
+        client._auth_headers("other")
+        assert len(client._auth_headers_cache) == 1
+        assert client._auth_headers("token") is not headers
+
+
+def test_build_request_with_auth_and_json_codec(client):
+    client.options.json_codec = JSONCodec()
+    request = client._build_request("POST", "search", query={}, body={}, auth="token")
+    assert request.headers["Authorization"] == "Bearer token"
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.url == "https://api.notion.com/v1/search"
+    # The cached headers are left untouched.
+    assert client._auth_headers("token") == {"Authorization": "Bearer token"}
+
+
+def test_endpoint_paths_are_validated(client):
+    with patch.object(client.client, "send") as mock_send:
+        with pytest.raises(InvalidPathParameterError):
+            client.pages.retrieve(page_id="../users")
+        with pytest.raises(InvalidPathParameterError):
+            client.blocks.retrieve(block_id="%2E%2e")
+    mock_send.assert_not_called()
+
+
+def test_request_logs_success_without_request_id():
     """Test that a successful response without request_id is logged correctly."""
-    mock_response = Mock(spec=httpx.Response)
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = {"results": []}
+    client = Client()
+    client.logger.setLevel(logging.INFO)
 
-    with patch.object(client.client, "send", return_value=mock_response):
+    with patch.object(
+        client.client, "send", return_value=success_response({"results": []})
+    ):
         with patch.object(client.logger, "info") as mock_info:
             client.request("/users", "GET")
 
@@ -580,3 +644,1808 @@ async def test_async_respects_max_retries(mock_sleep):
         with pytest.raises(APIResponseError):
             await client.request("blocks/test", "GET")
         assert client.client.send.call_count == 4  # 1 initial + 3 retries
+
+
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_disabled_by_default(mock_sleep):
+    client = Client()
+    with patch.object(client.client, "send", return_value=success_response()):
+        for _ in range(10):
+            client.request("blocks/test", "GET")
+    mock_sleep.assert_not_called()
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_delays_requests_over_burst(mock_sleep, mock_monotonic):
+    client = Client(rate_limit=RateLimitOptions(requests_per_second=2, burst=2))
+    with patch.object(client.client, "send", return_value=success_response()):
+        for _ in range(4):
+            client.request("blocks/test", "GET")
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.0]
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_uses_defaults_when_true(mock_sleep, mock_monotonic):
+    client = Client(rate_limit=True)
+    with patch.object(client.client, "send", return_value=success_response()):
+        for _ in range(4):
+            client.request("blocks/test", "GET")
+    mock_sleep.assert_called_once()
+    assert mock_sleep.call_args[0][0] == pytest.approx(1 / 3)
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_keys_buckets_by_token(mock_sleep, mock_monotonic):
+    client = Client(auth="token_a", rate_limit=RateLimitOptions(burst=1))
+    with patch.object(client.client, "send", return_value=success_response()):
+        client.request("blocks/test", "GET")
+        client.request("blocks/test", "GET", auth="token_b")
+        client.request(
+            "oauth/token", "POST", auth={"client_id": "id", "client_secret": "s"}
+        )
+        mock_sleep.assert_not_called()
+
+        client.request("blocks/test", "GET")
+        mock_sleep.assert_called_once()
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_shares_bucket_when_not_per_token(mock_sleep, mock_monotonic):
+    client = Client(rate_limit=RateLimitOptions(burst=1, per_token=False))
+    with patch.object(client.client, "send", return_value=success_response()):
+        client.request("blocks/test", "GET", auth="token_a")
+        client.request("blocks/test", "GET", auth="token_b")
+    mock_sleep.assert_called_once()
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_rate_limiter_applies_to_retries(mock_sleep, mock_monotonic):
+    client = Client(
+        retry=RetryOptions(max_retries=1, initial_retry_delay_ms=0),
+        rate_limit=RateLimitOptions(requests_per_second=1, burst=1),
+    )
+    responses = [internal_server_error_response(), success_response()]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.request("blocks/test", "GET")
+    assert mock_sleep.call_args_list[-1].args[0] == 1.0
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("asyncio.sleep", return_value=None)
+async def test_async_rate_limiter_delays_requests_over_burst(
+    mock_sleep, mock_monotonic
+):
+    client = AsyncClient(rate_limit=RateLimitOptions(requests_per_second=2, burst=1))
+    with patch.object(client.client, "send", return_value=success_response()):
+        for _ in range(3):
+            await client.request("blocks/test", "GET")
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.0]
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_adaptive_concurrency_shrinks_on_rate_limit(mock_sleep):
+    client = AsyncClient(
+        adaptive_concurrency=AdaptiveConcurrencyOptions(initial_limit=8)
+    )
+    responses = [rate_limited_response(retry_after="1"), success_response()]
+    with patch.object(client.client, "send", side_effect=responses):
+        await client.request("blocks/test", "GET")
+    assert client._concurrency_limiter.limit == 4
+    assert client._concurrency_limiter.in_flight == 0
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_adaptive_concurrency_shrinks_on_retry_after(mock_sleep):
+    client = AsyncClient(adaptive_concurrency=True)
+    unavailable = _mock_http_response(
+        503, "service_unavailable", "Service unavailable", retry_after="1"
+    )
+    with patch.object(client.client, "send", side_effect=[unavailable]):
+        with pytest.raises(APIResponseError):
+            await client.request("pages", "POST")
+    assert client._concurrency_limiter.limit == 5
+
+
+async def test_async_adaptive_concurrency_ignores_other_errors():
+    client = AsyncClient(adaptive_concurrency=True)
+    with patch.object(client.client, "send", return_value=validation_error_response()):
+        with pytest.raises(APIResponseError):
+            await client.request("blocks/test", "GET")
+    assert client._concurrency_limiter.limit == 10
+
+
+async def test_async_adaptive_concurrency_releases_slot_on_timeout():
+    client = AsyncClient(adaptive_concurrency=True)
+    with patch.object(
+        client.client, "send", side_effect=httpx.TimeoutException("Timeout")
+    ):
+        from notion_client.errors import RequestTimeoutError
+
+        with pytest.raises(RequestTimeoutError):
+            await client.request("blocks/test", "GET")
+    assert client._concurrency_limiter.in_flight == 0
+
+
+async def test_async_adaptive_concurrency_grows_on_success():
+    client = AsyncClient(
+        adaptive_concurrency=AdaptiveConcurrencyOptions(initial_limit=1)
+    )
+    with patch.object(client.client, "send", return_value=success_response()):
+        await client.request("blocks/test", "GET")
+    assert client._concurrency_limiter.limit == 2
+
+
+async def test_async_adaptive_concurrency_wait_is_not_pool_wait():
+    client = AsyncClient(
+        adaptive_concurrency=AdaptiveConcurrencyOptions(initial_limit=1)
+    )
+
+    async def send(request):
+        await request.extensions["trace"]("http11.send_request_headers.started", {})
+        await asyncio.sleep(0.2)
+        return success_response()
+
+    with patch.object(client.client, "send", side_effect=send):
+        responses = await asyncio.gather(
+            client.request("blocks/test", "GET", raw=True),
+            client.request("blocks/test", "GET", raw=True),
+        )
+    assert [response.timings.pool_wait < 0.1 for response in responses] == [
+        True,
+        True,
+    ]
+
+
+async def test_async_adaptive_concurrency_ignores_invalid_json():
+    client = AsyncClient(adaptive_concurrency=True)
+    response = httpx.Response(
+        200,
+        content=b"not json",
+        request=httpx.Request("GET", "https://api.notion.com/v1/blocks/test"),
+    )
+    with patch.object(client.client, "send", return_value=response):
+        with pytest.raises(ValueError):
+            await client.request("blocks/test", "GET")
+    assert client._concurrency_limiter.limit == 10
+
+
+async def test_async_map_returns_results_in_order_with_errors():
+    client = AsyncClient()
+
+    async def function(item):
+        await asyncio.sleep(0.01 * (3 - item))
+        if item == 1:
+            raise ValueError("failed")
+        return item * 10
+
+    results = await client.map(function, range(4), max_concurrency=4)
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [20, 30]
+
+
+async def test_async_map_limits_concurrency():
+    client = AsyncClient()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def function(item):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return item
+
+    assert await client.map(function, range(20), max_concurrency=3) == list(range(20))
+    assert max_in_flight == 3
+
+
+async def test_async_map_calls_endpoints():
+    client = AsyncClient()
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "page"})
+    ):
+        results = await client.map(client.pages.retrieve, ["a", "b"])
+    assert results == [{"object": "page"}, {"object": "page"}]
+
+
+async def test_async_map_as_completed_yields_in_completion_order():
+    client = AsyncClient()
+
+    async def function(item):
+        await asyncio.sleep(0.01 * item)
+        return item
+
+    completed = [pair async for pair in client.map_as_completed(function, [3, 1, 2], 3)]
+    assert completed == [(1, 1), (2, 2), (0, 3)]
+
+
+async def test_async_map_as_completed_cancels_pending_calls_on_break():
+    client = AsyncClient()
+    cancelled = []
+
+    async def function(item):
+        try:
+            await asyncio.sleep(item)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    completed = client.map_as_completed(function, [0, 10, 10], 3)
+    assert await completed.__anext__() == (0, 0)
+    await completed.aclose()
+    await asyncio.sleep(0)
+    assert cancelled == [10, 10]
+
+
+async def test_async_map_rejects_invalid_concurrency():
+    client = AsyncClient()
+    with pytest.raises(ValueError):
+        await client.map(asyncio.sleep, [0], max_concurrency=0)
+
+
+async def test_async_gather():
+    client = AsyncClient()
+
+    async def fail():
+        raise ValueError("failed")
+
+    results = await client.gather(
+        asyncio.sleep(0, result="a"), fail(), max_concurrency=1
+    )
+    assert results[0] == "a"
+    assert isinstance(results[1], ValueError)
+
+
+def test_client_context_manager_is_shared_between_entries():
+    client = Client()
+    base_client = client.client
+
+    with client:
+        inner_client = client.client
+        assert inner_client is not base_client
+        with client:
+            assert client.client is inner_client
+        assert client.client is inner_client
+        assert not inner_client.is_closed
+
+    assert inner_client.is_closed
+    assert client.client is base_client
+
+
+def test_client_context_manager_across_threads():
+    client = Client()
+    entered = threading.Barrier(4)
+    inner_clients = []
+
+    def enter():
+        with client:
+            entered.wait()
+            inner_clients.append(client.client)
+            entered.wait()
+
+    threads = [threading.Thread(target=enter) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(map(id, inner_clients))) == 1
+    assert inner_clients[0].is_closed
+    assert client._clients == []
+
+
+async def test_async_client_context_manager_across_tasks():
+    client = AsyncClient()
+    entered = asyncio.Event()
+    inner_clients = []
+    aenter = httpx.AsyncClient.__aenter__
+
+    async def slow_aenter(self):
+        await asyncio.sleep(0.01)
+        return await aenter(self)
+
+    async def enter():
+        async with client:
+            inner_clients.append(client.client)
+            await entered.wait()
+
+    with patch.object(httpx.AsyncClient, "__aenter__", slow_aenter):
+        tasks = [asyncio.ensure_future(enter()) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        entered.set()
+        await asyncio.gather(*tasks)
+
+    assert len(set(map(id, inner_clients))) == 1
+    assert inner_clients[0].is_closed
+    assert (client._clients, client._entries) == ([], 0)
+
+
+async def test_async_client_context_manager_enter_failure():
+    client = AsyncClient()
+    with patch.object(
+        httpx.AsyncClient, "__aenter__", side_effect=RuntimeError("failed")
+    ):
+        with pytest.raises(RuntimeError):
+            async with client:
+                pass
+    assert (client._clients, client._entries) == ([], 0)
+
+    async with client:
+        assert client._entries == 1
+    assert client._clients == []
+
+
+def test_map_returns_results_in_order_with_errors():
+    client = Client()
+
+    def function(item):
+        time_module.sleep(0.01 * (3 - item))
+        if item == 1:
+            raise ValueError("failed")
+        return item * 10
+
+    results = client.map(function, range(4), max_workers=4)
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [20, 30]
+
+
+def test_map_limits_concurrency():
+    client = Client()
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def function(item):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time_module.sleep(0.001)
+        with lock:
+            in_flight -= 1
+        return item
+
+    assert client.map(function, range(30), max_workers=3) == list(range(30))
+    assert max_in_flight <= 3
+
+
+def test_map_shares_inner_client_between_threads():
+    client = Client()
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "page"})
+    ) as mock_send:
+        results = client.map(client.pages.retrieve, ["a", "b", "c"], max_workers=3)
+    assert results == [{"object": "page"}] * 3
+    assert mock_send.call_count == 3
+
+
+def test_map_as_completed_cancels_pending_calls_on_close():
+    client = Client()
+    calls = []
+
+    def function(item):
+        calls.append(item)
+        time_module.sleep(0.05)
+        return item
+
+    completed = client.map_as_completed(function, range(10), max_workers=1)
+    assert next(completed) == (0, 0)
+    completed.close()
+    assert calls in ([0], [0, 1])
+
+
+def test_map_rejects_invalid_max_workers():
+    with pytest.raises(ValueError):
+        Client().map(print, [1], max_workers=0)
+
+
+def test_client_creates_inner_client_lazily():
+    client = Client()
+    assert client._clients == []
+    assert isinstance(client.client, httpx.Client)
+    assert len(client._clients) == 1
+
+
+def test_client_uses_connection_options():
+    with patch("httpx.Client") as mock_client:
+        Client(
+            connection=ConnectionOptions(
+                max_connections=5,
+                max_keepalive_connections=2,
+                keepalive_expiry=1.0,
+                http2=True,
+            )
+        ).client
+
+    kwargs = mock_client.call_args.kwargs
+    assert kwargs["limits"] == httpx.Limits(
+        max_connections=5, max_keepalive_connections=2, keepalive_expiry=1.0
+    )
+    assert kwargs["http2"] is True
+
+
+def test_client_uses_transport_factory_in_context_manager():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"object": "list"})
+
+    client = Client(
+        connection=ConnectionOptions(
+            transport_factory=lambda: httpx.MockTransport(handler)
+        )
+    )
+    with client:
+        assert client.request("users", "GET") == {"object": "list"}
+    assert client.request("users", "GET") == {"object": "list"}
+    assert len(requests) == 2
+
+
+def test_client_reuses_user_supplied_client():
+    http_client = httpx.Client(headers={"X-Custom": "value"})
+    client = Client(client=http_client)
+
+    with client:
+        with client:
+            assert client.client is http_client
+    assert client.client is http_client
+    assert not http_client.is_closed
+    assert http_client.headers["X-Custom"] == "value"
+    assert http_client.headers["Notion-Version"] == client.options.notion_version
+
+
+async def test_async_client_uses_transport_factory_in_context_manager():
+    async def handler(request):
+        return httpx.Response(200, json={"object": "list"})
+
+    client = AsyncClient(
+        connection=ConnectionOptions(
+            transport_factory=lambda: httpx.MockTransport(handler)
+        )
+    )
+    async with client:
+        inner_client = client.client
+        async with client:
+            assert client.client is inner_client
+            assert await client.request("users", "GET") == {"object": "list"}
+    assert inner_client.is_closed
+    assert client._clients == []
+
+
+async def test_async_client_reuses_user_supplied_client():
+    http_client = httpx.AsyncClient()
+    client = AsyncClient(client=http_client)
+
+    async with client:
+        assert client.client is http_client
+    assert not http_client.is_closed
+    await http_client.aclose()
+
+
+def test_deduplicate_requests_disabled_by_default():
+    client = Client()
+    assert client._single_flight_key("GET", "pages/a", None, None) is None
+
+
+def test_deduplicate_requests_keys():
+    client = Client(auth="token", deduplicate_requests=True)
+    key = client._single_flight_key("GET", "pages/a", {"b": 1, "a": [2]}, None)
+    assert key == client._single_flight_key(
+        "GET", "pages/a", {"a": [2], "b": 1}, "token"
+    )
+    assert key != client._single_flight_key("GET", "pages/b", None, None)
+    assert key != client._single_flight_key("GET", "pages/a", None, "other")
+    assert client._single_flight_key("PATCH", "pages/a", None, None) is None
+
+
+def test_deduplicate_concurrent_requests():
+    client = Client(deduplicate_requests=True)
+    release = threading.Event()
+
+    def send(request):
+        release.wait()
+        return success_response({"object": "page"})
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(client.pages.retrieve("page"))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while not mock_send.called:
+            time_module.sleep(0.001)
+        time_module.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert mock_send.call_count == 1
+    assert results == [{"object": "page"}] * 5
+
+
+async def test_async_deduplicate_concurrent_requests():
+    client = AsyncClient(deduplicate_requests=True)
+
+    async def send(request):
+        await asyncio.sleep(0.01)
+        return success_response({"object": "page"})
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        results = await asyncio.gather(
+            client.pages.retrieve("page"),
+            client.pages.retrieve("page"),
+            client.users.retrieve("user"),
+        )
+        await client.pages.update("page")
+
+    assert mock_send.call_count == 3
+    assert results == [{"object": "page"}] * 3
+
+
+def page_response(request: httpx.Request, **kwargs: Any) -> httpx.Response:
+    return success_response({"object": "page", "id": request.url.path.split("/")[-1]})
+
+
+def test_cache_disabled_by_default():
+    assert Client().cache is None
+    cache = ResponseCache()
+    assert Client(cache=cache).cache is cache
+    assert isinstance(Client(cache=True).cache, ResponseCache)
+
+
+def test_cache_serves_retrieve_responses():
+    client = Client(cache=True)
+    page_id = "b55c9c91-384d-452b-81db-d1ef79372b75"
+    with patch.object(client.client, "send", side_effect=page_response) as mock_send:
+        page = client.pages.retrieve(page_id)
+        page["id"] = "mutated"
+        assert client.pages.retrieve(page_id) == {"object": "page", "id": page_id}
+        assert client.pages.retrieve(page_id.replace("-", "").upper())["id"] == page_id
+        assert mock_send.call_count == 1
+
+        client.pages.retrieve(page_id, filter_properties=["title"])
+        client.pages.retrieve(page_id, auth="other")
+        client.blocks.retrieve(page_id)
+        assert mock_send.call_count == 4
+
+        client.users.me()
+        client.users.me()
+        client.pages.properties.retrieve(page_id, "title")
+        client.pages.properties.retrieve(page_id, "title")
+        client.request(f"pages/{page_id}", "GET", raw=True)
+        client.request(f"pages/{page_id}", "GET", stream=True)
+        assert mock_send.call_count == 10
+    assert client.cache is not None and len(client.cache) == 4
+
+
+def test_cache_is_invalidated_by_mutations():
+    client = Client(cache=True)
+    with patch.object(client.client, "send", side_effect=page_response) as mock_send:
+        for mutate in (
+            lambda: client.pages.update("page"),
+            lambda: client.pages.move("page", parent={"page_id": "other"}),
+            lambda: client.blocks.delete("page"),
+            lambda: client.blocks.children.append("page", children=[]),
+        ):
+            client.pages.retrieve("page")
+            client.pages.retrieve("page")
+            mutate()
+        client.pages.retrieve("page")
+        assert mock_send.call_count == 9
+
+        client.data_sources.retrieve("ds")
+        client.data_sources.query("ds")
+        client.data_sources.retrieve("ds")
+        assert mock_send.call_count == 11
+
+    with patch.object(client.client, "send", return_value=validation_error_response()):
+        with pytest.raises(APIResponseError):
+            client.data_sources.update("ds")
+    assert client.cache is not None and len(client.cache) == 1  # the page
+
+
+def test_cache_with_deduplicated_requests_and_json_codec():
+    loads = Mock(side_effect=json.loads)
+    client = Client(
+        cache=True, deduplicate_requests=True, json_codec=JSONCodec(loads=loads)
+    )
+    with patch.object(client.client, "send", side_effect=page_response) as mock_send:
+        assert client.views.retrieve("view") == client.views.retrieve("view")
+    assert mock_send.call_count == 1
+    assert loads.call_count == 2
+
+
+async def test_async_cache():
+    client = AsyncClient(cache=True)
+    with patch.object(client.client, "send", side_effect=page_response) as mock_send:
+        assert await client.users.retrieve("user") == {"object": "page", "id": "user"}
+        await client.users.retrieve("user")
+        await client.databases.retrieve("db")
+        await client.databases.update("db", title=[])
+        await client.databases.retrieve("db")
+    assert mock_send.call_count == 4
+
+
+def schema_response(request: httpx.Request, **kwargs: Any) -> httpx.Response:
+    if request.method == "GET" and request.url.path == "/v1/data_sources/ds":
+        return success_response(
+            {
+                "object": "data_source",
+                "id": "ds",
+                "properties": {
+                    "Name": {"id": "title", "type": "title"},
+                    "Status": {"id": "a%3Bc", "type": "status"},
+                },
+            }
+        )
+    return success_response({"object": "list", "results": []})
+
+
+def test_properties_fill_filter_properties_in():
+    client = Client()
+    with patch.object(client.client, "send", side_effect=schema_response) as mock_send:
+        client.data_sources.query("ds", properties=["Status", "Name"], page_size=10)
+        client.data_sources.query("ds", properties=["Name"])
+        client.pages.retrieve("page", properties=["Status"], data_source_id="ds")
+
+    requests = [call.args[0] for call in mock_send.call_args_list]
+    assert [request.method for request in requests] == ["GET", "POST", "POST", "GET"]
+    assert requests[1].url.params.get_list("filter_properties") == ["a%3Bc", "title"]
+    assert json.loads(requests[1].content) == {"page_size": 10}
+    assert requests[2].url.params.get_list("filter_properties") == ["title"]
+    assert requests[3].url.path == "/v1/pages/page"
+    assert requests[3].url.params.get_list("filter_properties") == ["a%3Bc"]
+    assert len(client.schemas) == 1
+
+
+def test_properties_refresh_the_schema():
+    schemas = SchemaRegistry()
+    client = Client(schemas=schemas)
+    assert client.schemas is schemas
+    with patch.object(client.client, "send", side_effect=schema_response) as mock_send:
+        client.data_sources.query("ds", properties=["Name"])
+        with pytest.raises(ValueError, match="Unknown properties of data source ds"):
+            client.data_sources.query("ds", properties=["Renamed"])
+        assert mock_send.call_count == 3
+
+        client.data_sources.query("ds", properties=["Name"])
+        client.data_sources.update("ds", title=[])
+        client.data_sources.query("ds", properties=["Name"])
+        assert mock_send.call_count == 7
+
+    with pytest.raises(ValueError, match="data_source_id"):
+        client.pages.retrieve("page", properties=["Name"])
+
+
+def test_properties_are_exclusive_with_filter_properties():
+    client = Client()
+    with patch.object(client.client, "send") as mock_send:
+        with pytest.raises(ValueError, match="exclusive"):
+            client.data_sources.query(
+                "ds", properties=["Name"], filter_properties=["title"]
+            )
+        with pytest.raises(ValueError, match="exclusive"):
+            client.pages.retrieve(
+                "page",
+                properties=["Name"],
+                filter_properties=["title"],
+                data_source_id="ds",
+            )
+    mock_send.assert_not_called()
+
+
+@pytest.mark.parametrize("option", ["raw_responses", "stream_results"])
+def test_properties_decode_the_schema_with_raw_or_streamed_results(option):
+    client = Client(**{option: True})
+    with patch.object(client.client, "send", side_effect=schema_response) as mock_send:
+        results = client.data_sources.query("ds", properties=["Name"])
+    assert not isinstance(results, dict)
+    assert mock_send.call_args_list[0].kwargs == {}
+    request = mock_send.call_args.args[0]
+    assert request.url.params.get_list("filter_properties") == ["title"]
+
+
+async def test_async_properties_fill_filter_properties_in():
+    client = AsyncClient(raw_responses=True)
+    with patch.object(client.client, "send", side_effect=schema_response) as mock_send:
+        await client.data_sources.query("ds", properties=["Status"])
+        await client.data_sources.query("ds", properties=["Name"])
+    assert mock_send.call_count == 3
+    request = mock_send.call_args.args[0]
+    assert request.url.params.get_list("filter_properties") == ["title"]
+
+
+def make_hedging_client(**kwargs) -> AsyncClient:
+    client = AsyncClient(
+        hedging=HedgingOptions(min_delay_ms=10, min_samples=1, window=10), **kwargs
+    )
+    client._hedging_policy.record("blocks/{block_id}", 0.01)
+    return client
+
+
+async def test_async_hedging_sends_second_copy_of_slow_request():
+    client = make_hedging_client()
+    delays = [1.0, 0.0]
+
+    async def send(request):
+        await asyncio.sleep(delays.pop(0))
+        return success_response({"copy": len(delays)})
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        assert await client.request("blocks/test", "GET") == {"copy": 0}
+    assert mock_send.call_count == 2
+
+
+async def test_async_hedging_does_not_hedge_fast_requests():
+    client = make_hedging_client()
+    with patch.object(client.client, "send", return_value=success_response()) as send:
+        await client.request("blocks/test", "GET")
+        await client.request("blocks/test", "PATCH")
+    assert send.call_count == 2
+
+
+async def test_async_hedging_waits_for_latency_samples():
+    client = AsyncClient(hedging=True)
+
+    async def send(request):
+        await asyncio.sleep(0.02)
+        return success_response()
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        await client.request("blocks/test", "GET")
+    assert mock_send.call_count == 1
+    assert client._hedging_policy.delay("blocks/{block_id}") is None
+
+
+async def test_async_hedging_uses_other_copy_when_one_fails():
+    client = make_hedging_client(retry=False)
+    responses = [(1.0, success_response({"copy": 0})), (0.0, None)]
+
+    async def send(request):
+        delay, response = responses.pop(0)
+        await asyncio.sleep(delay)
+        if response is None:
+            return internal_server_error_response()
+        return response
+
+    with patch.object(client.client, "send", side_effect=send):
+        assert await client.request("blocks/test", "GET") == {"copy": 0}
+
+
+async def test_async_hedging_raises_first_error_when_all_copies_fail():
+    client = make_hedging_client(retry=False)
+    responses = [(0.05, validation_error_response()), (0.0, unauthorized_response())]
+
+    async def send(request):
+        delay, response = responses.pop(0)
+        await asyncio.sleep(delay)
+        return response
+
+    with patch.object(client.client, "send", side_effect=send):
+        with pytest.raises(APIResponseError) as error:
+            await client.request("blocks/test", "GET")
+    assert error.value.code == "validation_error"
+
+
+@pytest.mark.parametrize("burst, copies", [(2, 2), (1, 1)])
+async def test_async_hedging_is_charged_to_rate_limiter(burst, copies):
+    client = make_hedging_client(
+        rate_limit=RateLimitOptions(requests_per_second=0.001, burst=burst)
+    )
+
+    async def send(request):
+        await asyncio.sleep(0.05)
+        return success_response()
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        await client.request("blocks/test", "GET")
+    assert mock_send.call_count == copies
+    assert not client._rate_limiter.try_reserve(None)
+
+
+def test_circuit_breaker_disabled_by_default():
+    client = Client(retry=False)
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        for _ in range(10):
+            with pytest.raises(APIResponseError):
+                client.request("pages/test", "GET")
+    assert mock_send.call_count == 10
+
+
+@patch("time.sleep", return_value=None)
+def test_circuit_breaker_fails_fast_while_open(mock_sleep):
+    client = Client(
+        retry=RetryOptions(max_retries=5),
+        circuit_breaker=CircuitBreakerOptions(failure_threshold=3),
+    )
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        with pytest.raises(CircuitOpenError) as error:
+            client.request("pages/test", "GET")
+        assert mock_send.call_count == 3
+        assert error.value.family == "pages"
+        assert error.value.retry_after > 0
+
+        with pytest.raises(CircuitOpenError):
+            client.request("/pages/other", "GET")
+        assert mock_send.call_count == 3
+
+    with patch.object(client.client, "send", return_value=success_response()):
+        assert client.request("blocks/test", "GET") == {}
+
+
+@patch("time.sleep", return_value=None)
+def test_circuit_breaker_counts_timeouts_and_connection_errors(mock_sleep):
+    client = Client(retry=False, circuit_breaker=True)
+    errors = [httpx.ConnectError("refused"), httpx.ReadTimeout("timeout")] * 3
+    with patch.object(client.client, "send", side_effect=errors):
+        for _ in range(5):
+            with pytest.raises((httpx.ConnectError, RequestTimeoutError)):
+                client.request("search", "POST")
+        with pytest.raises(CircuitOpenError):
+            client.request("search", "POST")
+
+
+def test_circuit_breaker_ignores_client_errors():
+    client = Client(
+        retry=False, circuit_breaker=CircuitBreakerOptions(failure_threshold=2)
+    )
+    responses = [
+        internal_server_error_response(),
+        validation_error_response(),
+        internal_server_error_response(),
+        success_response(),
+    ]
+    with patch.object(client.client, "send", side_effect=responses):
+        for _ in range(3):
+            with pytest.raises(APIResponseError):
+                client.request("pages/test", "GET")
+        assert client.request("pages/test", "GET") == {}
+
+
+@patch("time.monotonic")
+def test_circuit_breaker_probes_after_recovery_timeout(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    client = Client(
+        retry=False,
+        circuit_breaker=CircuitBreakerOptions(
+            failure_threshold=1, recovery_timeout_ms=30_000
+        ),
+    )
+    with patch.object(
+        client.client, "send", return_value=service_unavailable_response()
+    ):
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "GET")
+        with pytest.raises(CircuitOpenError):
+            client.request("blocks/test", "GET")
+
+    mock_monotonic.return_value = 130.0
+    with patch.object(client.client, "send", return_value=success_response()):
+        assert client.request("blocks/test", "GET") == {}
+        assert client.request("blocks/test", "GET") == {}
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_circuit_breaker_fails_fast_while_open(mock_sleep):
+    client = AsyncClient(
+        retry=RetryOptions(max_retries=5),
+        circuit_breaker=CircuitBreakerOptions(failure_threshold=2),
+    )
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        with pytest.raises(CircuitOpenError):
+            await client.request("data_sources/test", "GET")
+    assert mock_send.call_count == 2
+
+    with patch.object(client.client, "send", return_value=success_response()):
+        assert await client.request("pages/test", "GET") == {}
+
+
+@patch("time.sleep", return_value=None)
+def test_deadline_skips_retry_that_would_overshoot(mock_sleep):
+    client = Client(
+        retry=RetryOptions(max_retries=5, initial_retry_delay_ms=1_000),
+        deadline_ms=500,
+    )
+    with patch.object(
+        client.client, "send", return_value=rate_limited_response(retry_after="1")
+    ) as mock_send:
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "GET")
+    assert mock_send.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_deadline_caps_attempt_timeout():
+    client = Client(timeout_ms=60_000)
+    with patch.object(client.client, "send", return_value=success_response()):
+        client.request("blocks/test", "GET", deadline_ms=2_000)
+        timeout = client.client.send.call_args.args[0].extensions["timeout"]
+        assert 0 < timeout["read"] <= 2.0
+
+        client.request("blocks/test", "GET")
+        timeout = client.client.send.call_args.args[0].extensions["timeout"]
+        assert timeout["read"] == 60.0
+
+    client = Client(timeout_ms=1_000, deadline_ms=60_000)
+    with patch.object(client.client, "send", return_value=success_response()):
+        client.request("blocks/test", "GET")
+        timeout = client.client.send.call_args.args[0].extensions["timeout"]
+        assert timeout["read"] == 1.0
+
+
+@patch("time.monotonic")
+def test_deadline_fails_when_expired_before_attempt(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    client = Client(retry=RetryOptions(max_retries=3), deadline_ms=10_000)
+
+    def send(request):
+        mock_monotonic.return_value += 4.0
+        return rate_limited_response(retry_after="1")
+
+    def oversleep(delay):
+        mock_monotonic.return_value += delay + 5.0
+
+    with patch("time.sleep", side_effect=oversleep):
+        with patch.object(client.client, "send", side_effect=send) as mock_send:
+            with pytest.raises(RequestTimeoutError):
+                client.request("blocks/test", "GET")
+    assert mock_send.call_count == 1
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_deadline_fails_when_rate_limiter_delay_overshoots(mock_sleep, mock_monotonic):
+    client = Client(
+        rate_limit=RateLimitOptions(requests_per_second=1, burst=1),
+        deadline_ms=500,
+    )
+    with patch.object(client.client, "send", return_value=success_response()):
+        client.request("blocks/test", "GET")
+        with pytest.raises(RequestTimeoutError):
+            client.request("blocks/test", "GET")
+    mock_sleep.assert_not_called()
+
+
+@patch("time.monotonic", return_value=100.0)
+@patch("time.sleep", return_value=None)
+def test_deadline_gives_back_rate_limiter_tokens(mock_sleep, mock_monotonic):
+    client = Client(
+        rate_limit=RateLimitOptions(requests_per_second=3, burst=3, per_token=False),
+        deadline_ms=500,
+    )
+
+    def call(_):
+        return client.request("blocks/test", "GET")
+
+    with patch.object(
+        client.client, "send", return_value=success_response()
+    ) as mock_send:
+        results = client.map(call, range(60), max_workers=60)
+        assert mock_send.call_count == 4
+        assert sum(isinstance(result, RequestTimeoutError) for result in results) == 56
+
+        # Rejected calls did not push the schedule back for the next ones.
+        mock_monotonic.return_value = 100.5
+        client.request("blocks/test", "GET")
+    assert mock_send.call_count == 5
+
+
+@patch("time.sleep", return_value=None)
+def test_context_deadline_applies_to_endpoints(mock_sleep):
+    client = Client(retry=RetryOptions(max_retries=5))
+    with patch.object(
+        client.client, "send", return_value=rate_limited_response(retry_after="2")
+    ) as mock_send:
+        with deadline(1_000):
+            with pytest.raises(APIResponseError):
+                client.pages.retrieve(page_id="test")
+    assert mock_send.call_count == 1
+
+    with patch.object(client.client, "send", return_value=success_response()):
+        with deadline(5_000):
+            client.request("blocks/test", "GET", deadline_ms=60_000)
+        timeout = client.client.send.call_args.args[0].extensions["timeout"]
+        assert timeout["read"] <= 5.0
+
+
+async def test_async_context_deadline_skips_retry():
+    client = AsyncClient(retry=RetryOptions(max_retries=5))
+    with patch.object(
+        client.client, "send", return_value=rate_limited_response(retry_after="2")
+    ) as mock_send:
+        with deadline(1_000):
+            with pytest.raises(APIResponseError):
+                await client.pages.retrieve(page_id="test")
+    assert mock_send.call_count == 1
+
+
+async def test_async_deadline_bounds_concurrency_limiter_wait():
+    client = AsyncClient(
+        adaptive_concurrency=AdaptiveConcurrencyOptions(initial_limit=1, max_limit=1)
+    )
+
+    async def send(request):
+        await asyncio.sleep(0.3)
+        return success_response()
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        slow = asyncio.ensure_future(client.request("blocks/test", "GET"))
+        await asyncio.sleep(0)
+        started_at = time_module.monotonic()
+        with pytest.raises(RequestTimeoutError):
+            await client.request("blocks/test", "GET", deadline_ms=100)
+        assert time_module.monotonic() - started_at < 0.25
+        await slow
+
+        slow = asyncio.ensure_future(client.request("blocks/test", "GET"))
+        await asyncio.sleep(0)
+        await client.request("blocks/test", "GET", deadline_ms=1_000)
+        await slow
+    assert mock_send.call_count == 3
+    # The timeout of the attempt excludes the wait for a slot.
+    timeout = mock_send.call_args.args[0].extensions["timeout"]
+    assert timeout["read"] < 0.8
+    assert client._concurrency_limiter.in_flight == 0
+
+
+async def test_async_deadline_rechecked_after_concurrency_limiter_wait():
+    client = AsyncClient(adaptive_concurrency=True)
+    with patch.object(
+        client, "_apply_deadline", side_effect=RequestTimeoutError()
+    ), patch.object(client.client, "send") as mock_send:
+        with pytest.raises(RequestTimeoutError):
+            await client._execute_single_request(
+                httpx.Request("GET", "https://api.notion.com/v1/blocks/test"),
+                "GET",
+                "blocks/test",
+                deadline=time_module.monotonic() + 1,
+            )
+    mock_send.assert_not_called()
+    assert client._concurrency_limiter.in_flight == 0
+
+
+def test_deadline_bounds_deduplicated_call_wait():
+    client = Client(deduplicate_requests=True)
+    release = threading.Event()
+
+    def send(request):
+        release.wait(5)
+        return success_response({"object": "page"})
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        leader = threading.Thread(target=lambda: client.request("pages/page", "GET"))
+        leader.start()
+        while not mock_send.called:
+            time_module.sleep(0.001)
+        with pytest.raises(RequestTimeoutError):
+            client.request("pages/page", "GET", deadline_ms=50)
+        release.set()
+        leader.join()
+    assert mock_send.call_count == 1
+
+
+async def test_async_deadline_bounds_deduplicated_call_wait():
+    client = AsyncClient(deduplicate_requests=True)
+
+    async def send(request):
+        await asyncio.sleep(0.3)
+        return success_response({"object": "page"})
+
+    with patch.object(client.client, "send", side_effect=send) as mock_send:
+        leader = asyncio.ensure_future(client.request("pages/page", "GET"))
+        await asyncio.sleep(0)
+        with pytest.raises(RequestTimeoutError):
+            await client.request("pages/page", "GET", deadline_ms=50)
+        assert await leader == {"object": "page"}
+    assert mock_send.call_count == 1
+
+
+@patch("time.sleep", return_value=None)
+def test_retry_budget_limits_retries(mock_sleep):
+    client = Client(
+        retry=RetryOptions(max_retries=3, budget_ratio=0.0, budget_min_retries=2)
+    )
+    with patch.object(
+        client.client, "send", return_value=rate_limited_response()
+    ) as mock_send:
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "GET")
+        assert mock_send.call_count == 3
+
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "GET")
+        assert mock_send.call_count == 4
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_retry_budget_limits_retries(mock_sleep):
+    client = AsyncClient(
+        retry=RetryOptions(max_retries=3, budget_ratio=0.5, budget_min_retries=0)
+    )
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        for _ in range(2):
+            with pytest.raises(APIResponseError):
+                await client.request("blocks/test", "GET")
+    assert mock_send.call_count == 3
+
+
+@patch("time.sleep", return_value=None)
+def test_retries_read_only_post_endpoints_on_server_error(mock_sleep):
+    client = Client(retry=RetryOptions(max_retries=2))
+    calls = [
+        lambda: client.search(query="test"),
+        lambda: client.data_sources.query(data_source_id="test"),
+        lambda: client.blocks.meeting_notes.query(),
+        lambda: client.views.queries.create(view_id="test"),
+        lambda: client.oauth.introspect(client_id="id", client_secret="secret"),
+    ]
+    for call in calls:
+        responses = [service_unavailable_response(), success_response()]
+        with patch.object(client.client, "send", side_effect=responses) as mock_send:
+            assert call() == {}
+        assert mock_send.call_count == 2
+
+
+@patch("time.sleep", return_value=None)
+def test_does_not_retry_mutating_post_endpoints_on_server_error(mock_sleep):
+    client = Client(retry=RetryOptions(max_retries=2))
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        with pytest.raises(APIResponseError):
+            client.pages.create(parent={"page_id": "test"})
+    assert mock_send.call_count == 1
+
+
+@patch("time.sleep", return_value=None)
+def test_request_idempotent_overrides_method(mock_sleep):
+    client = Client(retry=RetryOptions(max_retries=2))
+    responses = [internal_server_error_response(), success_response()]
+    with patch.object(client.client, "send", side_effect=responses):
+        assert client.request("custom", "POST", idempotent=True) == {}
+
+    with patch.object(
+        client.client, "send", return_value=internal_server_error_response()
+    ) as mock_send:
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "DELETE", idempotent=False)
+    assert mock_send.call_count == 1
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_retries_read_only_post_endpoints_on_server_error(mock_sleep):
+    client = AsyncClient(retry=RetryOptions(max_retries=2))
+    responses = [internal_server_error_response(), success_response()]
+    with patch.object(client.client, "send", side_effect=responses) as mock_send:
+        assert await client.search(query="test") == {}
+    assert mock_send.call_count == 2
+
+
+def test_json_codec_encodes_request_body():
+    dumps = Mock(side_effect=lambda body: json.dumps(body).encode())
+    client = Client(json_codec=JSONCodec(dumps=dumps))
+
+    request = client._build_request("POST", "search", body={"query": "été"})
+    dumps.assert_called_once_with({"query": "été"})
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content) == {"query": "été"}
+
+    request = client._build_request("GET", "users", query={"page_size": 10})
+    assert dumps.call_count == 1
+    assert request.content == b""
+    assert request.url.params["page_size"] == "10"
+
+
+def test_json_codec_decodes_response_body():
+    loads = Mock(side_effect=json.loads)
+    client = Client(json_codec=JSONCodec(loads=loads))
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "list"})
+    ):
+        assert client.request("blocks/test", "GET") == {"object": "list"}
+    loads.assert_called_once_with(b'{"object": "list"}')
+
+    with patch.object(client.client, "send", return_value=validation_error_response()):
+        with pytest.raises(APIResponseError):
+            client.request("blocks/test", "GET")
+    assert loads.call_count == 1
+
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "list"})
+    ):
+        raw = client.request("blocks/test", "GET", raw=True)
+    assert loads.call_count == 1
+    assert raw.json() == {"object": "list"}
+    assert loads.call_count == 2
+
+
+def test_json_codec_is_not_used_for_form_data():
+    dumps = Mock()
+    client = Client(json_codec=JSONCodec(dumps=dumps))
+    request = client._build_request(
+        "POST", "file_uploads/test/send", form_data={"part_number": 1}
+    )
+    dumps.assert_not_called()
+    assert request.content == b"part_number=1"
+
+
+async def test_async_json_codec():
+    client = AsyncClient(json_codec=JSONCodec(dumps=lambda body: json.dumps(body)))
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "list"})
+    ) as mock_send:
+        assert await client.search(query="test") == {"object": "list"}
+    assert json.loads(mock_send.call_args.args[0].content) == {"query": "test"}
+
+
+def test_compress_requests_gzips_large_bodies():
+    client = Client(compress_requests=CompressionOptions(min_bytes=100))
+    body = {"children": [{"paragraph": {"text": "été"}}] * 20}
+
+    request = client._build_request("PATCH", "blocks/test/children", body=body)
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(request.content)) == body
+    assert len(request.content) < len(json.dumps(body))
+
+    request = client._build_request("POST", "search", body={"query": "été"})
+    assert "Content-Encoding" not in request.headers
+    assert request.content == '{"query":"été"}'.encode()
+
+    request = client._build_request("GET", "users")
+    assert "Content-Encoding" not in request.headers
+    assert client._compression == CompressionOptions(min_bytes=100)
+    assert Client(compress_requests=True)._compression == CompressionOptions()
+    assert Client()._compression is None
+
+
+def test_compress_requests_with_json_codec():
+    client = Client(
+        compress_requests=CompressionOptions(min_bytes=0),
+        json_codec=JSONCodec(dumps=lambda body: json.dumps(body)),
+    )
+    request = client._build_request("POST", "search", body={"query": "test"})
+    assert json.loads(gzip.decompress(request.content)) == {"query": "test"}
+
+
+def test_compress_requests_reports_body_sizes():
+    events: Dict[str, Any] = {}
+    client = Client(compress_requests=CompressionOptions(min_bytes=0))
+    client.hooks.add("on_request", lambda event: events.update(request=event))
+    client.hooks.add("on_response", lambda event: events.update(response=event))
+    response = httpx.Response(
+        200,
+        content=gzip.compress(b'{"object": "list"}'),
+        headers={"Content-Encoding": "gzip"},
+        request=httpx.Request("GET", "https://api.notion.com/v1/search"),
+    )
+    with patch.object(client.client, "send", return_value=response) as mock_send:
+        client.search(query="test")
+
+    sent = mock_send.call_args.args[0]
+    assert events["request"].request_bytes == len(b'{"query":"test"}')
+    assert events["request"].request_wire_bytes == len(sent.content)
+    assert events["response"].response_bytes == len(b'{"object": "list"}')
+    assert events["response"].response_wire_bytes == response.num_bytes_downloaded
+
+
+def test_compress_requests_falls_back_when_rejected(caplog):
+    client = Client(compress_requests=CompressionOptions(min_bytes=0))
+    responses = [
+        _mock_http_response(415, "unsupported_media_type", "Unsupported"),
+        success_response(),
+    ]
+    with patch.object(client.client, "send", side_effect=responses) as mock_send:
+        with caplog.at_level(logging.WARNING, logger="notion_client"):
+            assert client.search(query="test") == {}
+
+    first, second = (call.args[0] for call in mock_send.call_args_list)
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in second.headers
+    assert client._compression is None
+    assert "compressed request body rejected" in caplog.text
+
+    with patch.object(
+        client.client,
+        "send",
+        return_value=_mock_http_response(415, "unsupported_media_type", "No"),
+    ) as mock_send:
+        with pytest.raises(UnknownHTTPResponseError):
+            client.search(query="test")
+    assert mock_send.call_count == 1
+
+
+@pytest.mark.parametrize("code", ["invalid_json", "validation_error"])
+def test_compress_requests_falls_back_when_body_is_not_decompressed(code):
+    client = Client(compress_requests=CompressionOptions(min_bytes=0))
+    with patch.object(client.client, "send", return_value=unauthorized_response()):
+        with pytest.raises(APIResponseError):
+            client.search(query="test")
+    assert client._compression is not None
+
+    responses = [
+        _mock_http_response(400, code, "Error parsing JSON body."),
+        success_response({"object": "list"}),
+    ]
+    with patch.object(client.client, "send", side_effect=responses) as mock_send:
+        assert client.search(query="test") == {"object": "list"}
+
+    first, second = (call.args[0] for call in mock_send.call_args_list)
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in second.headers
+    assert json.loads(second.content) == {"query": "test"}
+    assert client._compression is None
+
+    with patch.object(
+        client.client,
+        "send",
+        return_value=_mock_http_response(400, code, "Still invalid"),
+    ) as mock_send:
+        with pytest.raises(APIResponseError):
+            client.search(query="test")
+    assert mock_send.call_count == 1
+
+
+async def test_async_compress_requests_falls_back_when_rejected():
+    client = AsyncClient(compress_requests=True)
+    client._compression = CompressionOptions(min_bytes=0)
+    responses = [
+        _mock_http_response(415, "unsupported_media_type", "Unsupported"),
+        success_response({"object": "list"}),
+    ]
+    with patch.object(client.client, "send", side_effect=responses) as mock_send:
+        assert await client.search(query="test") == {"object": "list"}
+    assert mock_send.call_count == 2
+    assert client._compression is None
+
+
+def test_raw_response_returns_undecoded_body():
+    client = Client()
+    body = {"object": "list", "results": [], "request_id": "abc-123"}
+    response = success_response(body)
+    with patch.object(client.client, "send", return_value=response) as mock_send:
+        raw = client.request("blocks/test/children", "GET", raw=True)
+        assert "trace" in mock_send.call_args.args[0].extensions
+        assert client.request("blocks/test/children", "GET") == body
+        # Timings are only recorded when someone can read them.
+        assert "trace" not in mock_send.call_args.args[0].extensions
+
+    assert isinstance(raw, RawResponse)
+    assert raw.content == response.content
+    assert raw.status == 200
+    assert raw.headers["content-length"] == str(len(response.content))
+    assert raw.request_id == "abc-123"
+    assert raw.timings.decode >= 0
+    assert raw.json() == body
+
+
+def test_raw_response_without_trailing_request_id():
+    client = Client(raw_responses=True)
+    body = {"request_id": "abc-123", "results": []}
+    with patch.object(client.client, "send", return_value=success_response(body)):
+        raw = client.data_sources.query(data_source_id="test")
+        assert raw.request_id is None
+        assert client.request("search", "POST", raw=False) == body
+
+
+def test_raw_response_still_raises_errors():
+    client = Client(raw_responses=True, retry=False)
+    with patch.object(client.client, "send", return_value=validation_error_response()):
+        with pytest.raises(APIResponseError) as error:
+            client.blocks.children.list(block_id="test")
+    assert error.value.code == "validation_error"
+
+
+def test_deduplicate_requests_keys_raw_separately():
+    client = Client(deduplicate_requests=True)
+    assert client._single_flight_key(
+        "GET", "pages/a", None, None, raw=True
+    ) != client._single_flight_key("GET", "pages/a", None, None)
+
+
+async def test_async_raw_response():
+    client = AsyncClient(raw_responses=True)
+    with patch.object(
+        client.client, "send", return_value=success_response({"object": "list"})
+    ) as mock_send:
+        raw = await client.data_sources.query(data_source_id="test")
+    assert isinstance(raw, RawResponse)
+    assert raw.json() == {"object": "list"}
+    assert raw.timings.decode >= 0
+    trace = mock_send.call_args.args[0].extensions["trace"]
+    assert inspect.iscoroutinefunction(trace)
+
+
+async def test_async_hedging_returns_raw_response():
+    client = make_hedging_client(raw_responses=True)
+
+    async def send(request):
+        await asyncio.sleep(0.05)
+        return success_response({"object": "block"})
+
+    with patch.object(client.client, "send", side_effect=send):
+        raw = await client.request("blocks/test", "GET")
+    assert raw.json() == {"object": "block"}
+
+
+def streamed_response(*chunks: bytes, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(
+        status_code=status_code,
+        content=iter(chunks),
+        request=httpx.Request("POST", "https://api.notion.com/v1/search"),
+    )
+
+
+def async_streamed_response(*chunks: bytes, status_code: int = 200) -> httpx.Response:
+    async def content():
+        for chunk in chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    return httpx.Response(
+        status_code=status_code,
+        content=content(),
+        request=httpx.Request("POST", "https://api.notion.com/v1/search"),
+    )
+
+
+def test_stream_results():
+    client = Client(stream_results=True)
+    response = streamed_response(
+        b'{"object": "list", "results": [{"id": "a"},',
+        b' {"id": "b"}], "next_cursor": null, "has_more": false}',
+    )
+    with patch.object(client.client, "send", return_value=response) as mock_send:
+        streamed = client.search(query="test")
+
+    assert mock_send.call_args.kwargs == {"stream": True}
+    assert isinstance(streamed, StreamedResponse)
+    assert list(streamed) == [{"id": "a"}, {"id": "b"}]
+    assert streamed.body == {"object": "list", "next_cursor": None, "has_more": False}
+    assert response.is_closed
+
+
+def test_stream_is_per_request_and_ignored_in_raw_mode():
+    client = Client()
+    with patch.object(
+        client.client, "send", side_effect=lambda *args, **kwargs: success_response()
+    ) as mock_send:
+        assert client.request("search", "POST") == {}
+        assert isinstance(client.request("search", "POST", raw=True), RawResponse)
+        assert isinstance(
+            client.request("search", "POST", stream=True), StreamedResponse
+        )
+    assert [call.kwargs for call in mock_send.call_args_list] == [
+        {},
+        {},
+        {"stream": True},
+    ]
+
+
+def test_stream_results_only_applies_to_list_endpoints():
+    client = Client(stream_results=True)
+    with patch.object(
+        client.client,
+        "send",
+        side_effect=lambda *args, **kwargs: success_response({"object": "page"}),
+    ) as mock_send:
+        assert client.pages.retrieve("page") == {"object": "page"}
+        assert client.pages.update("page", archived=True) == {"object": "page"}
+        assert client.pages.create(parent={"page_id": "page"}) == {"object": "page"}
+        assert isinstance(client.blocks.children.list("page"), StreamedResponse)
+        assert isinstance(client.data_sources.query("ds"), StreamedResponse)
+    assert [call.kwargs for call in mock_send.call_args_list] == [
+        {},
+        {},
+        {},
+        {"stream": True},
+        {"stream": True},
+    ]
+
+
+def test_stream_results_still_raises_errors():
+    client = Client(stream_results=True, retry=False)
+    response = streamed_response(
+        b'{"object": "error", "code": "validation_error",',
+        b' "message": "Validation failed"}',
+        status_code=400,
+    )
+    with patch.object(client.client, "send", return_value=response):
+        with pytest.raises(APIResponseError) as error:
+            client.search(query="test")
+    assert error.value.code == "validation_error"
+
+
+def test_stream_results_timeout_while_reading():
+    client = Client(stream_results=True)
+
+    def content():
+        yield b'{"results": [{"id": "a"},'
+        raise httpx.ReadTimeout("timed out")
+
+    response = httpx.Response(200, content=content())
+    with patch.object(client.client, "send", return_value=response):
+        streamed = client.search(query="test")
+    with pytest.raises(RequestTimeoutError):
+        list(streamed)
+    assert response.is_closed
+
+
+def test_iterate_paginated_api_with_streamed_responses():
+    client = Client(stream_results=True)
+    responses = [
+        streamed_response(b'{"results": [1, 2], "next_cursor": "c", "has_more": true}'),
+        streamed_response(b'{"results": [3], "next_cursor": null, "has_more": false}'),
+    ]
+    with patch.object(client.client, "send", side_effect=responses) as mock_send:
+        results = list(iterate_paginated_api(client.search, query="test"))
+    assert results == [1, 2, 3]
+    assert json.loads(mock_send.call_args.args[0].content)["start_cursor"] == "c"
+
+
+async def test_async_stream_results():
+    client = AsyncClient(
+        stream_results=True,
+        adaptive_concurrency=AdaptiveConcurrencyOptions(initial_limit=1),
+    )
+    response = async_streamed_response(
+        b'{"object": "list", "results": [{"id": "a"},',
+        b' {"id": "b"}], "has_more": false}',
+    )
+    with patch.object(client.client, "send", return_value=response):
+        streamed = await client.search(query="test")
+
+    assert isinstance(streamed, AsyncStreamedResponse)
+    assert [item async for item in streamed] == [{"id": "a"}, {"id": "b"}]
+    assert streamed.body == {"object": "list", "has_more": False}
+    assert response.is_closed
+
+
+async def test_async_stream_results_still_raises_errors():
+    client = AsyncClient(stream_results=True, retry=False)
+    response = async_streamed_response(
+        b'{"object": "error", "code": "validation_error", "message": "Invalid"}',
+        status_code=400,
+    )
+    with patch.object(client.client, "send", return_value=response):
+        with pytest.raises(APIResponseError):
+            await client.search(query="test")
+
+
+async def test_async_stream_results_timeout_while_reading():
+    client = AsyncClient(stream_results=True)
+    response = async_streamed_response(
+        b'{"results": [{"id": "a"},', httpx.ReadTimeout("timed out")
+    )
+    with patch.object(client.client, "send", return_value=response):
+        streamed = await client.search(query="test")
+    with pytest.raises(RequestTimeoutError):
+        [item async for item in streamed]
+    assert response.is_closed
+
+
+async def test_async_stream_results_are_not_hedged():
+    client = make_hedging_client(stream_results=True)
+    response = async_streamed_response(b'{"results": [], "has_more": false}')
+    with patch.object(client.client, "send", return_value=response) as mock_send:
+        streamed = await client.request("blocks/test/children", "GET")
+    assert [item async for item in streamed] == []
+    assert mock_send.call_count == 1
+
+
+async def test_async_iterate_paginated_api_with_streamed_responses():
+    client = AsyncClient(stream_results=True)
+    responses = [
+        async_streamed_response(
+            b'{"results": [1], "next_cursor": "c", "has_more": true}'
+        ),
+        async_streamed_response(
+            b'{"results": [2], "next_cursor": null, "has_more": false}'
+        ),
+    ]
+    with patch.object(client.client, "send", side_effect=responses):
+        results = [
+            result async for result in async_iterate_paginated_api(client.search)
+        ]
+    assert results == [1, 2]
+
+
+def record_hooks(client) -> Dict[str, list]:
+    events: Dict[str, list] = {}
+    for name in (
+        "on_request",
+        "on_response",
+        "on_retry",
+        "on_rate_limited",
+        "on_error",
+    ):
+        events[name] = []
+        client.hooks.add(name, events[name].append)
+    return events
+
+
+def test_hooks_success_events():
+    client = Client()
+    events = record_hooks(client)
+    response = success_response({"object": "page", "request_id": "req"})
+    with patch.object(client.client, "send", return_value=response):
+        client.pages.update(page_id="abc", archived=True)
+
+    (request,) = events["on_request"]
+    assert (request.method, request.path, request.endpoint) == (
+        "PATCH",
+        "pages/abc",
+        "pages/{page_id}",
+    )
+    assert request.url == "https://api.notion.com/v1/pages/abc"
+    assert request.request_bytes == len(b'{"archived":true}')
+
+    (success,) = events["on_response"]
+    assert success.status == 200
+    assert success.request_id == "req"
+    assert success.response_bytes == len(response.content)
+    assert success.elapsed >= 0
+    assert success.timings.decode >= 0
+    assert success.timings.ttfb is None  # not observed with a mocked send
+    assert not events["on_error"] and not events["on_retry"]
+
+
+@patch("time.sleep", return_value=None)
+def test_hooks_retry_events(mock_sleep):
+    client = Client(retry=RetryOptions(max_retries=1))
+    events = record_hooks(client)
+    responses = [rate_limited_response(retry_after="2"), success_response()]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.request("blocks/abc", "GET")
+
+    assert [event.attempt for event in events["on_request"]] == [0, 1]
+    (error,) = events["on_error"]
+    assert error.status == 429
+    assert error.elapsed >= 0
+    (retry,) = events["on_retry"]
+    assert (retry.attempt, retry.delay, retry.error) == (1, 2.0, error.error)
+    (rate_limited,) = events["on_rate_limited"]
+    assert rate_limited.delay == 2.0
+    assert events["on_response"][0].attempt == 1
+
+
+@patch("time.sleep", return_value=None)
+def test_hooks_events_for_rate_limiter_and_server_errors(mock_sleep):
+    client = Client(rate_limit=RateLimitOptions(burst=1))
+    events = record_hooks(client)
+    responses = [internal_server_error_response(), success_response()]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.request("blocks/abc", "GET")
+
+    (rate_limited,) = events["on_rate_limited"]
+    assert rate_limited.error is None
+    assert rate_limited.delay > 0
+    assert len(events["on_retry"]) == 1
+
+
+def test_hooks_error_events_for_other_errors():
+    client = Client()
+    events = record_hooks(client)
+    with patch.object(client.client, "send", side_effect=ValueError("unexpected")):
+        with pytest.raises(ValueError):
+            client.request("blocks/abc", "GET")
+    (error,) = events["on_error"]
+    assert error.status is None
+    assert isinstance(error.error, ValueError)
+
+
+def test_hooks_streamed_response_event():
+    client = Client(stream_results=True)
+    events = record_hooks(client)
+    with patch.object(
+        client.client, "send", return_value=streamed_response(b'{"results": []}')
+    ):
+        list(client.search())
+    (success,) = events["on_response"]
+    assert success.status == 200
+    assert success.response_bytes is None
+    assert success.timings.decode is None
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_hooks_events(mock_sleep):
+    client = AsyncClient(rate_limit=RateLimitOptions(burst=1))
+    events = record_hooks(client)
+    responses = [
+        rate_limited_response(),
+        success_response({"results": []}),
+        async_streamed_response(b'{"results": []}'),
+    ]
+    with patch.object(client.client, "send", side_effect=responses):
+        await client.request("blocks/abc", "GET")
+        async for _ in await client.request("search", "POST", stream=True):
+            pass
+
+    assert [event.endpoint for event in events["on_request"]] == [
+        "blocks/{block_id}",
+        "blocks/{block_id}",
+        "search",
+    ]
+    assert [event.status for event in events["on_error"]] == [429]
+    assert len(events["on_retry"]) == 1
+    assert [event.error is None for event in events["on_rate_limited"]] == [
+        False,
+        True,
+        True,
+    ]
+    assert [event.response_bytes for event in events["on_response"]] == [
+        len(b'{"results": []}'),
+        None,
+    ]
+    assert [event.timings.decode is None for event in events["on_response"]] == [
+        False,
+        True,
+    ]
+
+
+async def test_async_hedging_events():
+    client = make_hedging_client(metrics=True)
+    events = record_hooks(client)
+    delays = [1.0, 0.0]
+
+    async def send(request):
+        await asyncio.sleep(delays.pop(0))
+        return success_response({"object": "block"})
+
+    with patch.object(client.client, "send", side_effect=send):
+        await client.request("blocks/test", "GET")
+    assert [event.hedged for event in events["on_request"]] == [False, True]
+    assert len(events["on_response"]) == 1
+    blocks = client.metrics.snapshot()["endpoints"]["GET blocks/{block_id}"]
+    assert blocks["hedges"] == 1
+    assert blocks["responses"] == {"200": 1}
+
+
+@patch("time.sleep", return_value=None)
+def test_metrics(mock_sleep):
+    client = Client(metrics=True)
+    responses = [rate_limited_response(retry_after="1"), success_response({})]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.pages.retrieve(page_id="abc")
+
+    snapshot = client.metrics.snapshot()
+    page = snapshot["endpoints"]["GET pages/{page_id}"]
+    assert page["responses"] == {"429": 1, "200": 1}
+    assert page["retries"] == 1
+    assert page["latency"]["count"] == 2
+    assert page["decode_seconds"] >= 0
+    assert snapshot["rate_limit_wait_seconds"]["server"] == 1.0
+    assert Client().metrics is None
+
+
+async def test_async_metrics_shared_between_clients():
+    collector = MetricsCollector()
+    clients = [AsyncClient(metrics=collector), AsyncClient(metrics=collector)]
+    for client in clients:
+        with patch.object(client.client, "send", return_value=success_response()):
+            await client.search()
+    assert clients[0].metrics is collector
+    assert collector.snapshot()["endpoints"]["POST search"]["responses"] == {"200": 2}
@@ -0,0 +1,35 @@
+import asyncio
+from unittest.mock import patch
+
+from notion_client.deadlines import current_deadline, deadline
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_deadline_is_scoped_to_block(mock_monotonic):
+    assert current_deadline() is None
+    with deadline(5_000):
+        assert current_deadline() == 105.0
+    assert current_deadline() is None
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_nested_deadline_cannot_extend_outer_one(mock_monotonic):
+    with deadline(5_000):
+        with deadline(10_000):
+            assert current_deadline() == 105.0
+        with deadline(1_000):
+            assert current_deadline() == 101.0
+        assert current_deadline() == 105.0
+
+
+async def test_deadline_is_inherited_by_tasks_only():
+    async def get_deadline():
+        return current_deadline()
+
+    with deadline(5_000):
+        expected = current_deadline()
+        task = asyncio.ensure_future(get_deadline())
+    other_task = asyncio.ensure_future(get_deadline())
+
+    assert await task == expected
+    assert await other_task is None
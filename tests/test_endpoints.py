@@ -76,6 +76,7 @@ def test_blocks_meeting_notes_query(client, mocker):
         path="blocks/meeting_notes/query",
         method="POST",
         body={},
+        idempotent=True,
         auth=None,
     )
 
@@ -9,6 +9,7 @@ from notion_client.errors import (
     is_notion_client_error,
     RequestTimeoutError,
     InvalidPathParameterError,
+    CircuitOpenError,
     validate_request_path,
     HTTPResponseError,
     is_http_response_error,
@@ -173,6 +174,20 @@ def test_request_timeout_error_static_method():
     assert not RequestTimeoutError.is_request_timeout_error("error")
 
 
+def test_circuit_open_error():
+    error = CircuitOpenError("pages", 12.34)
+    assert error.code == ClientErrorCode.CircuitOpen
+    assert error.family == "pages"
+    assert error.retry_after == 12.34
+    assert '"pages"' in str(error) and "12.3 seconds" in str(error)
+    assert is_notion_client_error(error)
+    assert not is_http_response_error(error)
+
+    assert CircuitOpenError.is_circuit_open_error(error)
+    assert not CircuitOpenError.is_circuit_open_error(RequestTimeoutError())
+    assert not CircuitOpenError.is_circuit_open_error(None)
+
+
 def test_unknown_http_response_error_static_method():
     """Test UnknownHTTPResponseError.is_unknown_http_response_error static method."""
     unknown_error = UnknownHTTPResponseError(status=500)
@@ -0,0 +1,40 @@
+import pytest
+
+from notion_client.hedging import HedgingPolicy
+
+
+def make_policy(**kwargs) -> HedgingPolicy:
+    options = {"percentile": 90, "min_delay_ms": 10, "min_samples": 5, "window": 10}
+    options.update(kwargs)
+    return HedgingPolicy(**options)
+
+
+def test_hedging_policy_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        make_policy(percentile=100)
+    with pytest.raises(ValueError):
+        make_policy(min_samples=0)
+    with pytest.raises(ValueError):
+        make_policy(min_samples=20)
+
+
+def test_hedging_policy_waits_for_enough_samples():
+    policy = make_policy()
+    assert policy.delay("pages/{page_id}") is None
+    for _ in range(4):
+        policy.record("pages/{page_id}", 1.0)
+    assert policy.delay("pages/{page_id}") is None
+    policy.record("pages/{page_id}", 1.0)
+    assert policy.delay("pages/{page_id}") == 1.0
+
+
+def test_hedging_policy_uses_percentile_of_recent_latencies():
+    policy = make_policy()
+    for latency in range(1, 11):
+        policy.record("blocks/{block_id}", latency / 100)
+    assert policy.delay("blocks/{block_id}") == 0.09
+
+    for _ in range(10):
+        policy.record("blocks/{block_id}", 0.001)
+    assert policy.delay("blocks/{block_id}") == 0.01
+    assert policy.delay("pages/{page_id}") is None
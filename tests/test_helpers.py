@@ -27,6 +27,7 @@ from notion_client.helpers import (
     is_text_rich_text_item_response,
     iterate_data_source_templates,
     iterate_paginated_api,
+    path_template,
     pick,
 )
 
@@ -546,3 +547,19 @@ async def test_async_collect_data_source_templates(
     )
 
     assert isinstance(templates, list)
+
+
+def test_path_template():
+    assert path_template("pages/abc") == "pages/{page_id}"
+    assert path_template("/blocks/abc/children") == "blocks/{block_id}/children"
+    assert (
+        path_template("data_sources/abc/query") == "data_sources/{data_source_id}/query"
+    )
+    assert path_template("views/a/queries/b") == "views/{view_id}/queries/{query_id}"
+    assert (
+        path_template("pages/a/properties/%3Ab")
+        == "pages/{page_id}/properties/{property_id}"
+    )
+    assert path_template("users/me") == "users/me"
+    assert path_template("search") == "search"
+    assert path_template("abc") == "{object_id}"
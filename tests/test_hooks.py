@@ -0,0 +1,130 @@
+import logging
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from notion_client.errors import APIResponseError, ClientErrorCode, RequestTimeoutError
+from notion_client.hooks import Hooks, RequestEvent
+from notion_client.logging import LoggingSubscriber
+
+
+def make_event(**kwargs) -> RequestEvent:
+    return RequestEvent("GET", "pages/abc", "pages/{page_id}", 0, **kwargs)
+
+
+def test_hooks_add_and_remove():
+    hooks = Hooks()
+    callback = Mock()
+    hooks.add("on_response", callback)
+    assert hooks.on_response == [callback]
+    assert not hooks.on_request
+
+    event = make_event()
+    Hooks.emit(hooks.on_response, event)
+    callback.assert_called_once_with(event)
+
+    hooks.remove("on_response", callback)
+    assert not hooks.on_response
+
+
+def test_hooks_unknown_event():
+    with pytest.raises(ValueError):
+        Hooks().add("on_success", Mock())
+
+
+def test_hooks_subscribe_and_unsubscribe():
+    class Subscriber:
+        def on_request(self, event):
+            pass
+
+        def on_error(self, event):
+            pass
+
+    hooks = Hooks()
+    subscriber = Subscriber()
+    hooks.subscribe(subscriber)
+    assert hooks.on_request == [subscriber.on_request]
+    assert hooks.on_error == [subscriber.on_error]
+    assert not hooks.on_response
+
+    hooks.remove("on_error", subscriber.on_error)
+    hooks.unsubscribe(subscriber)
+    assert not hooks.on_request
+    assert not hooks.on_error
+
+
+def test_logging_subscriber_logs_enabled_levels_only():
+    logger = Mock()
+    hooks = Hooks()
+    LoggingSubscriber(logger).register(hooks)
+    assert len(hooks.on_request) == len(hooks.on_response) == len(hooks.on_retry) == 1
+    assert len(hooks.on_error) == 1
+
+    logger.isEnabledFor.side_effect = lambda level: level >= logging.WARNING
+    Hooks.emit(hooks.on_request, make_event())
+    Hooks.emit(hooks.on_response, make_event())
+    Hooks.emit(hooks.on_retry, make_event())
+    logger.info.assert_not_called()
+    Hooks.emit(hooks.on_error, make_event(error=RequestTimeoutError()))
+    logger.warning.assert_called_once()
+
+    logger.isEnabledFor.side_effect = lambda level: level >= logging.ERROR
+    Hooks.emit(hooks.on_error, make_event(error=RequestTimeoutError()))
+    logger.warning.assert_called_once()
+
+    logger.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+    Hooks.emit(hooks.on_request, make_event())
+    Hooks.emit(hooks.on_response, make_event())
+    Hooks.emit(hooks.on_retry, make_event())
+    assert logger.info.call_count == 3
+
+
+def test_logging_subscriber_messages():
+    logger = Mock()
+    subscriber = LoggingSubscriber(logger)
+
+    subscriber.on_request(make_event(url="https://api.notion.com/v1/pages/abc"))
+    logger.info.assert_called_with("GET https://api.notion.com/v1/pages/abc")
+
+    subscriber.on_response(make_event(request_id="req"))
+    logger.info.assert_called_with(
+        "request success: method=GET, path=pages/abc, request_id=req"
+    )
+
+    subscriber.on_retry(make_event(delay=1.5))
+    logger.info.assert_called_with(
+        "retrying request: method=GET, path=pages/abc, attempt=0, delay_ms=1500"
+    )
+
+
+def test_logging_subscriber_errors():
+    logger = Mock()
+    logger.isEnabledFor.return_value = True
+    subscriber = LoggingSubscriber(logger)
+
+    subscriber.on_error(make_event(error=ValueError("not logged")))
+    logger.warning.assert_not_called()
+
+    subscriber.on_error(make_event(error=RequestTimeoutError()))
+    logger.warning.assert_called_with(
+        f"request fail: code={ClientErrorCode.RequestTimeout}, "
+        "message=Request to Notion API has timed out, attempt=0"
+    )
+    logger.debug.assert_not_called()
+
+    error = APIResponseError(
+        code="validation_error",
+        status=400,
+        message="Invalid",
+        headers=httpx.Headers(),
+        raw_body_text='{"code": "validation_error"}',
+        request_id="req",
+    )
+    subscriber.on_error(make_event(error=error, request_id="req"))
+    logger.warning.assert_called_with(
+        "request fail: code=validation_error, message=Invalid, attempt=0, request_id=req"
+    )
+    logger.debug.assert_called_with(
+        'failed response body: {"code": "validation_error"}'
+    )
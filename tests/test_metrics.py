@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from notion_client.errors import RequestTimeoutError
+from notion_client.hooks import RequestEvent
+from notion_client.metrics import LatencyHistogram, MetricsCollector
+
+
+def make_event(**kwargs) -> RequestEvent:
+    method = kwargs.pop("method", "GET")
+    endpoint = kwargs.pop("endpoint", "pages/{page_id}")
+    return RequestEvent(method, "pages/abc", endpoint, 0, **kwargs)
+
+
+def test_latency_histogram_empty():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) is None
+    assert histogram.snapshot() == {
+        "count": 0,
+        "sum": 0.0,
+        "min": None,
+        "max": None,
+        "p50": None,
+        "p90": None,
+        "p99": None,
+    }
+
+
+def test_latency_histogram_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for micros in range(1, 101):
+        histogram.record(micros / 1e6)
+    assert histogram.quantile(0.5) == pytest.approx(50e-6, rel=0.03)
+    assert histogram.quantile(0.0) == pytest.approx(1e-6)
+    assert histogram.quantile(1.0) == pytest.approx(100e-6)
+
+
+def test_latency_histogram_relative_error():
+    rng = random.Random(0)
+    values = sorted(rng.lognormvariate(-3, 1.5) for _ in range(10_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(sum(values))
+    assert (histogram.min, histogram.max) == (values[0], values[-1])
+    for quantile in (0.5, 0.9, 0.99):
+        expected = values[int(quantile * len(values)) - 1]
+        assert histogram.quantile(quantile) == pytest.approx(expected, rel=0.04)
+
+
+def test_latency_histogram_bounded_memory():
+    histogram = LatencyHistogram()
+    for micros in range(1, 1_000_000, 7):
+        histogram.record(micros / 1e6)
+    assert len(histogram._buckets) < 500
+
+
+def test_metrics_collector_snapshot():
+    collector = MetricsCollector()
+    collector.on_request(make_event(request_bytes=None))
+    collector.on_request(make_event(hedged=True))
+    collector.on_response(
+        make_event(
+            status=200,
+            elapsed=0.2,
+            decode_elapsed=0.05,
+            response_bytes=100,
+            response_wire_bytes=40,
+        )
+    )
+    collector.on_request(
+        make_event(
+            method="post", endpoint="search", request_bytes=900, request_wire_bytes=300
+        )
+    )
+    collector.on_error(make_event(status=429, elapsed=0.1))
+    collector.on_retry(make_event(delay=2.0))
+    collector.on_rate_limited(make_event(delay=2.0, error=ValueError()))
+    collector.on_rate_limited(make_event(delay=0.5))
+    collector.on_error(
+        make_event(method="post", endpoint="search", error=RequestTimeoutError())
+    )
+
+    snapshot = collector.snapshot()
+    page = snapshot["endpoints"]["GET pages/{page_id}"]
+    assert page["responses"] == {"200": 1, "429": 1}
+    assert page["retries"] == 1
+    assert page["hedges"] == 1
+    assert page["latency"]["count"] == 2
+    assert page["latency"]["sum"] == pytest.approx(0.3)
+    assert page["decode_seconds"] == 0.05
+    assert (page["response_bytes"], page["response_wire_bytes"]) == (100, 40)
+    assert (page["request_bytes"], page["request_wire_bytes"]) == (0, 0)
+    search = snapshot["endpoints"]["POST search"]
+    assert (search["request_bytes"], search["request_wire_bytes"]) == (900, 300)
+    assert search["responses"] == {"error": 1}
+    assert search["hedges"] == 0
+    assert search["latency"]["count"] == 0
+    assert snapshot["rate_limit_wait_seconds"] == {"client": 0.5, "server": 2.0}
+    assert snapshot["retry_wait_seconds"] == 2.0
+
+    collector.reset()
+    assert collector.snapshot() == {
+        "endpoints": {},
+        "rate_limit_wait_seconds": {"client": 0.0, "server": 0.0},
+        "retry_wait_seconds": 0.0,
+    }
+
+
+def test_metrics_collector_prometheus():
+    collector = MetricsCollector()
+    collector.on_request(make_event(request_bytes=30, request_wire_bytes=20))
+    collector.on_request(make_event(hedged=True))
+    collector.on_response(make_event(status=200, elapsed=0.25, response_bytes=10))
+    collector.on_error(make_event(endpoint='odd"name', error=RequestTimeoutError()))
+    collector.on_rate_limited(make_event(delay=1.0))
+
+    text = collector.to_prometheus()
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert "# TYPE notion_client_responses_total counter" in lines
+    assert (
+        'notion_client_responses_total{method="GET",endpoint="pages/{page_id}",status="200"} 1'
+        in lines
+    )
+    assert (
+        'notion_client_responses_total{method="GET",endpoint="odd\\"name",status="error"} 1'
+        in lines
+    )
+    assert (
+        'notion_client_hedges_total{method="GET",endpoint="pages/{page_id}"} 1' in lines
+    )
+    assert "# TYPE notion_client_request_duration_seconds summary" in lines
+    assert (
+        'notion_client_request_duration_seconds{method="GET",endpoint="pages/{page_id}",quantile="0.5"} 0.25'
+        in lines
+    )
+    assert (
+        'notion_client_request_duration_seconds{method="GET",endpoint="odd\\"name",quantile="0.99"} NaN'
+        in lines
+    )
+    assert (
+        'notion_client_request_duration_seconds_count{method="GET",endpoint="pages/{page_id}"} 1'
+        in lines
+    )
+    assert (
+        'notion_client_request_wire_bytes_total{method="GET",endpoint="pages/{page_id}"} 20'
+        in lines
+    )
+    assert 'notion_client_rate_limit_wait_seconds_total{source="client"} 1.0' in lines
+    assert "notion_client_retry_wait_seconds_total 0.0" in lines
+    assert collector.to_prometheus(prefix="notion").startswith(
+        "# HELP notion_responses_total"
+    )
@@ -0,0 +1,183 @@
+import json
+import tracemalloc
+from typing import Any, Dict
+
+import pytest
+
+from notion_client.models import (
+    Block,
+    DataSource,
+    Page,
+    RichText,
+    User,
+    from_response,
+)
+
+
+def rich_text(content: str) -> Dict[str, Any]:
+    return {
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {
+            "bold": False,
+            "italic": False,
+            "strikethrough": False,
+            "underline": False,
+            "code": False,
+            "color": "default",
+        },
+        "plain_text": content,
+        "href": None,
+    }
+
+
+def page(index: int = 0) -> Dict[str, Any]:
+    return {
+        "object": "page",
+        "id": f"page-{index}",
+        "created_time": "2025-06-01T12:00:00.000Z",
+        "last_edited_time": "2025-06-02T08:30:00.000Z",
+        "created_by": {"object": "user", "id": "user-1"},
+        "last_edited_by": {"object": "user", "id": "user-2"},
+        "cover": None,
+        "icon": {"type": "emoji", "emoji": "📄"},
+        "parent": {"type": "data_source_id", "data_source_id": "ds"},
+        "archived": False,
+        "in_trash": False,
+        "properties": {
+            "Name": {"id": "title", "type": "title", "title": [rich_text("Task")]},
+            "Description": {
+                "id": "desc",
+                "type": "rich_text",
+                "rich_text": [
+                    rich_text(f"Part {part} of {index}") for part in range(8)
+                ],
+            },
+            "Estimate": {"id": "est", "type": "number", "number": index * 1.5},
+        },
+        "url": f"https://www.notion.so/Task-{index}",
+        "public_url": None,
+        "request_id": "req",
+    }
+
+
+def test_page():
+    data = page()
+    model = Page.from_dict(data)
+
+    assert (model.id, model.archived, model.cover) == ("page-0", False, None)
+    assert model.is_locked is None
+    assert model.properties["Estimate"]["number"] == 0.0
+    assert model.properties is model.properties  # decoded once
+    assert model.created_by == User.from_dict({"object": "user", "id": "user-1"})
+    assert model.icon == {"type": "emoji", "emoji": "📄"}
+    assert model.to_dict() == data
+    assert repr(model) == "Page(id='page-0', created_time='2025-06-01T12:00:00.000Z')"
+    assert Page.properties is Page.__dict__["properties"]
+
+
+def test_page_memory():
+    payload = json.dumps([page(index) for index in range(500)])
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        dicts = json.loads(payload)
+        after_dicts = tracemalloc.get_traced_memory()[0]
+        models = [Page.from_dict(data) for data in dicts]
+        after_models = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(models) == 500
+    assert (after_dicts - before) / (after_models - after_dicts) > 3
+
+
+def test_block():
+    data = {
+        "object": "block",
+        "id": "block",
+        "type": "paragraph",
+        "created_time": "2025-06-01T12:00:00.000Z",
+        "last_edited_time": "2025-06-01T12:00:00.000Z",
+        "has_children": False,
+        "archived": False,
+        "in_trash": False,
+        "parent": {"type": "page_id", "page_id": "page"},
+        "created_by": {"object": "user", "id": "user"},
+        "last_edited_by": {"object": "user", "id": "user"},
+        "paragraph": {"rich_text": [rich_text("Hello")], "color": "default"},
+    }
+    block = Block.from_dict(data)
+    assert block.type == "paragraph"
+    assert block.content["rich_text"][0]["plain_text"] == "Hello"
+    assert block.last_edited_by.id == "user"
+    assert block.to_dict() == data
+    assert block == Block.from_dict(data)
+    assert block != data
+
+    partial = Block.from_dict({"object": "block", "id": "block"})
+    assert partial.content is None
+    assert partial.to_dict() == {"object": "block", "id": "block"}
+
+
+def test_data_source():
+    data = {
+        "object": "data_source",
+        "id": "ds",
+        "title": [rich_text("Tasks")],
+        "description": [],
+        "properties": {"Name": {"id": "title", "type": "title", "title": {}}},
+        "database_parent": {"type": "page_id", "page_id": "page"},
+        "is_inline": False,
+    }
+    data_source = DataSource.from_dict(data)
+    (title,) = data_source.title
+    assert isinstance(title, RichText)
+    assert (title.type, title.plain_text, title.href) == ("text", "Tasks", None)
+    assert title.content == {"content": "Tasks", "link": None}
+    assert title.annotations["color"] == "default"
+    assert data_source.description == []
+    assert data_source.cover is None
+    assert data_source.to_dict() == data
+
+
+def test_user():
+    data = {
+        "object": "user",
+        "id": "user",
+        "type": "bot",
+        "name": "Integration",
+        "avatar_url": None,
+        "bot": {"owner": {"type": "workspace", "workspace": True}},
+    }
+    user = User.from_dict(data)
+    assert user.bot["owner"]["workspace"] is True
+    assert user.person is None
+    assert user.to_dict() == data
+
+
+def test_rich_text_round_trip():
+    data = {**rich_text("Hi"), "extra": 1}
+    assert RichText.from_dict(data).to_dict() == data
+    assert RichText.from_dict({}).to_dict() == {}
+
+
+@pytest.mark.parametrize(
+    "data, model",
+    [
+        (page(), Page),
+        ({"object": "block", "id": "block", "type": "divider", "divider": {}}, Block),
+        ({"object": "data_source", "id": "ds"}, DataSource),
+        ({"object": "user", "id": "user", "type": "person"}, User),
+    ],
+)
+def test_from_response(data, model):
+    assert type(from_response(data)) is model
+
+
+def test_from_response_keeps_partial_objects():
+    for data in (
+        {"object": "page", "id": "page"},
+        {"object": "user", "id": "user"},
+        {"object": "list", "results": []},
+    ):
+        assert from_response(data) is data
@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from notion_client.schema import (
+    RowDecoder,
+    SchemaRegistry,
+    compile_row_decoder,
+    resolve_property_ids,
+)
+
+DATA_SOURCE = {
+    "object": "data_source",
+    "id": "ds",
+    "properties": {
+        "Name": {"id": "title", "type": "title", "title": {}},
+        "Notes": {"id": "n", "type": "rich_text", "rich_text": {}},
+        "Estimate": {"id": "e", "type": "number", "number": {"format": "number"}},
+        "Done": {"id": "d", "type": "checkbox", "checkbox": {}},
+        "Status": {"id": "s", "type": "status", "status": {}},
+        "Tags": {"id": "t", "type": "multi_select", "multi_select": {}},
+        "Due": {"id": "du", "type": "date", "date": {}},
+        "Created": {"id": "c", "type": "created_time", "created_time": {}},
+        "Projects": {"id": "p", "type": "relation", "relation": {}},
+        "Owner": {"id": "o", "type": "people", "people": {}},
+        "Author": {"id": "a", "type": "created_by", "created_by": {}},
+        "Files": {"id": "f", "type": "files", "files": {}},
+        "Link": {"id": "l", "type": "url", "url": {}},
+        "Score": {"id": "sc", "type": "formula", "formula": {}},
+        "Total": {"id": "to", "type": "rollup", "rollup": {}},
+        "Key": {"id": "k", "type": "unique_id", "unique_id": {}},
+        "Verified": {"id": "v", "type": "verification", "verification": {}},
+        "Action": {"id": "b", "type": "button", "button": {}},
+    },
+}
+
+
+def rich_text(*contents: str):
+    return [{"type": "text", "plain_text": content} for content in contents]
+
+
+PAGE = {
+    "object": "page",
+    "id": "page",
+    "properties": {
+        "Name": {"id": "title", "type": "title", "title": rich_text("Ta", "sk")},
+        "Notes": {"id": "n", "type": "rich_text", "rich_text": []},
+        "Estimate": {"id": "e", "type": "number", "number": 3},
+        "Done": {"id": "d", "type": "checkbox", "checkbox": True},
+        "Status": {"id": "s", "type": "status", "status": {"name": "Doing"}},
+        "Tags": {
+            "id": "t",
+            "type": "multi_select",
+            "multi_select": [{"name": "a"}, {"name": "b"}],
+        },
+        "Due": {"id": "du", "type": "date", "date": {"start": "2025-07-01"}},
+        "Created": {
+            "id": "c",
+            "type": "created_time",
+            "created_time": "2025-06-01T12:00:00.000Z",
+        },
+        "Projects": {"id": "p", "type": "relation", "relation": [{"id": "r1"}]},
+        "Owner": {"id": "o", "type": "people", "people": [{"id": "u1"}]},
+        "Author": {"id": "a", "type": "created_by", "created_by": {"id": "u2"}},
+        "Files": {
+            "id": "f",
+            "type": "files",
+            "files": [
+                {"type": "external", "external": {"url": "https://a"}},
+                {"type": "file", "file": {"url": "https://b"}},
+            ],
+        },
+        "Link": {"id": "l", "type": "url", "url": None},
+        "Score": {
+            "id": "sc",
+            "type": "formula",
+            "formula": {
+                "type": "date",
+                "date": {"start": "2025-07-01T09:30:00.000+02:00"},
+            },
+        },
+        "Total": {
+            "id": "to",
+            "type": "rollup",
+            "rollup": {"type": "number", "number": 12},
+        },
+        "Key": {
+            "id": "k",
+            "type": "unique_id",
+            "unique_id": {"prefix": "T", "number": 7},
+        },
+        "Verified": {
+            "id": "v",
+            "type": "verification",
+            "verification": {"state": "verified"},
+        },
+        "Action": {"id": "b", "type": "button", "button": {}},
+    },
+}
+
+
+def test_compile_row_decoder():
+    decoder = compile_row_decoder(DATA_SOURCE)
+    assert decoder(PAGE) == {
+        "Name": "Task",
+        "Notes": "",
+        "Estimate": 3.0,
+        "Done": True,
+        "Status": "Doing",
+        "Tags": ["a", "b"],
+        "Due": datetime(2025, 7, 1),
+        "Created": datetime(2025, 6, 1, 12, tzinfo=timezone.utc),
+        "Projects": ["r1"],
+        "Owner": ["u1"],
+        "Author": "u2",
+        "Files": ["https://a", "https://b"],
+        "Link": None,
+        "Score": datetime(2025, 7, 1, 9, 30, tzinfo=timezone(timedelta(hours=2))),
+        "Total": 12.0,
+        "Key": "T-7",
+        "Verified": "verified",
+        "Action": {},
+    }
+    assert isinstance(decoder(PAGE)["Estimate"], float)
+
+
+def test_row_decoder_empty_values():
+    decoder = compile_row_decoder(DATA_SOURCE)
+    empty = {
+        "Name": {"title": None},
+        "Estimate": {"number": None},
+        "Status": {"status": None},
+        "Tags": {"multi_select": []},
+        "Due": {"date": None},
+        "Created": {"created_time": None},
+        "Projects": {"relation": []},
+        "Author": {"created_by": None},
+        "Files": {"files": []},
+        "Score": {"formula": None},
+        "Total": {"rollup": {"type": "array", "array": []}},
+        "Key": {"unique_id": {"prefix": None, "number": 8}},
+        "Verified": {"verification": None},
+    }
+    row = decoder({"id": "page", "properties": empty})
+    assert row["Key"] == 8
+    assert row["Total"] == []
+    assert row["Tags"] == row["Projects"] == row["Files"] == []
+    assert row["Done"] is None  # missing from the page
+    assert all(
+        row[name] is None
+        for name in ("Name", "Estimate", "Status", "Due", "Created", "Author")
+    )
+    assert row["Score"] is None and row["Verified"] is None
+
+    assert decoder({"properties": {"Key": {"unique_id": None}}})["Key"] is None
+    assert (
+        decoder({"properties": {"Key": {"unique_id": {"number": None}}}})["Key"] is None
+    )
+
+
+def test_row_decoder_id_column_and_rows():
+    decoder = compile_row_decoder(DATA_SOURCE, id_column="page_id")
+    assert decoder.columns[:3] == ["page_id", "Name", "Notes"]
+    (row,) = decoder.rows(iter([PAGE]))
+    assert (row["page_id"], row["Name"]) == ("page", "Task")
+    assert RowDecoder([]).columns == []
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_schema_registry(mock_monotonic):
+    registry = SchemaRegistry(ttl_ms=1000)
+    assert registry.property_ids("ds", ["Name"]) is None
+    registry.set(DATA_SOURCE)
+    assert len(registry) == 1
+    assert registry.property_ids("DS", ["Status", "Name"]) == ["s", "title"]
+    assert registry.property_ids("ds", ["Renamed"]) is None
+
+    mock_monotonic.return_value = 101.0
+    assert registry.property_ids("ds", ["Name"]) is None
+
+    registry.set(DATA_SOURCE)
+    registry.invalidate("ds")
+    registry.invalidate("unknown")
+    assert registry.property_ids("ds", ["Name"]) is None
+    registry.set(DATA_SOURCE)
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_resolve_property_ids():
+    assert resolve_property_ids(DATA_SOURCE, ["Done", "Tags"]) == ["d", "t"]
+    with pytest.raises(ValueError, match="data source ds: Renamed, Gone"):
+        resolve_property_ids(DATA_SOURCE, ["Name", "Renamed", "Gone"])
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import pytest
+
+from notion_client.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_single_flight_shares_result_between_threads():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def function():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {"object": "page"}
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight.do("key", function))
+    )
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(single_flight.do("key", function))
+        )
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
+    assert single_flight.do("key", lambda: "again") == "again"
+
+
+def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def function():
+        started.set()
+        release.wait()
+        raise ValueError("failed")
+
+    def call():
+        try:
+            single_flight.do("key", function)
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    started.wait()
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 2
+    assert single_flight._calls == {}
+
+
+async def test_async_single_flight_shares_result_between_tasks():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def function():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"object": "page"}
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", function) for _ in range(5))
+    )
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight._calls == {}
+
+
+async def test_async_single_flight_survives_leader_cancellation():
+    single_flight = AsyncSingleFlight()
+
+    async def function():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    leader = asyncio.ensure_future(single_flight.do("key", function))
+    follower = asyncio.ensure_future(single_flight.do("key", function))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
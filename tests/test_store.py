@@ -0,0 +1,110 @@
+import sqlite3
+from unittest.mock import Mock
+
+from notion_client.store import ObjectStore
+
+DATA_SOURCE_ID = "2a1c9c91-384d-452b-81db-d1ef79372b75"
+
+
+def page(index: int, last_edited_time: str):
+    return {
+        "object": "page",
+        "id": f"page-{index}",
+        "last_edited_time": last_edited_time,
+        "parent": {"type": "data_source_id", "data_source_id": DATA_SOURCE_ID},
+        "properties": {"Name": {"title": [{"plain_text": "été"}]}},
+    }
+
+
+def query_returning(*results):
+    return Mock(return_value={"results": list(results), "has_more": False})
+
+
+def test_object_store(tmp_path):
+    path = tmp_path / "notion.db"
+    with ObjectStore(path) as store:
+        assert store.get("page-1") is None and len(store) == 0
+        store.put(page(1, "2025-06-01T12:00:00.000Z"))
+        store.put_many(
+            [
+                {"object": "data_source", "id": DATA_SOURCE_ID, "parent": None},
+                {"object": "block", "id": "block", "parent": {"type": "workspace"}},
+            ]
+        )
+        assert store.get("page-1") == page(1, "2025-06-01T12:00:00.000Z")
+        assert store.get("page-1") is not store.get("page-1")
+        assert store.last_edited_time("PAGE-1") == "2025-06-01T12:00:00.000Z"
+        assert store.last_edited_time("unknown") is None
+        store.put(page(1, "2025-06-02T12:00:00.000Z"))
+        assert len(store) == 3
+
+    with ObjectStore(path) as store:
+        assert store.last_edited_time("page-1") == "2025-06-02T12:00:00.000Z"
+        assert store.watermark(DATA_SOURCE_ID.replace("-", "")) == (
+            "2025-06-02T12:00:00.000Z"
+        )
+        assert store.watermark("other") is None
+        store.invalidate("page-1")
+        assert store.get("page-1") is None and len(store) == 2
+        store.clear()
+        assert len(store) == 0
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    connection.close()
+
+
+def test_changed_pages(tmp_path):
+    with ObjectStore(tmp_path / "notion.db") as store:
+        query = query_returning(page(1, "2025-06-01T12:00:00.000Z"))
+        changed = list(store.changed_pages(query, data_source_id=DATA_SOURCE_ID))
+        assert [page["id"] for page in changed] == ["page-1"]
+        query.assert_called_once_with(
+            data_source_id=DATA_SOURCE_ID,
+            sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+            start_cursor=None,
+        )
+
+        query = query_returning(page(2, "2025-06-03T08:00:00.000Z"))
+        status = {"property": "Status", "status": {"equals": "Done"}}
+        changed = list(
+            store.changed_pages(
+                query, data_source_id=DATA_SOURCE_ID, filter=status, page_size=100
+            )
+        )
+        assert [page["id"] for page in changed] == ["page-2"]
+        kwargs = query.call_args.kwargs
+        assert kwargs["page_size"] == 100
+        assert kwargs["filter"] == {
+            "and": [
+                status,
+                {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": "2025-06-01T12:00:00.000Z"},
+                },
+            ]
+        }
+
+        query = query_returning()
+        assert list(store.changed_pages(query, data_source_id=DATA_SOURCE_ID)) == []
+        assert query.call_args.kwargs["filter"] == {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": "2025-06-03T08:00:00.000Z"},
+        }
+        assert len(store) == 2
+
+
+async def test_async_changed_pages(tmp_path):
+    with ObjectStore(tmp_path / "notion.db") as store:
+
+        async def query(**kwargs):
+            return {"results": [page(1, "2025-06-01T12:00:00.000Z")], "has_more": False}
+
+        changed = [
+            page
+            async for page in store.async_changed_pages(
+                query, data_source_id=DATA_SOURCE_ID
+            )
+        ]
+        assert len(changed) == 1
+        assert store.get("page-1") == changed[0]
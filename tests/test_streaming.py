@@ -0,0 +1,144 @@
+import json
+
+import pytest
+
+from notion_client.streaming import (
+    AsyncStreamedResponse,
+    ResultsParser,
+    StreamedResponse,
+)
+
+BODY = {
+    "object": "list",
+    "results": [
+        {"object": "page", "id": "a", "title": "Café ☕", "number": 12.5},
+        {"object": "page", "id": "b", "nested": {"results": [1, 2]}, "flag": True},
+        {"object": "page", "id": "c", "empty": [], "missing": None},
+        42,
+        -7e3,
+    ],
+    "next_cursor": "cursor",
+    "has_more": True,
+    "type": "page_or_data_source",
+    "page_or_data_source": {},
+}
+
+
+def parse(content: bytes, size: int):
+    parser = ResultsParser()
+    results = []
+    for start in range(0, len(content), size):
+        results.extend(parser.feed(content[start : start + size]))
+    results.extend(parser.close())
+    return results, parser.body
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100_000])
+def test_results_parser_chunk_sizes(size):
+    content = json.dumps(BODY, indent=1, ensure_ascii=False).encode()
+    results, body = parse(content, size)
+    expected_body = dict(BODY)
+    assert results == expected_body.pop("results")
+    assert body == expected_body
+
+
+def test_results_parser_yields_items_as_soon_as_complete():
+    parser = ResultsParser()
+    assert parser.feed(b'{"results": [{"id": "a"}, {"id": "b"') == [{"id": "a"}]
+    assert parser.feed(b'}, {"id": "c"}, 1') == [{"id": "b"}, {"id": "c"}]
+    assert parser.feed(b"23") == []
+    assert parser.feed(b'], "has_more": false}') == [123]
+    assert parser.close() == []
+    assert parser.body == {"has_more": False}
+
+
+def test_results_parser_objects_without_results():
+    results, body = parse(b'{"object": "page", "id": "a", "results": null}', 5)
+    assert results == []
+    assert body == {"object": "page", "id": "a", "results": None}
+
+
+def test_results_parser_number_at_the_end():
+    parser = ResultsParser()
+    parser.feed(b'{"results": [], "count": 1')
+    assert parser.body == {}
+    assert parser.feed(b"0}") == []
+    assert parser.body == {"count": 10}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"[1, 2]",
+        b'{"results": [1, 2}',
+        b'{"results": [1], "has_more" false}',
+        b'{"results": []} {}',
+        b'{"results": [tru',
+        b'{"results": [], "has_more":',
+        b'{"results": [], "has_more"',
+        b'{"results": []',
+        b'{"results": [], 1: 2}',
+        b'{"results": [], "next_cursor": "abc',
+    ],
+)
+def test_results_parser_invalid_json(content):
+    with pytest.raises(ValueError):
+        parse(content, 3)
+
+
+def test_streamed_response():
+    content = json.dumps(BODY).encode()
+    chunks = (content[start : start + 10] for start in range(0, len(content), 10))
+    response = StreamedResponse(chunks)
+
+    with pytest.raises(RuntimeError):
+        response.body
+    assert list(response) == BODY["results"]
+    assert response.body["next_cursor"] == "cursor"
+    with pytest.raises(RuntimeError):
+        list(response)
+
+
+def test_streamed_response_close():
+    closed = []
+
+    def chunks():
+        try:
+            yield b'{"results": [1, 2, 3]}'
+        finally:
+            closed.append(True)
+
+    response = StreamedResponse(chunks())
+    for _ in response:
+        break
+    response.close()
+    assert closed == [True]
+    with pytest.raises(RuntimeError):
+        response.body
+
+
+async def test_async_streamed_response():
+    content = json.dumps(BODY).encode()
+
+    async def chunks():
+        for start in range(0, len(content), 10):
+            yield content[start : start + 10]
+
+    response = AsyncStreamedResponse(chunks())
+    with pytest.raises(RuntimeError):
+        response.body
+    assert [item async for item in response] == BODY["results"]
+    assert response.body["has_more"] is True
+    with pytest.raises(RuntimeError):
+        [item async for item in response]
+    await response.aclose()
+
+
+async def test_async_streamed_response_items_completed_at_the_end():
+    async def chunks():
+        yield b'{"results": [{"id": "abcdef"'
+        yield b"}]}"
+
+    response = AsyncStreamedResponse(chunks())
+    assert [item async for item in response] == [{"id": "abcdef"}]
+    assert response.body == {}
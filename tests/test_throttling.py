@@ -0,0 +1,225 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from notion_client.throttling import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    RetryBudget,
+    TokenBucket,
+)
+
+
+def make_limiter(**kwargs) -> AdaptiveConcurrencyLimiter:
+    options = {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 4,
+        "increase": 1.0,
+        "decrease_factor": 0.5,
+    }
+    options.update(kwargs)
+    return AdaptiveConcurrencyLimiter(**options)
+
+
+def test_token_bucket_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0)
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_token_bucket_allows_burst_then_schedules(mock_monotonic):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+
+@patch("time.monotonic")
+def test_token_bucket_refills_over_time(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    mock_monotonic.return_value = 100.5
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+    mock_monotonic.return_value = 200.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_token_bucket_cancel_gives_token_back(mock_monotonic):
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+    bucket.cancel()
+    assert bucket.reserve() == 0.5
+
+    limiter = RateLimiter(rate=1, burst=1)
+    limiter.cancel("token")
+    assert limiter.reserve("token") == 0.0
+    assert limiter.reserve("token") == 1.0
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_rate_limiter_keeps_one_bucket_per_key(mock_monotonic):
+    limiter = RateLimiter(rate=1, burst=1)
+
+    assert limiter.reserve("token_a") == 0.0
+    assert limiter.reserve("token_b") == 0.0
+    assert limiter.reserve(None) == 0.0
+    assert limiter.reserve("token_a") == 1.0
+    assert limiter.reserve(None) == 1.0
+
+
+def test_adaptive_limiter_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        make_limiter(min_limit=3)
+    with pytest.raises(ValueError):
+        make_limiter(max_limit=1)
+    with pytest.raises(ValueError):
+        make_limiter(decrease_factor=1)
+
+
+async def test_adaptive_limiter_queues_requests_over_limit():
+    limiter = make_limiter()
+    await limiter.acquire()
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release()
+    await waiter
+    assert limiter.in_flight == 2
+
+
+async def test_adaptive_limiter_grows_on_success():
+    limiter = make_limiter()
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.limit == 3
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 4
+
+
+async def test_adaptive_limiter_shrinks_once_per_epoch():
+    limiter = make_limiter(initial_limit=4)
+    first = await limiter.acquire()
+    second = await limiter.acquire()
+
+    limiter.on_throttled(first)
+    limiter.on_throttled(second)
+    assert limiter.limit == 2
+
+    limiter.release()
+    third = await limiter.acquire()
+    limiter.on_throttled(third)
+    assert limiter.limit == 1
+
+    limiter.on_throttled(third + 1)
+    assert limiter.limit == 1
+
+
+async def test_adaptive_limiter_success_wakes_up_waiters():
+    limiter = make_limiter(initial_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.on_success()
+    limiter.on_success()
+    await waiter
+    assert limiter.in_flight == 2
+
+
+async def test_adaptive_limiter_cancelled_waiter_gives_slot_back():
+    limiter = make_limiter(initial_limit=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.ensure_future(limiter.acquire())
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    limiter.release()
+    await waiting
+    assert limiter.in_flight == 1
+
+
+async def test_adaptive_limiter_cancelled_after_wake_up_releases_slot():
+    limiter = make_limiter(initial_limit=1)
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.in_flight == 0
+
+
+async def test_adaptive_limiter_skips_waiters_cancelled_before_wake_up():
+    limiter = make_limiter(initial_limit=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.ensure_future(limiter.acquire())
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    limiter.release()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    await waiting
+    assert limiter.in_flight == 1
+
+
+def test_retry_budget_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        RetryBudget(ratio=-1, min_retries=0, window=1)
+    with pytest.raises(ValueError):
+        RetryBudget(ratio=0.1, min_retries=-1, window=1)
+    with pytest.raises(ValueError):
+        RetryBudget(ratio=0.1, min_retries=0, window=0)
+
+
+@patch("time.monotonic", return_value=100.0)
+def test_retry_budget_allows_ratio_of_requests(mock_monotonic):
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=10)
+
+    assert budget.try_retry()
+    assert not budget.try_retry()
+
+    for _ in range(4):
+        budget.record_request()
+    assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+
+
+@patch("time.monotonic")
+def test_retry_budget_forgets_old_requests_and_retries(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    budget = RetryBudget(ratio=1, min_retries=0, window=10)
+    budget.record_request()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+
+    mock_monotonic.return_value = 110.0
+    assert not budget.try_retry()
+    budget.record_request()
+    assert budget.try_retry()
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from notion_client.timings import RequestTimings, TimingsRecorder
+
+
+def record(recorder, events):
+    with patch("time.monotonic", side_effect=[time for _, time in events]):
+        for name, _ in events:
+            recorder(name, {})
+
+
+def test_timings_of_new_connection():
+    with patch("time.monotonic", return_value=10.0):
+        recorder = TimingsRecorder()
+    record(
+        recorder,
+        [
+            ("connection.connect_tcp.started", 10.5),
+            ("connection.connect_tcp.complete", 10.6),
+            ("connection.start_tls.started", 10.6),
+            ("connection.start_tls.complete", 10.8),
+            ("http11.send_request_headers.started", 10.8),
+            ("http11.send_request_headers.complete", 10.8),
+            ("http11.receive_response_headers.started", 10.8),
+            ("http11.receive_response_headers.complete", 11.3),
+            ("http11.receive_response_body.started", 11.3),
+            ("http11.receive_response_body.complete", 11.5),
+        ],
+    )
+
+    with patch("time.monotonic", return_value=11.75):
+        timings = recorder.timings(decode_started_at=11.5)
+    assert (timings.pool_wait, timings.ttfb, timings.decode) == (0.5, 0.5, 0.25)
+    assert timings.connect == pytest.approx(0.1)
+    assert timings.tls == pytest.approx(0.2)
+    assert timings.download == pytest.approx(0.2)
+
+
+async def test_timings_of_reused_connection():
+    with patch("time.monotonic", return_value=10.0):
+        recorder = TimingsRecorder()
+    with patch("time.monotonic", side_effect=[10.25, 10.5]):
+        await recorder.atrace("http2.send_request_headers.started", {})
+        await recorder.atrace("http2.receive_response_headers.complete", {})
+
+    timings = recorder.timings()
+    assert (timings.pool_wait, timings.ttfb) == (0.25, 0.25)
+    assert timings.connect is None and timings.tls is None
+    assert timings.download is None and timings.decode is None
+
+
+def test_timings_without_trace_events():
+    assert TimingsRecorder().timings() == RequestTimings()
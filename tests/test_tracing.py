@@ -0,0 +1,194 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notion_client import APIResponseError, AsyncClient, Client
+from notion_client.client import HedgingOptions, RateLimitOptions, RetryOptions
+
+
+class FakeSpan:
+    def __init__(self, name: str, attributes: Dict[str, Any], parent) -> None:
+        self.name = name
+        self.attributes = dict(attributes)
+        self.parent: Optional[FakeSpan] = parent
+        self.exception: Optional[BaseException] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class FakeTracer:
+    """Minimal stand-in for an OpenTelemetry tracer, which nests spans."""
+
+    def __init__(self) -> None:
+        self.spans: List[FakeSpan] = []
+        self._current: List[FakeSpan] = []
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Dict[str, Any]):
+        parent = self._current[-1] if self._current else None
+        span = FakeSpan(name, attributes, parent)
+        self.spans.append(span)
+        self._current.append(span)
+        try:
+            yield span
+        except BaseException as exception:
+            span.exception = exception
+            raise
+        finally:
+            self._current.remove(span)
+
+    def named(self, name: str) -> List[FakeSpan]:
+        return [span for span in self.spans if span.name == name]
+
+
+def response(status_code: int, body: Dict[str, Any], **headers: str) -> httpx.Response:
+    return httpx.Response(
+        status_code,
+        json=body,
+        headers=headers,
+        request=httpx.Request("GET", "https://api.notion.com/v1/pages/abc"),
+    )
+
+
+def rate_limited(**headers: str) -> httpx.Response:
+    body = {"object": "error", "code": "rate_limited", "message": "Slow down"}
+    return response(429, {**body, "request_id": "req-1"}, **headers)
+
+
+@patch("time.sleep", return_value=None)
+def test_spans_of_retried_call(mock_sleep):
+    tracer = FakeTracer()
+    client = Client(tracer=tracer)
+    responses = [
+        rate_limited(**{"retry-after": "1"}),
+        response(200, {"object": "page", "request_id": "req-2"}),
+    ]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.pages.retrieve(page_id="abc")
+
+    (call,) = tracer.named("notion GET pages/{page_id}")
+    assert call.parent is None
+    assert call.attributes == {
+        "http.request.method": "GET",
+        "notion.endpoint": "pages/{page_id}",
+        "notion.attempts": 2,
+        "notion.request_id": "req-2",
+    }
+
+    first, second = tracer.named("notion.attempt")
+    assert first.parent is call and second.parent is call
+    assert first.attributes == {
+        "notion.attempt": 0,
+        "error.type": "rate_limited",
+        "notion.error_code": "rate_limited",
+        "http.response.status_code": 429,
+        "notion.request_id": "req-1",
+    }
+    assert second.attributes == {
+        "notion.attempt": 1,
+        "http.response.status_code": 200,
+        "notion.request_id": "req-2",
+    }
+
+    (backoff,) = tracer.named("notion.backoff")
+    assert backoff.parent is call
+    assert backoff.attributes == {"notion.delay_ms": 1000, "notion.rate_limited": True}
+
+
+def test_spans_of_failed_call():
+    tracer = FakeTracer()
+    client = Client(tracer=tracer, retry=False)
+    with patch.object(client.client, "send", return_value=rate_limited()):
+        with pytest.raises(APIResponseError):
+            client.request("blocks/abc", "GET")
+
+    (call,) = tracer.named("notion GET blocks/{block_id}")
+    assert call.attributes["notion.error_code"] == "rate_limited"
+    assert call.attributes["http.response.status_code"] == 429
+    assert isinstance(call.exception, APIResponseError)
+    (attempt,) = tracer.named("notion.attempt")
+    assert attempt.attributes["error.type"] == "rate_limited"
+
+
+def test_spans_of_other_errors():
+    tracer = FakeTracer()
+    client = Client(tracer=tracer)
+    with patch.object(client.client, "send", side_effect=ValueError("unexpected")):
+        with pytest.raises(ValueError):
+            client.request("blocks/abc", "GET")
+    (call,) = tracer.named("notion GET blocks/{block_id}")
+    assert call.attributes["error.type"] == "ValueError"
+
+
+@patch("time.sleep", return_value=None)
+def test_spans_of_rate_limiter_waits_and_streams(mock_sleep):
+    tracer = FakeTracer()
+    client = Client(tracer=tracer, rate_limit=RateLimitOptions(burst=1))
+    responses = [response(200, {"results": []}), response(200, {"results": []})]
+    with patch.object(client.client, "send", side_effect=responses):
+        client.request("search", "POST")
+        list(client.request("search", "POST", stream=True))
+
+    (wait,) = tracer.named("notion.rate_limit")
+    assert wait.attributes["notion.rate_limited"] is True
+    assert wait.parent is tracer.named("notion POST search")[1]
+    assert [
+        span.attributes["http.response.status_code"]
+        for span in tracer.named("notion.attempt")
+    ] == [200, 200]
+
+
+@patch("asyncio.sleep", return_value=None)
+async def test_async_spans(mock_sleep):
+    tracer = FakeTracer()
+    client = AsyncClient(
+        tracer=tracer,
+        retry=RetryOptions(max_retries=1),
+        rate_limit=RateLimitOptions(burst=1),
+    )
+    responses = [rate_limited(), response(200, {"request_id": "req-2"})]
+    with patch.object(client.client, "send", side_effect=responses):
+        await client.request("blocks/abc", "GET")
+    with patch.object(
+        client.client, "send", return_value=response(200, {"results": []})
+    ):
+        async for _ in await client.request("search", "POST", stream=True):
+            pass
+
+    (call,) = tracer.named("notion GET blocks/{block_id}")
+    assert call.attributes["notion.attempts"] == 2
+    assert [span.name for span in tracer.spans if span.parent is call] == [
+        "notion.attempt",
+        "notion.backoff",
+        "notion.rate_limit",
+        "notion.attempt",
+    ]
+    assert tracer.named("notion.attempt")[-1].attributes == {
+        "notion.attempt": 0,
+        "http.response.status_code": 200,
+    }
+
+
+async def test_async_spans_of_hedged_requests():
+    tracer = FakeTracer()
+    client = AsyncClient(
+        tracer=tracer,
+        hedging=HedgingOptions(min_delay_ms=10, min_samples=1, window=10),
+    )
+    client._hedging_policy.record("blocks/{block_id}", 0.01)
+
+    async def send(request):
+        await asyncio.sleep(0.05)
+        return response(200, {"object": "block", "request_id": "req"})
+
+    with patch.object(client.client, "send", side_effect=send):
+        await client.request("blocks/abc", "GET")
+
+    (attempt,) = tracer.named("notion.attempt")
+    assert attempt.attributes["notion.hedged"] is True
+    assert attempt.attributes["notion.request_id"] == "req"
@@ -1,4 +1,12 @@
-from notion_client.webhooks import sign_webhook_payload, verify_webhook_signature
+import json
+from unittest.mock import Mock
+
+from notion_client.webhooks import (
+    invalidate_from_webhook,
+    sign_webhook_payload,
+    verify_webhook_signature,
+    webhook_event_object_ids,
+)
 
 
 def test_sign_webhook_payload():
@@ -24,3 +32,68 @@ def test_verify_webhook_signature():
     assert not verify_webhook_signature(body, None, token)
     assert not verify_webhook_signature(body, "missing-prefix", token)
     assert not verify_webhook_signature(body, "sha256=not-hex", token)
+
+
+def page_event(event_type, **data):
+    return {
+        "id": "event",
+        "type": event_type,
+        "entity": {"id": "page", "type": "page"},
+        "data": data,
+    }
+
+
+def test_webhook_event_object_ids():
+    parent = {"id": "parent", "type": "page"}
+    assert webhook_event_object_ids(page_event("page.created", parent=parent)) == [
+        "page",
+        "parent",
+    ]
+    assert webhook_event_object_ids(page_event("page.moved", parent=parent)) == [
+        "page",
+        "parent",
+    ]
+    assert webhook_event_object_ids(
+        page_event("page.properties_updated", parent=parent)
+    ) == ["page"]
+    assert webhook_event_object_ids(
+        page_event(
+            "page.content_updated",
+            parent={"id": "workspace", "type": "space"},
+            updated_blocks=[{"id": "block", "type": "block"}],
+        )
+    ) == ["page", "block"]
+    assert webhook_event_object_ids(
+        {
+            "type": "comment.created",
+            "entity": {"id": "comment", "type": "comment"},
+            "data": {"page_id": "page", "parent": {"id": "page", "type": "page"}},
+        }
+    ) == ["comment"]
+    assert webhook_event_object_ids({"verification_token": "abc"}) == []
+
+
+def test_invalidate_from_webhook():
+    cache = Mock()
+    store = Mock()
+    body = json.dumps(
+        page_event("page.deleted", parent={"id": "ds", "type": "data_source"})
+    )
+    signature = sign_webhook_payload(body, "secret")
+
+    event = invalidate_from_webhook(body, signature, "secret", cache, None, store)
+    assert event == json.loads(body)
+    for invalidatable in (cache, store):
+        assert [call.args for call in invalidatable.invalidate.call_args_list] == [
+            ("page",),
+            ("ds",),
+        ]
+
+    assert invalidate_from_webhook(body, "sha256=bad", "secret", cache) is None
+    assert cache.invalidate.call_count == 2
+
+    handshake = '{"verification_token":"abc"}'
+    assert invalidate_from_webhook(
+        handshake, sign_webhook_payload(handshake, "secret"), "secret", cache
+    ) == {"verification_token": "abc"}
+    assert cache.invalidate.call_count == 2